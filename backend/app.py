@@ -1,58 +1,284 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import joblib
 import os
+import signal
 import sys
+import threading
+import time
+import uuid
 
 # Agregar el directorio actual al path para imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from utils.preprocessing import preprocess_input
-from utils.predictor import predict_performance
+from utils.features import CLASS_NAMES, describe_features
+from utils.preprocessing import preprocess_input, preprocess_batch
+from utils.validation import ValidationError, describe_errors
+from utils.predictor import predict_performance, predict_batch
+from utils.whatif import parse_variations, what_if
+from utils.registry import ModelRegistry
+from utils.rules import load_rules, set_rule_engine
+from utils.cache import PredictionCache, parse_rounding
+from utils.batching import MicroBatcher
+from utils.admission import AdmissionController
+from utils.feedback import FeedbackBuffer, FeedbackUpdater, parse_label
+from utils.profiling import profile_call
+from utils.metadata import format_metrics
+from utils.serialization import StaticResponse, dumps
+from utils.logs import configure_logging, get_logger, get_sampled_logger, fields
+from utils.metrics import (
+    STAGE, CONTENT_TYPE as METRICS_CONTENT_TYPE, http_requests, predictions_by_class,
+    count_validation_errors, render_metrics
+)
+
+# Registro estructurado (LOG_LEVEL, LOG_FORMAT, LOG_SAMPLE_RATES)
+configure_logging()
+log = get_logger('app')
+prediction_log = get_sampled_logger('predicciones')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify con utils.serialization (orjson si está instalado); en debug se mantiene el formato legible"""
+
+    def response(self, *args, **kwargs):
+        if self._app.debug:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj) + b'\n', mimetype=self.mimetype)
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)
 
 # Configuración de rutas
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(BASE_DIR, 'model', 'modelo_rl.pkl')
 SCALER_PATH = os.path.join(BASE_DIR, 'model', 'scaler.pkl')
+# Artefacto binario mapeado en memoria; si existe se prefiere a los pickles
+ARTIFACT_PATH = os.environ.get('ARTIFACT_PATH', os.path.join(BASE_DIR, 'model', 'modelo_rl.bin'))
+# Metadatos que el entrenamiento escribe al final de cada publicación; sus
+# métricas se muestran en /api/model-info
+METADATA_PATH = os.environ.get('MODEL_METADATA_PATH', os.path.join(BASE_DIR, 'model', 'modelo_rl.json'))
+
+# Cache-Control de las respuestas estáticas (/ y /api/model-info); con no-cache
+# el cliente revalida con If-None-Match y recibe 304 si no cambiaron
+STATIC_CACHE_CONTROL = os.environ.get('STATIC_CACHE_CONTROL', 'no-cache')
+
+# Máximo de estudiantes aceptados en una sola petición de lote
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 100000))
+
+# Máximo de combinaciones en una petición a /api/predict/what-if
+WHATIF_MAX_POINTS = int(os.environ.get('WHATIF_MAX_POINTS', 10000))
+
+# Usar scaler.transform + predict_proba de sklearn en lugar del modelo fusionado
+USE_SKLEARN_INFERENCE = os.environ.get('USE_SKLEARN_INFERENCE', '0') == '1'
+
+# Tabla de reglas (JSON) opcional para factores clave y recomendaciones
+RULES_PATH = os.environ.get('RULES_PATH')
+
+# Caché LRU de predicciones (PREDICTION_CACHE_SIZE=0 la desactiva)
+prediction_cache = PredictionCache(
+    max_size=int(os.environ.get('PREDICTION_CACHE_SIZE', 10000)),
+    rounding=parse_rounding(os.environ.get('PREDICTION_CACHE_ROUNDING'))
+)
+
+# Micro-batching de /api/predict: agrupa peticiones concurrentes en una sola
+# llamada al modelo (MICROBATCH_ENABLED=1 lo activa)
+micro_batcher = MicroBatcher(
+    max_batch_size=int(os.environ.get('MICROBATCH_MAX_SIZE', 64)),
+    max_wait_ms=float(os.environ.get('MICROBATCH_MAX_WAIT_MS', 2)),
+    max_queue=int(os.environ.get('MICROBATCH_MAX_QUEUE', 1024))
+) if os.environ.get('MICROBATCH_ENABLED', '0') == '1' else None
+
+# Control de admisión de /api/predict y /api/predict/batch: predicciones en
+# curso (0 = sin límite), espera máxima por un hueco y límite por cliente
+admission = AdmissionController(
+    max_in_flight=int(os.environ.get('ADMISSION_MAX_IN_FLIGHT', 0)),
+    queue_timeout_ms=float(os.environ.get('ADMISSION_QUEUE_TIMEOUT_MS', 50)),
+    client_rate=float(os.environ.get('ADMISSION_CLIENT_RATE', 0)),
+    client_burst=float(os.environ.get('ADMISSION_CLIENT_BURST', 0)) or None,
+    retry_after=int(os.environ.get('ADMISSION_RETRY_AFTER', 1))
+)
+
+# Cabecera que identifica al cliente para su cubeta; sin ella se usa la IP
+ADMISSION_CLIENT_HEADER = os.environ.get('ADMISSION_CLIENT_HEADER', 'X-Client-ID')
 
-# Variables globales para el modelo
-model = None
-scaler = None
+# Segundos entre revisiones de backend/model/ (0 desactiva la vigilancia)
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 0))
+
+# Token requerido por los endpoints de administración (sin token quedan desactivados)
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# Perfilado bajo demanda: con PROFILING_ENABLED=1, una petición a /api/predict
+# o /api/predict/batch con la cabecera X-Profile: 1 (y X-Admin-Token si hay
+# ADMIN_TOKEN) se ejecuta bajo cProfile y devuelve el resumen en 'perfil'
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '0') == '1'
+PROFILE_TOP = int(os.environ.get('PROFILE_TOP', 25))
+# Carpeta donde guardar además el perfil completo (.prof, legible con pstats)
+PROFILE_DIR = os.environ.get('PROFILE_DIR')
+
+# Retroalimentación (/api/feedback): las observaciones con la clase real se
+# agregan a FEEDBACK_PATH; con FEEDBACK_UPDATE_INTERVAL > 0 un hilo de fondo
+# las aplica a una copia del modelo cada tantos segundos y la publica si no
+# empeora en la reserva (FEEDBACK_HOLDOUT de las observaciones)
+FEEDBACK_PATH = os.environ.get('FEEDBACK_PATH', os.path.join(BASE_DIR, 'feedback', 'observaciones.jsonl'))
+FEEDBACK_UPDATE_INTERVAL = float(os.environ.get('FEEDBACK_UPDATE_INTERVAL', 0))
+
+# Cargar el modelo al importar (útil con servidores que hacen fork tras importar);
+# por defecto se carga con la primera petición para que el arranque sea inmediato
+MODEL_PRELOAD = os.environ.get('MODEL_PRELOAD', '0') == '1'
+
+# Respuestas estáticas ya codificadas, por (endpoint, versión del modelo)
+_static_responses = {}
+
+def on_model_swap(bundle):
+    """Descarta lo calculado con la versión anterior del modelo"""
+    prediction_cache.invalidate()
+    _static_responses.clear()
+
+# Registro del modelo: cada versión cargada es un bundle inmutable
+registry = ModelRegistry(
+    MODEL_PATH, SCALER_PATH,
+    use_sklearn=USE_SKLEARN_INFERENCE,
+    on_swap=on_model_swap,
+    artifact_path=ARTIFACT_PATH,
+    metadata_path=METADATA_PATH
+)
+
+feedback_buffer = FeedbackBuffer(FEEDBACK_PATH, fsync=os.environ.get('FEEDBACK_FSYNC', '1') == '1')
+
+feedback_updater = FeedbackUpdater(
+    feedback_buffer, registry, MODEL_PATH, SCALER_PATH,
+    artifact_path=ARTIFACT_PATH,
+    metadata_path=METADATA_PATH,
+    min_rows=int(os.environ.get('FEEDBACK_MIN_ROWS', 200)),
+    max_rows=int(os.environ.get('FEEDBACK_MAX_ROWS', 100000)),
+    holdout_fraction=float(os.environ.get('FEEDBACK_HOLDOUT', 0.2)),
+    learning_rate=float(os.environ.get('FEEDBACK_LEARNING_RATE', 0.01)),
+    epochs=int(os.environ.get('FEEDBACK_EPOCHS', 3)),
+    max_degradation=float(os.environ.get('FEEDBACK_MAX_DEGRADATION', 0.0))
+)
 
 def load_model():
     """Carga el modelo y scaler al iniciar la aplicación"""
-    global model, scaler
     try:
-        model = joblib.load(MODEL_PATH)
-        scaler = joblib.load(SCALER_PATH)
-        print("=" * 60)
-        print("✅ Modelo y scaler cargados correctamente")
-        print("=" * 60)
+        bundle = registry.load()
+        if bundle.source == 'artefacto':
+            inferencia = 'artefacto binario mapeado en memoria'
+        elif bundle.fused is not None:
+            inferencia = 'modelo fusionado (scaler + regresión en NumPy)'
+        else:
+            inferencia = 'sklearn'
+        log.info("✅ Modelo y scaler cargados correctamente",
+                 extra=fields(version_modelo=bundle.version, inferencia=inferencia))
+        if bundle.fused is None and registry.fusion_warning:
+            log.warning(f"⚠️  {registry.fusion_warning}, se usará sklearn")
         return True
     except FileNotFoundError as e:
-        print("=" * 60)
-        print(f"❌ ERROR: Archivos del modelo no encontrados")
-        print(f"   Asegúrate de colocar los archivos en:")
-        print(f"   - {MODEL_PATH}")
-        print(f"   - {SCALER_PATH}")
-        print("=" * 60)
+        log.error("❌ ERROR: Archivos del modelo no encontrados (convierte los pickles con export_model.py)",
+                  extra=fields(artefacto=ARTIFACT_PATH, modelo=MODEL_PATH, scaler=SCALER_PATH, detalle=str(e)))
         return False
     except Exception as e:
-        print("=" * 60)
-        print(f"❌ ERROR al cargar modelo: {e}")
-        print("=" * 60)
+        log.error(f"❌ ERROR al cargar modelo: {e}")
         return False
 
-# Cargar modelo al iniciar
-load_model()
+# PID del maestro cuando la API corre bajo servir.py (workers prefork)
+SERVING_MASTER_PID = None
 
-@app.route('/', methods=['GET'])
-def home():
-    """Ruta principal de verificación"""
-    return jsonify({
+_first_load_lock = threading.Lock()
+_first_load_done = threading.Event()
+
+def active_bundle():
+    """
+    Devuelve el bundle activo, cargando el modelo en la primera llamada
+
+    Solo se intenta una carga automática: si falla, el error queda en el
+    registro y se puede reintentar con /api/admin/reload o el vigilante.
+    """
+    bundle = registry.current
+    if bundle is None and not _first_load_done.is_set():
+        with _first_load_lock:
+            if not _first_load_done.is_set():
+                if registry.current is None:
+                    load_model()
+                _first_load_done.set()
+        bundle = registry.current
+    return bundle
+
+def predict_single(bundle, processed_data, batched=True):
+    """Predice un estudiante, a través del micro-batching si está activo"""
+    if micro_batcher is None or not batched:
+        return predict_performance(*bundle.inference_pair(), processed_data)
+    try:
+        return micro_batcher.predict(bundle, processed_data)
+    except Exception as e:
+        raise Exception(f'Error en la predicción: {str(e)}')
+
+def predict_cached(bundle, processed_data, batched=True, contributions=False):
+    """Predice un estudiante consultando primero la caché de predicciones"""
+    # El desglose por característica no se guarda en caché ni pasa por el micro-batching
+    if contributions:
+        return predict_performance(*bundle.inference_pair(), processed_data, contributions=True)
+    if not prediction_cache.enabled:
+        return predict_single(bundle, processed_data, batched)
+
+    prediction_cache.normalize(processed_data)
+    key = prediction_cache.make_keys(processed_data)[0]
+    result = prediction_cache.get(key, bundle)
+    if result is None:
+        result = predict_single(bundle, processed_data, batched)
+        prediction_cache.put(key, result, bundle)
+    return result
+
+def predict_batch_cached(bundle, matrix, contributions=False):
+    """Predice un lote; solo las filas que no están en caché pasan por el modelo"""
+    pair = bundle.inference_pair()
+    if contributions:
+        return predict_batch(*pair, matrix, contributions=True)
+    if not prediction_cache.enabled:
+        return predict_batch(*pair, matrix)
+
+    prediction_cache.normalize(matrix)
+    keys = prediction_cache.make_keys(matrix)
+    results = [prediction_cache.get(key, bundle) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        for i, result in zip(missing, predict_batch(*pair, matrix[missing])):
+            results[i] = result
+            prediction_cache.put(keys[i], result, bundle)
+    return results
+
+def contributions_requested(data):
+    """Indica si el cuerpo pidió el desglose con "contribuciones": true"""
+    return isinstance(data, dict) and data.get('contribuciones') is True
+
+def load_rule_table():
+    """Carga la tabla de reglas indicada en RULES_PATH, si existe"""
+    if not RULES_PATH:
+        return False
+    try:
+        set_rule_engine(load_rules(RULES_PATH))
+        log.info("✅ Reglas cargadas", extra=fields(ruta=RULES_PATH))
+        return True
+    except (OSError, ValueError, KeyError) as e:
+        log.error(f"❌ ERROR al cargar reglas, se usan las reglas por defecto: {e}", extra=fields(ruta=RULES_PATH))
+        return False
+
+# Cargar modelo al iniciar solo si se pidió; si no, lo carga la primera petición
+if MODEL_PRELOAD:
+    active_bundle()
+load_rule_table()
+if MODEL_WATCH_INTERVAL > 0:
+    registry.start_watcher(MODEL_WATCH_INTERVAL)
+# Con servir.py el hilo queda solo en el maestro, que recicla los workers al publicarse una versión
+if FEEDBACK_UPDATE_INTERVAL > 0:
+    feedback_updater.start(FEEDBACK_UPDATE_INTERVAL)
+
+# Cada endpoint se resuelve en una función que devuelve (cuerpo, código HTTP);
+# las rutas de Flask y la variante ASGI (app_async.py) comparten estas funciones
+
+def home_response():
+    """Cuerpo de la ruta principal"""
+    return {
         'status': 'online',
         'mensaje': 'API de Predicción de Rendimiento Académico',
         'version': '1.0.0',
@@ -61,121 +287,397 @@ def home():
         'endpoints': {
             'health': '/api/health',
             'predict': '/api/predict (POST)',
-            'model_info': '/api/model-info'
+            'predict_batch': '/api/predict/batch (POST)',
+            'what_if': '/api/predict/what-if (POST)',
+            'feedback': '/api/feedback (POST)',
+            'model_info': '/api/model-info',
+            'metrics': '/api/metrics'
         }
-    }), 200
+    }, 200
 
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Verificar estado del modelo"""
-    if model is not None and scaler is not None:
-        return jsonify({
+def health_response():
+    """Estado del modelo, la caché y el micro-batching"""
+    bundle = active_bundle()
+    if bundle is not None:
+        return {
             'status': 'healthy',
             'modelo_cargado': True,
-            'mensaje': 'Sistema funcionando correctamente'
-        }), 200
+            'mensaje': 'Sistema funcionando correctamente',
+            'version_modelo': bundle.version,
+            'cache': prediction_cache.stats(),
+            'micro_batching': micro_batcher.stats() if micro_batcher is not None else {'habilitado': False},
+            'admision': admission.stats(),
+            'retroalimentacion': feedback_updater.status()
+        }, 200
     else:
-        return jsonify({
+        return {
             'status': 'error',
             'modelo_cargado': False,
             'mensaje': 'Modelo no cargado. Coloca modelo_rl.pkl y scaler.pkl en backend/model/'
-        }), 500
+        }, 500
 
-@app.route('/api/predict', methods=['POST'])
-def predict():
-    """Endpoint principal para realizar predicciones"""
+def profiling_requested(profile_header, admin_token):
+    """Indica si la petición pidió perfilado y está autorizada a hacerlo"""
+    if not PROFILING_ENABLED or profile_header != '1':
+        return False
+    return not ADMIN_TOKEN or admin_token == ADMIN_TOKEN
+
+def profiled_response(response_function, *args, request_id=None):
+    """
+    Ejecuta un *_response bajo cProfile y agrega el resumen al cuerpo
+
+    Args:
+        response_function (callable): Función que devuelve (cuerpo, código HTTP)
+        request_id (str, optional): Identificador usado en el nombre del .prof
+    """
+    (payload, status), report = profile_call(
+        response_function, *args, top=PROFILE_TOP, output_dir=PROFILE_DIR, label=request_id
+    )
+    if report is None:
+        report = {'error': 'Ya hay otra petición perfilándose en este proceso'}
+    else:
+        log.info("🔬 Petición perfilada", extra=fields(
+            id_peticion=request_id, tiempo_total_ms=report['tiempo_total_ms'], archivo=report.get('archivo')
+        ))
+    return dict(payload, perfil=report), status
+
+def predict_response(read_json, request_id=None, batched=True):
+    """
+    Predicción de un estudiante
+
+    Args:
+        read_json (callable): Devuelve el cuerpo JSON de la petición ya decodificado
+        request_id (str, optional): Identificador de la petición para el registro
+        batched (bool): Usar el micro-batching si está activo; se desactiva al
+            perfilar para que el modelo corra en el hilo perfilado
+    """
+    started = time.perf_counter()
+    payload, status = _predict_response(read_json, batched)
+
+    bundle = registry.current
+    event = dict(
+        id_peticion=request_id or uuid.uuid4().hex,
+        version_modelo=bundle.version if bundle is not None else None,
+        estado=status,
+        latencia_ms=round((time.perf_counter() - started) * 1000, 3)
+    )
+    if status == 200:
+        predictions_by_class.labels(payload['prediccion']).inc()
+        prediction_log.info('prediccion', prediccion=payload['prediccion'], **event)
+    elif status < 500:
+        prediction_log.info('prediccion_rechazada', **event)
+    else:
+        prediction_log.error('prediccion_fallida', detalle=payload.get('detalle'), **event)
+    return payload, status
+
+def _predict_response(read_json, batched=True):
     try:
-        # Verificar que el modelo esté cargado
-        if model is None or scaler is None:
-            return jsonify({
+        # Tomar el bundle activo; se usa hasta el final aunque haya una recarga
+        bundle = active_bundle()
+        if bundle is None:
+            return {
                 'error': 'Modelo no disponible',
                 'detalle': 'Los archivos modelo_rl.pkl y scaler.pkl deben estar en backend/model/'
-            }), 500
+            }, 500
 
         # Obtener datos del request
-        data = request.get_json()
+        started = time.perf_counter()
+        data = read_json()
+        now = time.perf_counter()
+        STAGE['json'].observe(now - started)
         
         if not data:
-            return jsonify({
+            return {
                 'error': 'No se recibieron datos',
                 'detalle': 'El body del request debe contener datos en formato JSON'
-            }), 400
+            }, 400
 
-        # Campos requeridos
-        required_fields = [
-            'genero', 'apoyo_familiar', 'ingresos_familiares',
-            'horas_estudio', 'actividades_extra', 'nivel_educativo_padres',
-            'acceso_internet', 'clima_familiar', 'asistencia', 'motivacion'
-        ]
-        
-        # Verificar campos faltantes
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
-            return jsonify({
-                'error': 'Campos faltantes',
-                'campos_requeridos': required_fields,
-                'campos_faltantes': missing_fields
-            }), 400
-
-        # Preprocesar datos
+        # Validar y preprocesar en una sola pasada; se reportan todos los errores
         try:
             processed_data = preprocess_input(data)
-        except ValueError as ve:
-            return jsonify({
-                'error': 'Error en validación de datos',
-                'detalle': str(ve)
-            }), 400
+        except ValidationError as ve:
+            count_validation_errors(ve.errors)
+            return describe_errors(ve.errors), 400
+        finally:
+            STAGE['validacion'].observe(time.perf_counter() - now)
 
-        # Realizar predicción
-        result = predict_performance(model, scaler, processed_data)
+        # Realizar predicción (o recuperarla de la caché)
+        result = predict_cached(bundle, processed_data, batched, contributions_requested(data))
         
-        return jsonify(result), 200
+        return result, 200
 
     except ValueError as e:
-        return jsonify({
+        return {
             'error': 'Error en los datos de entrada',
             'detalle': str(e)
-        }), 400
+        }, 400
     except Exception as e:
-        return jsonify({
+        return {
             'error': 'Error interno del servidor',
             'detalle': str(e)
-        }), 500
+        }, 500
 
-@app.route('/api/model-info', methods=['GET'])
-def model_info():
-    """Información sobre el modelo entrenado"""
-    return jsonify({
+def predict_batch_response(read_json):
+    """
+    Predicción de un lote de estudiantes
+
+    Args:
+        read_json (callable): Devuelve el cuerpo JSON de la petición ya decodificado
+    """
+    try:
+        bundle = active_bundle()
+        if bundle is None:
+            return {
+                'error': 'Modelo no disponible',
+                'detalle': 'Los archivos modelo_rl.pkl y scaler.pkl deben estar en backend/model/'
+            }, 500
+
+        data = read_json()
+
+        # Se acepta una lista directa o un objeto {"estudiantes": [...]}
+        records = data.get('estudiantes') if isinstance(data, dict) else data
+        if not isinstance(records, list) or not records:
+            return {
+                'error': 'No se recibieron datos',
+                'detalle': 'El body debe ser una lista de estudiantes o un objeto con la clave "estudiantes"'
+            }, 400
+
+        if len(records) > MAX_BATCH_SIZE:
+            return {
+                'error': 'Lote demasiado grande',
+                'detalle': f'Se permiten como máximo {MAX_BATCH_SIZE} estudiantes por petición'
+            }, 413
+
+        # Validar y preprocesar todo el lote; los registros inválidos se reportan aparte
+        matrix, valid_indices, errors = preprocess_batch(records)
+        for record_errors in errors:
+            count_validation_errors(record_errors['errores'])
+
+        # Realizar predicción vectorizada sobre las filas válidas
+        predictions = predict_batch_cached(bundle, matrix, contributions_requested(data))
+
+        results = [
+            dict(indice=index, **prediction)
+            for index, prediction in zip(valid_indices, predictions)
+        ]
+        for prediction in predictions:
+            predictions_by_class.labels(prediction['prediccion']).inc()
+
+        return {
+            'total': len(records),
+            'exitosos': len(results),
+            'fallidos': len(errors),
+            'resultados': results,
+            'errores': errors
+        }, 200
+
+    except Exception as e:
+        return {
+            'error': 'Error interno del servidor',
+            'detalle': str(e)
+        }, 500
+
+def what_if_response(read_json):
+    """
+    Superficie de probabilidades al variar una o dos características de un estudiante
+
+    Args:
+        read_json (callable): Devuelve el cuerpo JSON de la petición ya decodificado
+    """
+    try:
+        bundle = active_bundle()
+        if bundle is None:
+            return {
+                'error': 'Modelo no disponible',
+                'detalle': 'Los archivos modelo_rl.pkl y scaler.pkl deben estar en backend/model/'
+            }, 500
+
+        data = read_json()
+        if not isinstance(data, dict) or not isinstance(data.get('estudiante'), dict):
+            return {
+                'error': 'No se recibieron datos',
+                'detalle': 'El body debe ser un objeto con "estudiante" y "variaciones"'
+            }, 400
+
+        try:
+            base_row = preprocess_input(data['estudiante'])
+        except ValidationError as ve:
+            count_validation_errors(ve.errors)
+            return describe_errors(ve.errors), 400
+
+        try:
+            variables = parse_variations(data.get('variaciones'), WHATIF_MAX_POINTS)
+        except ValueError as e:
+            return {'error': 'Variaciones inválidas', 'detalle': str(e)}, 400
+
+        # Toda la rejilla en una sola evaluación del modelo
+        started = time.perf_counter()
+        result = what_if(*bundle.inference_pair(), base_row, variables)
+        STAGE['modelo'].observe(time.perf_counter() - started)
+        return result, 200
+
+    except Exception as e:
+        return {
+            'error': 'Error interno del servidor',
+            'detalle': str(e)
+        }, 500
+
+def feedback_response(read_json, admin_token):
+    """
+    Registra la clase real observada de estudiantes ya puntuados
+
+    Solo valida y agrega las observaciones al archivo; la actualización del
+    modelo ocurre después, en el hilo de FeedbackUpdater.
+
+    Args:
+        read_json (callable): Devuelve el cuerpo JSON de la petición ya decodificado
+        admin_token (str, optional): Valor de la cabecera X-Admin-Token
+    """
+    if not ADMIN_TOKEN or admin_token != ADMIN_TOKEN:
+        return {
+            'error': 'No autorizado',
+            'detalle': 'Configura ADMIN_TOKEN y envíalo en la cabecera X-Admin-Token'
+        }, 403
+
+    try:
+        data = read_json()
+
+        # Se acepta una lista directa o un objeto {"observaciones": [...]}
+        records = data.get('observaciones') if isinstance(data, dict) else data
+        if not isinstance(records, list) or not records:
+            return {
+                'error': 'No se recibieron datos',
+                'detalle': 'El body debe ser una lista de observaciones o un objeto con la clave "observaciones"'
+            }, 400
+
+        if len(records) > MAX_BATCH_SIZE:
+            return {
+                'error': 'Lote demasiado grande',
+                'detalle': f'Se permiten como máximo {MAX_BATCH_SIZE} observaciones por petición'
+            }, 413
+
+        # Cada observación es un estudiante del formulario más su 'rendimiento' real
+        matrix, valid_indices, errors = preprocess_batch(records)
+        labels = [parse_label(records[index].get('rendimiento')) for index in valid_indices]
+        labelled = [i for i, label in enumerate(labels) if label is not None]
+        for i, label in enumerate(labels):
+            if label is None:
+                errors.append(dict(indice=valid_indices[i], **describe_errors([{
+                    'campo': 'rendimiento',
+                    'tipo': 'formato',
+                    'mensaje': f"rendimiento debe ser uno de: {', '.join(CLASS_NAMES)} (o 0, 1, 2). "
+                               f"Valor recibido: {records[valid_indices[i]].get('rendimiento')!r}"
+                }])))
+        errors.sort(key=lambda error: error['indice'])
+
+        accepted = feedback_buffer.append(
+            matrix[labelled],
+            [labels[i] for i in labelled],
+            ids=[records[valid_indices[i]].get('id') for i in labelled]
+        )
+
+        return {
+            'total': len(records),
+            'aceptadas': accepted,
+            'rechazadas': len(errors),
+            'errores': errors,
+            'actualizacion_automatica': FEEDBACK_UPDATE_INTERVAL > 0
+        }, 202
+
+    except Exception as e:
+        return {
+            'error': 'Error interno del servidor',
+            'detalle': str(e)
+        }, 500
+
+def model_info_response():
+    """Información sobre el modelo entrenado, con las métricas de la versión cargada"""
+    bundle = active_bundle()
+    metrics = format_metrics(bundle.metadata) if bundle is not None else None
+    return {
         'modelo': 'Regresión Logística',
         'descripcion': 'Modelo de clasificación para predecir rendimiento académico',
-        'metricas': {
-            'precision_entrenamiento': '54.3%',
-            'precision_prueba': '40.0%',
-            'validacion_cruzada': '38.6%',
-            'estabilidad': 'Excelente (sin overfitting)'
+        'version_modelo': bundle.version if bundle is not None else None,
+        'metricas': metrics or {
+            'mensaje': 'Métricas no disponibles: reentrena el modelo para generar modelo_rl.json'
         },
-        'variables': [
-            {'nombre': 'Género', 'tipo': 'Categórico', 'valores': ['M', 'F']},
-            {'nombre': 'Apoyo Familiar', 'tipo': 'Numérico', 'rango': '1-5'},
-            {'nombre': 'Ingresos Familiares', 'tipo': 'Numérico', 'rango': '1-5'},
-            {'nombre': 'Horas de Estudio', 'tipo': 'Numérico', 'rango': '0-168'},
-            {'nombre': 'Actividades Extracurriculares', 'tipo': 'Numérico', 'rango': '0-40'},
-            {'nombre': 'Nivel Educativo Padres', 'tipo': 'Numérico', 'rango': '1-5'},
-            {'nombre': 'Acceso a Internet', 'tipo': 'Binario', 'valores': [0, 1]},
-            {'nombre': 'Clima Familiar', 'tipo': 'Numérico', 'rango': '1-5'},
-            {'nombre': 'Asistencia', 'tipo': 'Numérico', 'rango': '0-100%'},
-            {'nombre': 'Motivación', 'tipo': 'Numérico', 'rango': '1-5'}
-        ],
-        'clases': ['Alto', 'Medio', 'Bajo']
-    }), 200
+        'variables': describe_features(),
+        'clases': bundle.metadata.get('clases', CLASS_NAMES) if bundle is not None else CLASS_NAMES
+    }, 200
 
-@app.route('/api/test', methods=['GET'])
-def test_prediction():
-    """Endpoint de prueba con datos de ejemplo"""
-    if model is None or scaler is None:
-        return jsonify({
+# Endpoints cuyo cuerpo solo cambia con la versión del modelo
+_STATIC_BUILDERS = {
+    'home': home_response,
+    'model_info': model_info_response,
+}
+
+def static_response(name):
+    """
+    Cuerpo precodificado de un endpoint estático para la versión activa
+
+    Se construye y serializa una vez por versión del modelo; después cada
+    petición solo copia los bytes.
+
+    Args:
+        name (str): 'home' o 'model_info'
+
+    Returns:
+        StaticResponse: Cuerpo, código y ETag
+    """
+    bundle = active_bundle() if name == 'model_info' else None
+    key = (name, bundle.version if bundle is not None else None)
+    response = _static_responses.get(key)
+    if response is None:
+        payload, status = _STATIC_BUILDERS[name]()
+        response = _static_responses[key] = StaticResponse(payload, status)
+    return response
+
+def rejection_response(rejection):
+    """
+    Respuesta inmediata para una petición rechazada por el control de admisión
+
+    Returns:
+        tuple: (cuerpo, código HTTP, cabeceras)
+    """
+    if rejection.motivo == 'cliente':
+        payload, status = {
+            'error': 'Demasiadas peticiones',
+            'detalle': 'Se superó el límite de peticiones por segundo de este cliente'
+        }, 429
+    else:
+        payload, status = {
+            'error': 'Servicio saturado',
+            'detalle': 'Hay demasiadas predicciones en curso; reintenta en unos segundos'
+        }, 503
+    return payload, status, {'Retry-After': str(rejection.retry_after)}
+
+def metrics_response():
+    """Métricas del proceso en formato de texto de Prometheus"""
+    return render_metrics(), 200
+
+def timed_serialization(encode, payload, started):
+    """
+    Serializa la respuesta de una predicción y registra su duración y la total
+
+    Args:
+        encode (callable): Convierte el cuerpo en la respuesta del servidor
+        payload (dict): Cuerpo devuelto por predict_response
+        started (float): perf_counter() al recibir la petición
+    """
+    serialize_started = time.perf_counter()
+    response = encode(payload)
+    now = time.perf_counter()
+    STAGE['serializacion'].observe(now - serialize_started)
+    STAGE['total'].observe(now - started)
+    return response
+
+def test_response():
+    """Predicción con datos de ejemplo"""
+    bundle = active_bundle()
+    if bundle is None:
+        return {
             'error': 'Modelo no disponible'
-        }), 500
+        }, 500
     
     # Datos de prueba
     test_data = {
@@ -193,41 +695,173 @@ def test_prediction():
     
     try:
         processed_data = preprocess_input(test_data)
-        result = predict_performance(model, scaler, processed_data)
-        return jsonify({
+        result = predict_performance(*bundle.inference_pair(), processed_data)
+        return {
             'mensaje': 'Prueba exitosa',
             'datos_enviados': test_data,
             'resultado': result
-        }), 200
+        }, 200
     except Exception as e:
-        return jsonify({
+        return {
             'error': 'Error en prueba',
             'detalle': str(e)
-        }), 500
+        }, 500
+
+NOT_FOUND_BODY = {
+    'error': 'Ruta no encontrada',
+    'mensaje': 'El endpoint solicitado no existe'
+}
+
+INTERNAL_ERROR_BODY = {
+    'error': 'Error interno del servidor',
+    'mensaje': 'Ocurrió un error inesperado'
+}
+
+def static_json(static):
+    """Respuesta de Flask para un StaticResponse, con 304 si el cliente ya lo tiene"""
+    if static.matches(request.headers.get('If-None-Match')):
+        response = Response(status=304)
+    else:
+        response = Response(static.body, status=static.status, mimetype='application/json')
+    response.headers['ETag'] = static.etag
+    response.headers['Cache-Control'] = STATIC_CACHE_CONTROL
+    return response
+
+@app.route('/', methods=['GET'])
+def home():
+    """Ruta principal de verificación"""
+    return static_json(static_response('home'))
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Verificar estado del modelo"""
+    payload, status = health_response()
+    return jsonify(payload), status
+
+@app.route('/api/predict', methods=['POST'])
+def predict():
+    """Endpoint principal para realizar predicciones"""
+    started = time.perf_counter()
+    request_id = request.headers.get('X-Request-ID')
+    if profiling_requested(request.headers.get('X-Profile'), request.headers.get('X-Admin-Token')):
+        payload, status = profiled_response(predict_response, request.get_json, request_id, False,
+                                            request_id=request_id)
+    else:
+        payload, status = predict_response(request.get_json, request_id)
+    return timed_serialization(jsonify, payload, started), status
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch_endpoint():
+    """Endpoint para predecir un lote de estudiantes en una sola pasada"""
+    request_id = request.headers.get('X-Request-ID')
+    if profiling_requested(request.headers.get('X-Profile'), request.headers.get('X-Admin-Token')):
+        payload, status = profiled_response(predict_batch_response, request.get_json, request_id=request_id)
+    else:
+        payload, status = predict_batch_response(request.get_json)
+    return jsonify(payload), status
+
+@app.route('/api/predict/what-if', methods=['POST'])
+def predict_what_if():
+    """Endpoint para explorar cómo cambia la predicción al variar una o dos características"""
+    payload, status = what_if_response(request.get_json)
+    return jsonify(payload), status
+
+@app.route('/api/feedback', methods=['POST'])
+def feedback():
+    """Registra el rendimiento real observado para actualizar el modelo"""
+    payload, status = feedback_response(request.get_json, request.headers.get('X-Admin-Token'))
+    return jsonify(payload), status
+
+@app.route('/api/model-info', methods=['GET'])
+def model_info():
+    """Información sobre el modelo entrenado"""
+    return static_json(static_response('model_info'))
+
+@app.route('/api/test', methods=['GET'])
+def test_prediction():
+    """Endpoint de prueba con datos de ejemplo"""
+    payload, status = test_response()
+    return jsonify(payload), status
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Métricas de latencia por etapa y contadores en formato Prometheus"""
+    body, status = metrics_response()
+    return Response(body, status=status, content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_model():
+    """Recarga el modelo en segundo plano sin detener el servidor"""
+    if not ADMIN_TOKEN or request.headers.get('X-Admin-Token') != ADMIN_TOKEN:
+        return jsonify({
+            'error': 'No autorizado',
+            'detalle': 'Configura ADMIN_TOKEN y envíalo en la cabecera X-Admin-Token'
+        }), 403
+
+    # Con workers prefork la recarga la hace el maestro, que luego los recicla
+    if SERVING_MASTER_PID is not None and SERVING_MASTER_PID != os.getpid():
+        os.kill(SERVING_MASTER_PID, signal.SIGHUP)
+        return jsonify({'mensaje': 'Recarga solicitada al proceso maestro', 'registro': registry.status()}), 202
+
+    # ?esperar=1 carga de forma síncrona y devuelve la versión resultante
+    if request.args.get('esperar') == '1':
+        try:
+            registry.load(force=False)
+        except Exception as e:
+            return jsonify({
+                'error': 'No se pudo recargar el modelo',
+                'detalle': str(e),
+                'registro': registry.status()
+            }), 500
+        return jsonify({'mensaje': 'Modelo recargado', 'registro': registry.status()}), 200
+
+    registry.reload_async()
+    return jsonify({'mensaje': 'Recarga iniciada', 'registro': registry.status()}), 202
+
+# Endpoints que pasan por el control de admisión; el resto se atiende siempre
+SCORING_ENDPOINTS = {'predict', 'predict_batch_endpoint', 'predict_what_if'}
+
+@app.before_request
+def admit_scoring_request():
+    """Rechaza al instante las predicciones que exceden los límites de admisión"""
+    if not admission.enabled or request.method != 'POST' or request.endpoint not in SCORING_ENDPOINTS:
+        return None
+    client_id = request.headers.get(ADMISSION_CLIENT_HEADER) or request.remote_addr
+    rejection = admission.admit(client_id)
+    if rejection is not None:
+        payload, status, headers = rejection_response(rejection)
+        return jsonify(payload), status, headers
+    g.admitted = True
+    return None
+
+@app.teardown_request
+def release_scoring_request(error=None):
+    """Libera el hueco de una predicción admitida"""
+    if g.pop('admitted', False):
+        admission.release()
+
+@app.after_request
+def count_request(response):
+    """Cuenta cada respuesta por ruta y código de estado"""
+    # Las rutas inexistentes se agrupan para no crear una serie por URL
+    route = request.url_rule.rule if request.url_rule is not None else 'desconocida'
+    http_requests.labels(route, response.status_code).inc()
+    return response
 
 @app.errorhandler(404)
 def not_found(error):
     """Manejo de rutas no encontradas"""
-    return jsonify({
-        'error': 'Ruta no encontrada',
-        'mensaje': 'El endpoint solicitado no existe'
-    }), 404
+    return jsonify(NOT_FOUND_BODY), 404
 
 @app.errorhandler(500)
 def internal_error(error):
     """Manejo de errores internos"""
-    return jsonify({
-        'error': 'Error interno del servidor',
-        'mensaje': 'Ocurrió un error inesperado'
-    }), 500
+    return jsonify(INTERNAL_ERROR_BODY), 500
 
 if __name__ == '__main__':
-    print("\n" + "=" * 60)
-    print("🚀 Iniciando servidor de predicción de rendimiento académico")
-    print("=" * 60)
-    print(f"📍 URL: http://localhost:5000")
-    print(f"📊 Modelo: Regresión Logística")
-    print(f"🏫 Universidad Privada Antenor Orrego")
-    print("=" * 60 + "\n")
+    log.info("🚀 Iniciando servidor de predicción de rendimiento académico",
+             extra=fields(url='http://localhost:5000', modelo='Regresión Logística',
+                          universidad='Universidad Privada Antenor Orrego'))
     
+    active_bundle()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""
+Variante ASGI de la API de predicción.
+
+Atiende las rutas de app.py (/, /api/health, /api/predict, /api/predict/batch,
+/api/predict/what-if, /api/feedback, /api/model-info, /api/test y /api/metrics)
+con los mismos cuerpos y códigos, porque ambas usan las funciones *_response de
+app.py; /api/admin/reload solo existe en app.py. La lectura del cuerpo y la
+escritura de la respuesta ocurren en el event loop, así que una conexión lenta
+no ocupa un hilo; la validación y la predicción se envían a un pool de hilos
+acotado para que el loop nunca se bloquee.
+
+Uso (requiere un servidor ASGI, por ejemplo `pip install uvicorn`):
+    uvicorn app_async:app --host 0.0.0.0 --port 5000
+"""
+
+import asyncio
+import functools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as api
+from utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, http_requests
+from utils.serialization import StaticResponse, dumps
+
+# Hilos para el trabajo de CPU (validación, predicción y carga del modelo)
+ASYNC_EXECUTOR_THREADS = int(os.environ.get('ASYNC_EXECUTOR_THREADS', os.cpu_count() or 1))
+
+# Tareas que pueden estar en el pool (en ejecución o en cola); las demás
+# peticiones esperan en el loop sin ocupar memoria del pool
+ASYNC_MAX_PENDING = int(os.environ.get('ASYNC_MAX_PENDING', 4 * ASYNC_EXECUTOR_THREADS))
+
+# Métodos que flask_cors anuncia en las respuestas preflight
+_CORS_METHODS = b'DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT'
+
+class BoundedExecutor:
+    """Pool de hilos con un límite de tareas pendientes"""
+
+    def __init__(self, threads, max_pending):
+        self.threads = threads
+        self.max_pending = max_pending
+        self._pool = None
+        self._slots = None
+
+    def start(self):
+        self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='asgi-cpu')
+        self._slots = asyncio.Semaphore(self.max_pending)
+
+    async def run(self, function, *args):
+        if self._pool is None:
+            self.start()
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, function, *args)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+executor = BoundedExecutor(ASYNC_EXECUTOR_THREADS, ASYNC_MAX_PENDING)
+
+def _encode(payload):
+    # Mismo serializador que jsonify en app.py, para que los cuerpos sean idénticos
+    return dumps(payload) + b'\n'
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            return None
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+def _json_reader(body, headers):
+    """Equivalente a request.get_json(): exige Content-Type JSON y un cuerpo válido"""
+    def read_json():
+        content_type = headers.get(b'content-type', b'').split(b';')[0].strip().lower()
+        if content_type != b'application/json' and not (
+            content_type.startswith(b'application/') and content_type.endswith(b'+json')
+        ):
+            raise Exception(
+                "415 Unsupported Media Type: Did not attempt to load JSON data because the "
+                "request Content-Type was not 'application/json'."
+            )
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise Exception('400 Bad Request: The browser (or proxy) sent a request that this server could not understand.')
+    return read_json
+
+def _header(headers, name):
+    value = headers.get(name)
+    return value.decode('latin-1') if value is not None else None
+
+async def _predict(body, headers):
+    request_id = _header(headers, b'x-request-id')
+    read_json = _json_reader(body, headers)
+    if api.profiling_requested(_header(headers, b'x-profile'), _header(headers, b'x-admin-token')):
+        # Sin micro-batching, para que el modelo corra en el hilo perfilado
+        return await executor.run(functools.partial(
+            api.profiled_response, api.predict_response, read_json, request_id, False, request_id=request_id
+        ))
+    return await executor.run(api.predict_response, read_json, request_id)
+
+async def _predict_batch(body, headers):
+    read_json = _json_reader(body, headers)
+    if api.profiling_requested(_header(headers, b'x-profile'), _header(headers, b'x-admin-token')):
+        return await executor.run(functools.partial(
+            api.profiled_response, api.predict_batch_response, read_json,
+            request_id=_header(headers, b'x-request-id')
+        ))
+    return await executor.run(api.predict_batch_response, read_json)
+
+async def _what_if(body, headers):
+    return await executor.run(api.what_if_response, _json_reader(body, headers))
+
+async def _feedback(body, headers):
+    return await executor.run(api.feedback_response, _json_reader(body, headers), _header(headers, b'x-admin-token'))
+
+async def _health(body, headers):
+    return await executor.run(api.health_response)
+
+async def _test(body, headers):
+    return await executor.run(api.test_response)
+
+async def _home(body, headers):
+    return api.static_response('home'), 200
+
+async def _model_info(body, headers):
+    # En el executor: la primera llamada puede cargar el modelo
+    return await executor.run(api.static_response, 'model_info'), 200
+
+async def _metrics(body, headers):
+    return api.metrics_response()
+
+ROUTES = {
+    '/': ('GET', _home),
+    '/api/health': ('GET', _health),
+    '/api/predict': ('POST', _predict),
+    '/api/predict/batch': ('POST', _predict_batch),
+    '/api/predict/what-if': ('POST', _what_if),
+    '/api/feedback': ('POST', _feedback),
+    '/api/model-info': ('GET', _model_info),
+    '/api/test': ('GET', _test),
+    '/api/metrics': ('GET', _metrics),
+}
+
+# Rutas que pasan por el control de admisión
+_SCORING_ROUTES = {'/api/predict', '/api/predict/batch', '/api/predict/what-if'}
+
+# Rutas que devuelven texto en lugar de JSON
+_TEXT_ROUTES = {'/api/metrics': METRICS_CONTENT_TYPE.encode('ascii')}
+
+async def _send(send, status, body, extra_headers=(), head=False, content_type=b'application/json'):
+    headers = [
+        (b'content-type', content_type),
+        (b'content-length', str(len(body)).encode('ascii')),
+    ]
+    headers.extend(extra_headers)
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': b'' if head else body})
+
+async def _send_static(send, static, headers, cors, head=False):
+    """Envía un cuerpo precodificado, o 304 si el cliente ya tiene esa versión; devuelve el código"""
+    extra = cors + [(b'etag', static.etag.encode('ascii')),
+                    (b'cache-control', api.STATIC_CACHE_CONTROL.encode('latin-1'))]
+    if static.matches(_header(headers, b'if-none-match')):
+        await send({'type': 'http.response.start', 'status': 304, 'headers': extra})
+        await send({'type': 'http.response.body', 'body': b''})
+        return 304
+    await _send(send, static.status, static.body, extra, head=head)
+    return static.status
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            executor.start()
+            # Cargar el modelo antes de recibir tráfico, fuera del loop
+            await executor.run(api.active_bundle)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            executor.shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+async def app(scope, receive, send):
+    """Aplicación ASGI 3"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    headers = dict(scope['headers'])
+    method = scope['method']
+    path = scope['path']
+    origin = headers.get(b'origin')
+    cors = [(b'access-control-allow-origin', origin), (b'vary', b'Origin')] if origin else []
+
+    # Preflight de CORS, igual que flask_cors
+    if method == 'OPTIONS' and b'access-control-request-method' in headers:
+        cors.append((b'access-control-allow-methods', _CORS_METHODS))
+        if b'access-control-request-headers' in headers:
+            cors.append((b'access-control-allow-headers', headers[b'access-control-request-headers']))
+        await _send(send, 200, b'', cors, content_type=b'text/html; charset=utf-8')
+        http_requests.labels(path if path in ROUTES else 'desconocida', 200).inc()
+        return
+
+    route = ROUTES.get(path)
+    if route is None:
+        await _send(send, 404, _encode(api.NOT_FOUND_BODY), cors, head=method == 'HEAD')
+        http_requests.labels('desconocida', 404).inc()
+        return
+
+    allowed, handler = route
+    if method != allowed and not (method == 'HEAD' and allowed == 'GET'):
+        allow = f'{allowed}, OPTIONS' + (', HEAD' if allowed == 'GET' else '')
+        body = _encode({'error': 'Método no permitido', 'mensaje': f'El endpoint solo admite {allowed}'})
+        await _send(send, 405, body, cors + [(b'allow', allow.encode('ascii'))])
+        http_requests.labels(path, 405).inc()
+        return
+
+    body = await _read_body(receive) if method == 'POST' else b''
+    if body is None:
+        return  # El cliente se desconectó antes de terminar de enviar el cuerpo
+
+    # La etapa 'total' empieza con el cuerpo ya recibido, igual que en Flask
+    started = time.perf_counter()
+
+    # Admisión sin esperar: en el loop no se bloquea; la cola de espera es la
+    # del executor, acotada por ASYNC_MAX_PENDING
+    admitted = False
+    if path in _SCORING_ROUTES and api.admission.enabled:
+        client_id = _header(headers, api.ADMISSION_CLIENT_HEADER.lower().encode('latin-1'))
+        if client_id is None and scope.get('client'):
+            client_id = scope['client'][0]
+        rejection = api.admission.admit(client_id, blocking=False)
+        if rejection is not None:
+            payload, status, extra = api.rejection_response(rejection)
+            retry_after = [(b'retry-after', extra['Retry-After'].encode('ascii'))]
+            await _send(send, status, _encode(payload), cors + retry_after)
+            http_requests.labels(path, status).inc()
+            return
+        admitted = True
+
+    try:
+        payload, status = await handler(body, headers)
+    except Exception:
+        payload, status = api.INTERNAL_ERROR_BODY, 500
+    finally:
+        if admitted:
+            api.admission.release()
+
+    if isinstance(payload, StaticResponse):
+        status = await _send_static(send, payload, headers, cors, head=method == 'HEAD')
+    elif path in _TEXT_ROUTES and status == 200:
+        await _send(send, status, payload.encode('utf-8'), cors, head=method == 'HEAD',
+                    content_type=_TEXT_ROUTES[path])
+    else:
+        encoded = api.timed_serialization(_encode, payload, started) if handler is _predict else _encode(payload)
+        await _send(send, status, encoded, cors, head=method == 'HEAD')
+    http_requests.labels(path, status).inc()
@@ -0,0 +1,132 @@
+"""
+Benchmark del arranque en frío de la API.
+
+Lanza procesos de Python nuevos que importan app.py y hacen la primera
+petición a /api/predict con el cliente de pruebas de Flask. Mide el tiempo
+desde el inicio del import hasta la primera respuesta 200 y lo compara con un
+presupuesto; también falla si la ruta de servicio importó pandas o sklearn.
+
+Uso:
+    python benchmark_arranque.py
+    python benchmark_arranque.py --repeticiones 10 --presupuesto-ms 800 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Presupuesto por defecto desde el import hasta la primera predicción
+STARTUP_BUDGET_MS = float(os.environ.get('STARTUP_BUDGET_MS', 1000))
+
+# Módulos que la ruta de servicio no debe cargar
+HEAVY_MODULES = ('pandas', 'sklearn', 'scipy', 'joblib')
+
+# Se ejecuta en un proceso nuevo para que ningún módulo esté ya en caché
+_CHILD = r'''
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().post('/api/predict', json={
+    'genero': 'F', 'apoyo_familiar': 4, 'ingresos_familiares': 3,
+    'horas_estudio': 15, 'actividades_extra': 5, 'nivel_educativo_padres': 4,
+    'acceso_internet': 1, 'clima_familiar': 4, 'asistencia': 90, 'motivacion': 4
+})
+finished = time.perf_counter()
+print('@@' + json.dumps({
+    'status': response.status_code,
+    'import_ms': (imported - started) * 1000,
+    'primera_prediccion_ms': (finished - imported) * 1000,
+    'total_ms': (finished - started) * 1000,
+    'modulos': sorted(name for name in %r if name in sys.modules)
+}))
+''' % (HEAVY_MODULES,)
+
+def run_once(env):
+    """
+    Arranca un proceso, importa la API y hace la primera predicción
+
+    Returns:
+        dict: Tiempos del proceso hijo más 'proceso_ms' (incluye arrancar el intérprete)
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-c', _CHILD],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+
+    lines = [line for line in completed.stdout.splitlines() if line.startswith('@@')]
+    if completed.returncode != 0 or not lines:
+        raise RuntimeError(f'El proceso de arranque falló:\n{completed.stderr.strip()}')
+
+    result = json.loads(lines[-1][2:])
+    result['proceso_ms'] = elapsed
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Mide el tiempo desde el import de la API hasta la primera predicción')
+    parser.add_argument('--repeticiones', type=int, default=5, help='Procesos a lanzar (por defecto 5)')
+    parser.add_argument('--presupuesto-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help='Mediana máxima permitida del import a la primera predicción')
+    parser.add_argument('--permitir-modulos', action='store_true',
+                        help='No fallar si se importan pandas, sklearn, scipy o joblib')
+    parser.add_argument('--json', action='store_true', help='Imprimir el resultado como JSON')
+    args = parser.parse_args(argv)
+
+    if args.repeticiones <= 0:
+        parser.error('--repeticiones debe ser mayor que 0')
+
+    env = dict(os.environ, MODEL_WATCH_INTERVAL='0', PYTHONDONTWRITEBYTECODE='1')
+
+    runs = [run_once(env) for _ in range(args.repeticiones)]
+    failed = [run for run in runs if run['status'] != 200]
+    heavy = sorted({name for run in runs for name in run['modulos']})
+
+    summary = {
+        'repeticiones': len(runs),
+        'presupuesto_ms': args.presupuesto_ms,
+        'mediana_total_ms': statistics.median(run['total_ms'] for run in runs),
+        'mediana_import_ms': statistics.median(run['import_ms'] for run in runs),
+        'mediana_primera_prediccion_ms': statistics.median(run['primera_prediccion_ms'] for run in runs),
+        'mediana_proceso_ms': statistics.median(run['proceso_ms'] for run in runs),
+        'modulos_pesados': heavy,
+        'respuestas_fallidas': len(failed)
+    }
+
+    problems = []
+    if failed:
+        problems.append(f'{len(failed)} arranque(s) no respondieron 200')
+    if summary['mediana_total_ms'] > args.presupuesto_ms:
+        problems.append(f"la mediana ({summary['mediana_total_ms']:.1f} ms) supera el presupuesto")
+    if heavy and not args.permitir_modulos:
+        problems.append(f"la ruta de servicio importó {', '.join(heavy)}")
+    summary['dentro_del_presupuesto'] = not problems
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print("=" * 60)
+        print(f"⏱️  Arranque en frío ({len(runs)} procesos)")
+        print("=" * 60)
+        print(f"   Import de app.py:        {summary['mediana_import_ms']:8.1f} ms")
+        print(f"   Primera predicción:      {summary['mediana_primera_prediccion_ms']:8.1f} ms")
+        print(f"   Import → predicción:     {summary['mediana_total_ms']:8.1f} ms (presupuesto {args.presupuesto_ms:.0f} ms)")
+        print(f"   Proceso completo:        {summary['mediana_proceso_ms']:8.1f} ms")
+        print(f"   Módulos pesados:         {', '.join(heavy) or 'ninguno'}")
+        print("=" * 60)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print("✅ Dentro del presupuesto")
+
+    return 1 if problems else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Compara la API Flask (servir.py) con la variante ASGI (app_async.py) bajo la
+misma carga.
+
+Arranca ambos servidores en puertos libres y, para cada nivel de concurrencia,
+mantiene esa cantidad de clientes lentos: cada uno abre una conexión, envía las
+cabeceras, espera --lento-ms antes de enviar el cuerpo y lee la respuesta. Se
+reportan peticiones por segundo, p50 y p99 de latencia y errores, y el mayor
+nivel de concurrencia en que el p99 se mantiene bajo --slo-ms.
+
+Uso:
+    python benchmark_async.py
+    python benchmark_async.py --concurrencia 8,32,128,512 --duracion 5 --hilos 8 --lento-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SAMPLE_STUDENT = {
+    'genero': 'F',
+    'apoyo_familiar': 4,
+    'ingresos_familiares': 3,
+    'horas_estudio': 15,
+    'actividades_extra': 5,
+    'nivel_educativo_padres': 4,
+    'acceso_internet': 1,
+    'clima_familiar': 4,
+    'asistencia': 90,
+    'motivacion': 4
+}
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _wait_ready(port, process, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'El servidor terminó al arrancar (código {process.returncode})')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'El servidor del puerto {port} no respondió a tiempo')
+
+def start_server(kind, port, threads):
+    """Arranca el servidor Flask ('flask') o ASGI ('asgi') con un solo proceso"""
+    env = dict(os.environ, MODEL_WATCH_INTERVAL='0', PREDICTION_CACHE_SIZE='0',
+               ASYNC_EXECUTOR_THREADS=str(threads))
+    if kind == 'flask':
+        command = [sys.executable, 'servir.py', '--host', '127.0.0.1', '--puerto', str(port),
+                   '--workers', '1', '--hilos', str(threads)]
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'app_async:app', '--host', '127.0.0.1',
+                   '--port', str(port), '--log-level', 'warning', '--no-access-log']
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _wait_ready(port, process)
+    return process
+
+async def _slow_request(port, body, delay):
+    """Una petición de un cliente lento; devuelve (código HTTP, segundos)"""
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(
+            b'POST /api/predict HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n'
+            b'Connection: close\r\nContent-Length: ' + str(len(body)).encode() + b'\r\n\r\n'
+        )
+        await writer.drain()
+        if delay:
+            await asyncio.sleep(delay)
+        writer.write(body)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - started
+
+async def run_level(port, concurrency, duration, delay):
+    """Mantiene `concurrency` clientes durante `duration` segundos"""
+    body = json.dumps(SAMPLE_STUDENT).encode()
+    latencies = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    async def client():
+        nonlocal errors
+        while time.perf_counter() < stop_at:
+            try:
+                status, elapsed = await asyncio.wait_for(_slow_request(port, body, delay), timeout=30)
+            except (OSError, asyncio.TimeoutError):
+                errors += 1
+                continue
+            if status == 200:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(q):
+        if not latencies:
+            return float('nan')
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    return {
+        'concurrencia': concurrency,
+        'peticiones': len(latencies),
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+        'errores': errors
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compara la API Flask y la ASGI bajo la misma carga')
+    parser.add_argument('--concurrencia', default='8,32,128,256',
+                        help='Niveles de clientes simultáneos separados por comas')
+    parser.add_argument('--duracion', type=float, default=5.0, help='Segundos por nivel')
+    parser.add_argument('--lento-ms', type=float, default=50.0,
+                        help='Pausa de cada cliente entre cabeceras y cuerpo')
+    parser.add_argument('--hilos', type=int, default=8,
+                        help='Hilos del servidor Flask y del executor ASGI')
+    parser.add_argument('--slo-ms', type=float, default=250.0,
+                        help='p99 máximo para considerar que un nivel se sostiene')
+    parser.add_argument('--json', action='store_true', help='Imprimir el resultado como JSON')
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrencia.split(',') if level.strip()]
+    report = {}
+
+    for kind in ('flask', 'asgi'):
+        port = _free_port()
+        process = start_server(kind, port, args.hilos)
+        try:
+            report[kind] = [
+                asyncio.run(run_level(port, level, args.duracion, args.lento_ms / 1000.0))
+                for level in levels
+            ]
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    limits = {
+        kind: max((row['concurrencia'] for row in rows
+                   if row['p99_ms'] <= args.slo_ms and not row['errores']), default=0)
+        for kind, rows in report.items()
+    }
+
+    if args.json:
+        print(json.dumps({'niveles': report, 'concurrencia_maxima': limits, 'slo_ms': args.slo_ms}, indent=2))
+        return 0
+
+    print("=" * 72)
+    print(f"⚖️  Flask vs ASGI: {args.hilos} hilos, clientes con {args.lento_ms:.0f} ms de pausa")
+    print("=" * 72)
+    print(f"{'servidor':<8} {'clientes':>8} {'peticiones':>10} {'pet/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errores':>8}")
+    for kind, rows in report.items():
+        for row in rows:
+            print(f"{kind:<8} {row['concurrencia']:>8} {row['peticiones']:>10} {row['rps']:>9.1f} "
+                  f"{row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['errores']:>8}")
+    print("=" * 72)
+    for kind, limit in limits.items():
+        print(f"   {kind}: concurrencia máxima con p99 ≤ {args.slo_ms:.0f} ms: {limit or 'ninguna'}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
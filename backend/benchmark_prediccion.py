@@ -0,0 +1,287 @@
+"""
+Benchmark de las etapas de la predicción con comparación contra una línea base.
+
+Mide, para cada tamaño de lote (por defecto 1, 100, 10.000 y 1.000.000 filas):
+
+    validacion   preprocess_input (1 fila) o preprocess_batch (N filas)
+    modelo       scaler + predict_proba (o el modelo fusionado / artefacto)
+    reglas       identify_key_factors + get_recommendations
+    prediccion   predict_performance (1 fila) o predict_batch (N filas)
+    api          /api/predict o /api/predict/batch con el cliente de pruebas de Flask
+
+De cada combinación reporta p50, p95 y p99 de latencia por llamada, filas por
+segundo y el pico de memoria asignada (tracemalloc, en una llamada aparte para
+no afectar los tiempos). Los lotes de la API mayores que MAX_BATCH_SIZE se
+omiten porque el endpoint los rechaza.
+
+Con --salida el resultado se guarda como JSON; con --linea-base se compara
+contra un resultado anterior y el proceso termina con código 1 si el p50 o el
+pico de memoria de alguna etapa empeoran más que --tolerancia.
+
+Uso:
+    python benchmark_prediccion.py --salida benchmarks/linea_base.json
+    python benchmark_prediccion.py --linea-base benchmarks/linea_base.json
+    python benchmark_prediccion.py --tamanos 1,100 --etapas validacion,api --tiempo-min 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# La API se importa sin vigilante, sin caché y sin registrar cada predicción
+os.environ.setdefault('MODEL_WATCH_INTERVAL', '0')
+os.environ.setdefault('PREDICTION_CACHE_SIZE', '0')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from utils.synthetic import generate_students
+
+STAGES = ('validacion', 'modelo', 'reglas', 'prediccion', 'api')
+BATCH_SIZES = (1, 100, 10_000, 1_000_000)
+
+# Empeoramiento relativo permitido frente a la línea base
+BENCHMARK_TOLERANCE = float(os.environ.get('BENCHMARK_TOLERANCE', 0.25))
+
+# Estudiantes distintos generados; los lotes grandes los repiten para no
+# ocupar cientos de MB solo en diccionarios de entrada
+_POOL_SIZE = 10_000
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def measure(function, n_rows, min_time, min_repeats, max_repeats):
+    """
+    Ejecuta function() hasta cubrir min_time segundos y min_repeats llamadas
+
+    Returns:
+        dict: Percentiles de latencia (ms), filas por segundo, llamadas y pico de memoria (MB)
+    """
+    function()  # Calentamiento: cachés de CPU, imports diferidos, primera asignación
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < max_repeats and (
+        len(timings) < min_repeats or time.perf_counter() - started < min_time
+    ):
+        call_started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - call_started)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    mean = sum(timings) / len(timings)
+    return {
+        'filas': n_rows,
+        'llamadas': len(timings),
+        'p50_ms': _percentile(timings, 0.50) * 1000,
+        'p95_ms': _percentile(timings, 0.95) * 1000,
+        'p99_ms': _percentile(timings, 0.99) * 1000,
+        'filas_por_segundo': n_rows / mean if mean else float('inf'),
+        'memoria_pico_mb': peak / 1e6
+    }
+
+def build_cases(api, stages, sizes, use_sklearn):
+    """
+    Prepara una función sin argumentos por cada (etapa, tamaño)
+
+    Returns:
+        tuple: (casos {clave: (filas, función)}, omitidos {clave: motivo})
+    """
+    from utils.inference import load_inference_pair
+    from utils.preprocessing import preprocess_input, preprocess_batch
+    from utils.predictor import (
+        predict_performance, predict_batch, identify_key_factors_batch, get_recommendations_batch
+    )
+
+    model, scaler = load_inference_pair(api.MODEL_PATH, api.SCALER_PATH, use_sklearn=use_sklearn,
+                                        artifact_path=api.ARTIFACT_PATH)
+    client = api.app.test_client() if 'api' in stages else None
+
+    pool = generate_students(min(_POOL_SIZE, max(sizes)), seed=42)
+    cases, skipped = {}, {}
+
+    for n_rows in sizes:
+        records = [pool[i % len(pool)] for i in range(n_rows)]
+        matrix, _, _ = preprocess_batch(records)
+        predictions = model.predict_proba(
+            scaler.transform(matrix) if scaler is not None else matrix
+        ).argmax(axis=1)
+
+        def scaled(matrix=matrix):
+            return scaler.transform(matrix) if scaler is not None else matrix
+
+        if n_rows == 1:
+            row = matrix[0]
+            candidates = {
+                'validacion': lambda record=records[0]: preprocess_input(record),
+                'prediccion': lambda row=row: predict_performance(model, scaler, row),
+            }
+        else:
+            candidates = {
+                'validacion': lambda records=records: preprocess_batch(records),
+                'prediccion': lambda matrix=matrix: predict_batch(model, scaler, matrix),
+            }
+        candidates['modelo'] = lambda scaled=scaled: model.predict_proba(scaled())
+        candidates['reglas'] = lambda matrix=matrix, predictions=predictions: (
+            identify_key_factors_batch(matrix), get_recommendations_batch(predictions, matrix)
+        )
+
+        if client is not None:
+            if n_rows == 1:
+                candidates['api'] = _api_call(client, '/api/predict', records[0])
+            elif n_rows <= api.MAX_BATCH_SIZE:
+                candidates['api'] = _api_call(client, '/api/predict/batch', records)
+            else:
+                skipped[f'api/{n_rows}'] = f'supera MAX_BATCH_SIZE ({api.MAX_BATCH_SIZE})'
+
+        for stage in stages:
+            if stage in candidates:
+                cases[f'{stage}/{n_rows}'] = (n_rows, candidates[stage])
+
+    return cases, skipped
+
+def _api_call(client, path, payload):
+    # El cuerpo se serializa una vez: se mide la API, no al cliente
+    body = json.dumps(payload)
+
+    def call():
+        response = client.post(path, data=body, content_type='application/json')
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} respondió {response.status_code}: {response.get_data(as_text=True)[:200]}')
+        return response
+
+    return call
+
+def compare(results, baseline, tolerance):
+    """
+    Compara p50 y pico de memoria contra la línea base
+
+    Returns:
+        list: Una entrada por métrica que empeoró más que la tolerancia
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric in ('p50_ms', 'memoria_pico_mb'):
+            before, after = previous[metric], current[metric]
+            if before > 0 and after > before * (1 + tolerance):
+                regressions.append({
+                    'caso': key,
+                    'metrica': metric,
+                    'linea_base': before,
+                    'actual': after,
+                    'cambio': after / before - 1
+                })
+    return regressions
+
+def _environment(use_sklearn):
+    return {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'inferencia': 'sklearn' if use_sklearn else 'fusionado'
+    }
+
+def _parse_list(text, cast):
+    return [cast(item.strip().replace('_', '')) for item in text.split(',') if item.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de las etapas de la predicción')
+    parser.add_argument('--tamanos', default=','.join(map(str, BATCH_SIZES)),
+                        help='Filas por lote separadas por comas (por defecto 1,100,10000,1000000)')
+    parser.add_argument('--etapas', default=','.join(STAGES), help=f"Etapas a medir ({', '.join(STAGES)})")
+    parser.add_argument('--tiempo-min', type=float, default=1.0, help='Segundos mínimos por caso')
+    parser.add_argument('--min-repeticiones', type=int, default=5, help='Llamadas mínimas por caso')
+    parser.add_argument('--max-repeticiones', type=int, default=10000, help='Llamadas máximas por caso')
+    parser.add_argument('--sklearn', action='store_true', help='Medir scaler.transform + predict_proba de sklearn')
+    parser.add_argument('--salida', help='Guardar el resultado como JSON en esta ruta')
+    parser.add_argument('--linea-base', help='Resultado JSON anterior con el que comparar')
+    parser.add_argument('--tolerancia', type=float, default=BENCHMARK_TOLERANCE,
+                        help='Empeoramiento relativo permitido (0.25 = 25%%)')
+    parser.add_argument('--json', action='store_true', help='Imprimir el resultado como JSON')
+    args = parser.parse_args(argv)
+
+    sizes = _parse_list(args.tamanos, int)
+    stages = _parse_list(args.etapas, str)
+    unknown = sorted(set(stages) - set(STAGES))
+    if unknown:
+        parser.error(f"Etapas desconocidas: {', '.join(unknown)}")
+    if not sizes or min(sizes) < 1:
+        parser.error('--tamanos debe contener enteros mayores que 0')
+
+    baseline = None
+    if args.linea_base:
+        with open(args.linea_base, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    if args.sklearn:
+        os.environ['USE_SKLEARN_INFERENCE'] = '1'
+    import app as api
+
+    cases, skipped = build_cases(api, stages, sizes, args.sklearn)
+
+    if not args.json:
+        print("=" * 72)
+        print(f"⏱️  Benchmark de predicción ({_environment(args.sklearn)['inferencia']}): "
+              f"{len(cases)} casos, tamaños {', '.join(map(str, sizes))}")
+        print("=" * 72)
+
+    results = {}
+    for key, (n_rows, function) in cases.items():
+        results[key] = measure(function, n_rows, args.tiempo_min, args.min_repeticiones, args.max_repeticiones)
+        if not args.json:
+            row = results[key]
+            print(f"   {key:<22} p50 {row['p50_ms']:10.3f} ms  p99 {row['p99_ms']:10.3f} ms  "
+                  f"{row['filas_por_segundo']:14,.0f} filas/s  {row['memoria_pico_mb']:9.2f} MB", flush=True)
+
+    report = {'entorno': _environment(args.sklearn), 'resultados': results, 'omitidos': skipped}
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare(results, baseline.get('resultados', {}), args.tolerancia)
+        report['comparacion'] = {
+            'linea_base': args.linea_base,
+            'tolerancia': args.tolerancia,
+            'regresiones': regressions
+        }
+
+    if args.salida:
+        os.makedirs(os.path.dirname(os.path.abspath(args.salida)), exist_ok=True)
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("=" * 72)
+        for key, reason in skipped.items():
+            print(f"   ⏭️  {key}: omitido, {reason}")
+        if args.salida:
+            print(f"💾 Resultado guardado en {args.salida}")
+        if baseline is not None:
+            for item in regressions:
+                print(f"❌ {item['caso']} {item['metrica']}: {item['linea_base']:.3f} → {item['actual']:.3f} "
+                      f"(+{item['cambio']:.0%}, tolerancia {args.tolerancia:.0%})")
+            if not regressions:
+                print(f"✅ Sin regresiones frente a {args.linea_base} (tolerancia {args.tolerancia:.0%})")
+
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
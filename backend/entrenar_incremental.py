@@ -0,0 +1,355 @@
+"""
+Entrenamiento por bloques para históricos de millones de estudiantes.
+
+Lee un archivo CSV o Parquet por bloques. El archivo trae los campos del
+formulario (o las columnas del modelo) y la clase observada de cada
+estudiante. Nunca hay más de un bloque en memoria:
+
+    1. Lectura: cada bloque se valida con el mismo esquema que la API. Las
+       filas válidas se reparten entre entrenamiento y prueba según su número
+       de fila, así que la partición no depende del tamaño de bloque. Se
+       escriben en archivos binarios temporales, y el MinMaxScaler se ajusta
+       con partial_fit sobre las de entrenamiento en esta misma pasada.
+    2. Épocas: la regresión logística multinomial se ajusta con
+       IncrementalSoftmax (mini-lotes con Adam), recorriendo los bloques del
+       archivo temporal en orden aleatorio.
+    3. Evaluación: precisión y log-loss en entrenamiento y en prueba.
+
+Escribe los mismos archivos que entrenar_modelo_10_features.py y que la API
+carga: modelo_rl.pkl, scaler.pkl, modelo_rl.bin y modelo_rl.json. Antes hace
+una copia de seguridad de los anteriores. Al final informa del tiempo y del
+pico de memoria (RSS) de cada fase.
+
+Uso:
+    python entrenar_incremental.py historico.csv
+    python entrenar_incremental.py historico.parquet --tamano-bloque 200000 --epocas 10
+    python entrenar_incremental.py sintetico.csv --generar 5000000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from puntuar_cohorte import read_chunks
+from utils.artifact import save_artifact
+from utils.features import FEATURE_SCHEMA, REQUIRED_FIELDS, N_FEATURES, CLASS_NAMES
+from utils.incremental import IncrementalSoftmax, holdout_mask
+from utils.metadata import save_metadata
+from utils.synthetic import generate_matrix, performance_labels
+from utils.validation import validate_records
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, 'model')
+
+CLASSES = np.arange(len(CLASS_NAMES))
+
+# La clase puede venir como número (0, 1, 2) o como nombre ('Bajo', 'Medio', 'Alto')
+_CLASS_CODES = {name.lower(): i for i, name in enumerate(CLASS_NAMES)}
+_CLASS_CODES.update({str(i): i for i in CLASSES})
+
+_FEATURE_BYTES = N_FEATURES * np.dtype(np.float64).itemsize
+
+def peak_rss_mb():
+    """
+    Pico de memoria residente del proceso hasta ahora
+
+    Returns:
+        float | None: MB, o None si la plataforma no lo expone (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB y macOS en bytes
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+def encode_labels(values):
+    """
+    Convierte la columna de clase a 0/1/2
+
+    Returns:
+        np.ndarray: Código de cada fila, o -1 si la clase no es válida
+    """
+    text = pd.Series(values).astype(str).str.strip().str.lower().str.replace(r'\.0$', '', regex=True)
+    return text.map(_CLASS_CODES).fillna(-1).to_numpy(dtype=np.int64)
+
+class SpillFile:
+    """Filas validadas (float64) y sus clases (int8) en dos archivos binarios planos"""
+
+    def __init__(self, directory, name):
+        self.features_path = os.path.join(directory, f'{name}.f64')
+        self.labels_path = os.path.join(directory, f'{name}.i8')
+        self._features = open(self.features_path, 'wb')
+        self._labels = open(self.labels_path, 'wb')
+        self.rows = 0
+
+    def append(self, matrix, labels):
+        self._features.write(np.ascontiguousarray(matrix, dtype=np.float64).tobytes())
+        self._labels.write(labels.astype(np.int8).tobytes())
+        self.rows += len(labels)
+
+    def close(self):
+        self._features.close()
+        self._labels.close()
+
+    def blocks(self, block_size, order=None):
+        """
+        Lee el archivo por bloques con np.fromfile (sin mapearlo entero en memoria)
+
+        Args:
+            block_size (int): Filas por bloque
+            order (array-like, optional): Orden en que visitar los bloques
+
+        Yields:
+            tuple: (matriz, clases) de cada bloque
+        """
+        n_blocks = -(-self.rows // block_size)
+        for block in (range(n_blocks) if order is None else order):
+            start = block * block_size
+            count = min(block_size, self.rows - start)
+            matrix = np.fromfile(self.features_path, dtype=np.float64, count=count * N_FEATURES,
+                                 offset=start * _FEATURE_BYTES).reshape(count, N_FEATURES)
+            labels = np.fromfile(self.labels_path, dtype=np.int8, count=count, offset=start)
+            yield matrix, labels.astype(np.int64)
+
+def _class_column(columns, name):
+    for candidate in (name, name.capitalize(), name.lower()):
+        if candidate in columns:
+            return candidate
+    return None
+
+def read_pass(chunks, class_column, train, test, scaler, test_fraction):
+    """
+    Primera pasada: valida, reparte entre entrenamiento y prueba y ajusta el scaler
+
+    Returns:
+        tuple: (filas leídas, filas descartadas)
+    """
+    total = rejected = 0
+    for chunk in chunks:
+        rows = np.arange(total, total + len(chunk))
+        total += len(chunk)
+
+        matrix, valid_indices, _ = validate_records(chunk[REQUIRED_FIELDS].to_dict('records'))
+        labels = encode_labels(chunk[class_column].to_numpy())[valid_indices]
+        labelled = labels >= 0
+        matrix, labels, rows = matrix[labelled], labels[labelled], rows[valid_indices][labelled]
+        rejected += len(chunk) - len(labels)
+
+        # Partición estable según el número de fila, independiente del tamaño de bloque
+        is_test = holdout_mask(rows, test_fraction)
+        if (~is_test).any():
+            scaler.partial_fit(matrix[~is_test])
+            train.append(matrix[~is_test], labels[~is_test])
+        if is_test.any():
+            test.append(matrix[is_test], labels[is_test])
+        print(f"   {total:,} filas leídas", flush=True)
+    return total, rejected
+
+def evaluate(model, scaler, spill, block_size):
+    """
+    Precisión y log-loss media de un archivo temporal
+
+    Returns:
+        tuple: (precisión, log-loss)
+    """
+    hits, loss = 0, 0.0
+    for matrix, labels in spill.blocks(block_size):
+        block_hits, block_loss = model.evaluate(scaler.transform(matrix), labels)
+        hits += block_hits
+        loss += block_loss
+    rows = max(spill.rows, 1)
+    return hits / rows, loss / rows
+
+def write_synthetic(path, n_rows, chunk_size, seed):
+    """Escribe un CSV de estudiantes sintéticos con su clase, por bloques"""
+    fields = [spec['campo'] for spec in FEATURE_SCHEMA]
+    for i, start in enumerate(range(0, n_rows, chunk_size)):
+        matrix = generate_matrix(min(chunk_size, n_rows - start), seed=seed + i)
+        frame = pd.DataFrame(matrix, columns=fields)
+        frame['genero'] = np.where(matrix[:, 0] == 1, 'F', 'M')
+        for spec in FEATURE_SCHEMA:
+            if spec['tipo'] in ('entero', 'binario'):
+                frame[spec['campo']] = frame[spec['campo']].astype(np.int64)
+            elif spec['tipo'] == 'real':
+                frame[spec['campo']] = frame[spec['campo']].round(2)
+        frame['rendimiento'] = performance_labels(matrix)
+        frame.to_csv(path, mode='a' if i else 'w', header=not i, index=False)
+
+def save_model_files(model_dir, modelo, scaler):
+    """
+    Guarda modelo, scaler y artefacto con copia de seguridad de los anteriores
+
+    Returns:
+        dict: Tamaño en bytes de cada archivo escrito
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    model_path = os.path.join(model_dir, 'modelo_rl.pkl')
+    scaler_path = os.path.join(model_dir, 'scaler.pkl')
+
+    # Copias (no renombrados) para que el servidor nunca encuentre los archivos ausentes
+    for path, backup in ((model_path, 'modelo_rl_old.pkl'), (scaler_path, 'scaler_old.pkl')):
+        if os.path.exists(path):
+            shutil.copy2(path, os.path.join(model_dir, backup))
+
+    joblib.dump(modelo, f'{model_path}.tmp')
+    joblib.dump(scaler, f'{scaler_path}.tmp')
+    os.replace(f'{scaler_path}.tmp', scaler_path)
+    os.replace(f'{model_path}.tmp', model_path)
+
+    return {
+        'modelo_rl.pkl': os.path.getsize(model_path),
+        'scaler.pkl': os.path.getsize(scaler_path),
+        'modelo_rl.bin': save_artifact(os.path.join(model_dir, 'modelo_rl.bin'), modelo, scaler)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Entrena el modelo por bloques desde un archivo CSV o Parquet')
+    parser.add_argument('entrada', help='CSV o Parquet con un estudiante por fila y su clase observada')
+    parser.add_argument('--columna-clase', default='rendimiento',
+                        help="Columna con la clase (0/1/2 o Bajo/Medio/Alto; por defecto 'rendimiento')")
+    parser.add_argument('--tamano-bloque', type=int, default=100000, help='Filas por bloque (por defecto 100000)')
+    parser.add_argument('--epocas', type=int, default=5, help='Pasadas sobre los datos de entrenamiento')
+    parser.add_argument('--lote', type=int, default=1024, help='Filas por actualización de pesos')
+    parser.add_argument('--tasa-aprendizaje', type=float, default=0.2, help='Paso inicial de Adam')
+    parser.add_argument('--C', type=float, default=1.0, dest='C',
+                        help='Inversa de la regularización L2, como en LogisticRegression')
+    parser.add_argument('--fraccion-prueba', type=float, default=0.3, help='Fracción de filas de prueba')
+    parser.add_argument('--semilla', type=int, default=42, help='Semilla para barajar los bloques')
+    parser.add_argument('--dir-modelo', default=MODEL_DIR, help='Carpeta donde escribir los artefactos')
+    parser.add_argument('--dir-temporal', help='Carpeta para los archivos temporales (por defecto la del sistema)')
+    parser.add_argument('--generar', type=int, metavar='N',
+                        help='Escribir antes N estudiantes sintéticos en la entrada (para pruebas)')
+    args = parser.parse_args(argv)
+
+    if args.tamano_bloque <= 0 or args.lote <= 0 or args.epocas <= 0:
+        parser.error('--tamano-bloque, --lote y --epocas deben ser mayores que 0')
+    if not 0 < args.fraccion_prueba < 1:
+        parser.error('--fraccion-prueba debe estar entre 0 y 1')
+
+    print("=" * 70)
+    print("🤖 Entrenamiento incremental por bloques")
+    print("=" * 70)
+
+    if args.generar:
+        print(f"🧪 Generando {args.generar:,} estudiantes sintéticos en {args.entrada}...")
+        write_synthetic(args.entrada, args.generar, args.tamano_bloque, args.semilla)
+
+    chunks = read_chunks(args.entrada, args.tamano_bloque)
+    first = next(chunks, None)
+    if first is None:
+        print("❌ ERROR: El archivo de entrada está vacío")
+        return 1
+    class_column = _class_column(first.columns, args.columna_clase)
+    missing = [column for column in REQUIRED_FIELDS if column not in first.columns]
+    if class_column is None:
+        missing.append(args.columna_clase)
+    if missing:
+        print(f"❌ ERROR: Faltan columnas en el archivo de entrada: {', '.join(missing)}")
+        return 1
+
+    def all_chunks():
+        yield first
+        yield from chunks
+
+    phases = {}
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(prefix='entrenamiento_', dir=args.dir_temporal) as tmp_dir:
+        train, test = SpillFile(tmp_dir, 'entrenamiento'), SpillFile(tmp_dir, 'prueba')
+        scaler = MinMaxScaler()
+
+        print(f"\n📂 Pasada 1: validación y escalado ({args.entrada}, bloques de {args.tamano_bloque:,} filas)")
+        phase_started = time.perf_counter()
+        try:
+            total, rejected = read_pass(all_chunks(), class_column, train, test, scaler, args.fraccion_prueba)
+        finally:
+            train.close()
+            test.close()
+        phases['lectura'] = (time.perf_counter() - phase_started, peak_rss_mb())
+
+        if train.rows == 0 or test.rows == 0:
+            print("❌ ERROR: No quedaron filas válidas suficientes para entrenar y evaluar")
+            return 1
+        print(f"   Entrenamiento: {train.rows:,}  |  Prueba: {test.rows:,}  |  Descartadas: {rejected:,}")
+
+        model = IncrementalSoftmax(
+            N_FEATURES, CLASSES,
+            learning_rate=args.tasa_aprendizaje,
+            batch_size=args.lote,
+            alpha=1.0 / (args.C * train.rows),
+            seed=args.semilla
+        )
+        rng = np.random.default_rng(args.semilla)
+        n_blocks = -(-train.rows // args.tamano_bloque)
+
+        print(f"\n🔁 Ajuste: {args.epocas} épocas de {n_blocks} bloques")
+        phase_started = time.perf_counter()
+        for epoch in range(args.epocas):
+            loss = 0.0
+            for matrix, labels in train.blocks(args.tamano_bloque, order=rng.permutation(n_blocks)):
+                loss += model.partial_fit(scaler.transform(matrix), labels) * len(labels)
+            model.end_epoch()
+            print(f"   Época {epoch + 1}: log-loss {loss / train.rows:.4f}", flush=True)
+        phases['ajuste'] = (time.perf_counter() - phase_started, peak_rss_mb())
+
+        print("\n📏 Evaluación")
+        phase_started = time.perf_counter()
+        accuracy_train, loss_train = evaluate(model, scaler, train, args.tamano_bloque)
+        accuracy_test, loss_test = evaluate(model, scaler, test, args.tamano_bloque)
+        phases['evaluacion'] = (time.perf_counter() - phase_started, peak_rss_mb())
+        print(f"   - Precisión en entrenamiento: {accuracy_train:.2%} (log-loss {loss_train:.4f})")
+        print(f"   - Precisión en prueba: {accuracy_test:.2%} (log-loss {loss_test:.4f})")
+
+    modelo = model.to_sklearn()
+    try:
+        sizes = save_model_files(args.dir_modelo, modelo, scaler)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        return 1
+
+    elapsed = time.perf_counter() - started
+    peak = peak_rss_mb()
+    save_metadata(
+        os.path.join(args.dir_modelo, 'modelo_rl.json'),
+        {
+            'precision_entrenamiento': accuracy_train,
+            'precision_prueba': accuracy_test
+        },
+        files=[os.path.join(args.dir_modelo, name) for name in sizes],
+        modelo='Regresión Logística (entrenamiento incremental)',
+        muestras={'entrenamiento': train.rows, 'prueba': test.rows, 'descartadas': rejected},
+        clases=CLASS_NAMES,
+        entrenamiento={
+            'epocas': args.epocas,
+            'tiempo_s': round(elapsed, 2),
+            'rss_pico_mb': round(peak, 1) if peak is not None else None
+        }
+    )
+
+    print(f"\n💾 Archivos guardados en {args.dir_modelo}:")
+    for name, size in sizes.items():
+        print(f"   ✅ {name} ({size:,} bytes)")
+    print("   ✅ modelo_rl.json (métricas y huellas)")
+
+    print("\n" + "=" * 70)
+    print(f"⏱️  {total:,} filas en {elapsed:.2f} s ({total / elapsed if elapsed else 0:,.0f} filas/s)")
+    for name, (seconds, rss) in phases.items():
+        rss_text = f"{rss:,.1f} MB" if rss is not None else "no disponible"
+        print(f"   {name:<11} {seconds:8.2f} s   RSS pico acumulado {rss_text}")
+    print("=" * 70)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,6 @@
+import argparse
+import time
+
 import pandas as pd
 import numpy as np
 from sklearn.linear_model import LogisticRegression
@@ -5,159 +8,207 @@ from sklearn.preprocessing import MinMaxScaler
 from sklearn.model_selection import train_test_split
 import joblib
 import os
-
-print("🤖 Entrenando modelo con 10 características...")
-print("=" * 70)
-
-# Crear dataset sintético con las 10 variables de tu sistema
-np.random.seed(42)
-n_samples = 200
-
-# Generar datos realistas
-data = {
-    'Genero': np.random.randint(0, 2, n_samples),
-    'Apoyo_Familiar': np.random.randint(1, 6, n_samples),
-    'Ingresos_Familiares': np.random.randint(1, 6, n_samples),
-    'Horas_Estudio': np.random.uniform(0, 40, n_samples),
-    'Actividades_Extra': np.random.uniform(0, 20, n_samples),
-    'Nivel_Educativo_Padres': np.random.randint(1, 6, n_samples),
-    'Acceso_Internet': np.random.randint(0, 2, n_samples),
-    'Clima_Familiar': np.random.randint(1, 6, n_samples),
-    'Asistencia': np.random.uniform(60, 100, n_samples),
-    'Motivacion': np.random.randint(1, 6, n_samples)
-}
-
-df = pd.DataFrame(data)
-
-# Crear variable objetivo basada en factores importantes
-# Lógica: buenos estudiantes = más horas estudio + apoyo + motivación
-rendimiento_score = (
-    (df['Horas_Estudio'] / 40) * 0.3 +
-    (df['Apoyo_Familiar'] / 5) * 0.25 +
-    (df['Motivacion'] / 5) * 0.2 +
-    (df['Asistencia'] / 100) * 0.15 +
-    (df['Clima_Familiar'] / 5) * 0.1
-)
-
-# Clasificar en 3 categorías
-df['Rendimiento'] = pd.cut(
-    rendimiento_score, 
-    bins=[0, 0.4, 0.7, 1.0], 
-    labels=[0, 1, 2]  # 0=Bajo, 1=Medio, 2=Alto
-)
-
-print(f"📊 Dataset generado:")
-print(f"   - Total de muestras: {len(df)}")
-print(f"   - Bajo: {(df['Rendimiento'] == 0).sum()}")
-print(f"   - Medio: {(df['Rendimiento'] == 1).sum()}")
-print(f"   - Alto: {(df['Rendimiento'] == 2).sum()}")
-
-# Separar X e y
-X = df.drop('Rendimiento', axis=1)
-y = df['Rendimiento']
-
-print(f"\n📋 Columnas del modelo (en orden):")
-for i, col in enumerate(X.columns, 1):
-    print(f"   {i}. {col}")
-
-# Dividir datos
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.3, random_state=42, stratify=y
-)
-
-print(f"\n🔧 Conjuntos de datos:")
-print(f"   - Entrenamiento: {len(X_train)} muestras")
-print(f"   - Prueba: {len(X_test)} muestras")
-
-# Normalizar (IMPORTANTE: convertir a numpy array)
-scaler = MinMaxScaler()
-X_train_array = X_train.values  # Convertir a numpy
-X_test_array = X_test.values
-
-X_train_scaled = scaler.fit_transform(X_train_array)
-X_test_scaled = scaler.transform(X_test_array)
-
-print(f"\n✅ Normalización completada")
-print(f"   - Features esperadas: {scaler.n_features_in_}")
-
-# Entrenar modelo
-print(f"\n🤖 Entrenando Regresión Logística...")
-modelo = LogisticRegression(
-    max_iter=1000,
-    random_state=42,
-    solver='lbfgs',
-    multi_class='multinomial'
-)
-modelo.fit(X_train_scaled, y_train)
-
-# Evaluar
-accuracy_train = modelo.score(X_train_scaled, y_train)
-accuracy_test = modelo.score(X_test_scaled, y_test)
-
-print(f"\n✅ Modelo entrenado exitosamente")
-print(f"   - Precisión en entrenamiento: {accuracy_train:.2%}")
-print(f"   - Precisión en prueba: {accuracy_test:.2%}")
-
-# Crear carpeta model si no existe
-os.makedirs('model', exist_ok=True)
-
-# IMPORTANTE: Hacer backup del modelo anterior
-if os.path.exists('model/modelo_rl.pkl'):
-    os.rename('model/modelo_rl.pkl', 'model/modelo_rl_old.pkl')
-    print(f"\n📦 Backup creado: modelo_rl_old.pkl")
-
-if os.path.exists('model/scaler.pkl'):
-    os.rename('model/scaler.pkl', 'model/scaler_old.pkl')
-    print(f"📦 Backup creado: scaler_old.pkl")
-
-# Guardar nuevo modelo y scaler
-joblib.dump(modelo, 'model/modelo_rl.pkl')
-joblib.dump(scaler, 'model/scaler.pkl')
-
-modelo_size = os.path.getsize('model/modelo_rl.pkl')
-scaler_size = os.path.getsize('model/scaler.pkl')
-
-print(f"\n💾 Archivos guardados:")
-print(f"   ✅ modelo_rl.pkl ({modelo_size:,} bytes)")
-print(f"   ✅ scaler.pkl ({scaler_size:,} bytes)")
-
-# Verificar que funciona
-print(f"\n🧪 Verificando el modelo...")
-try:
-    test_modelo = joblib.load('model/modelo_rl.pkl')
-    test_scaler = joblib.load('model/scaler.pkl')
-    
-    # Prueba con datos de ejemplo
-    datos_prueba = pd.DataFrame({
-        'Genero': [1],
-        'Apoyo_Familiar': [4],
-        'Ingresos_Familiares': [3],
-        'Horas_Estudio': [15.0],
-        'Actividades_Extra': [5.0],
-        'Nivel_Educativo_Padres': [4],
-        'Acceso_Internet': [1],
-        'Clima_Familiar': [4],
-        'Asistencia': [90.0],
-        'Motivacion': [4]
-    })
-    
-    datos_array = datos_prueba.values
-    datos_norm = test_scaler.transform(datos_array)
-    prediccion = test_modelo.predict(datos_norm)[0]
-    probs = test_modelo.predict_proba(datos_norm)[0]
-    
-    clases = ['Bajo', 'Medio', 'Alto']
-    print(f"   ✅ Predicción de prueba: {clases[prediccion]}")
-    print(f"   ✅ Probabilidades: {probs}")
-    
-except Exception as e:
-    print(f"   ❌ ERROR: {e}")
-
-print("\n" + "=" * 70)
-print("✨ ¡Modelo compatible creado exitosamente!")
-print("=" * 70)
-print("\n📝 Próximos pasos:")
-print("1. Detén el servidor backend (Ctrl+C)")
-print("2. Ejecuta: python app.py")
-print("3. Prueba la predicción en el navegador")
-print("\n💡 El modelo anterior fue respaldado como modelo_rl_old.pkl")
\ No newline at end of file
+import shutil
+
+from utils.features import FEATURE_COLUMNS, N_FEATURES
+from utils.preprocessing import preprocess_input
+from utils.artifact import save_artifact
+from utils.metadata import save_metadata
+from utils.search import DEFAULT_GRID, cross_validate_grid
+from utils.synthetic import generate_matrix, performance_labels
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Entrena el modelo de 10 características')
+    parser.add_argument('--procesos', type=int, default=os.cpu_count(),
+                        help='Procesos para la búsqueda de hiperparámetros (por defecto, uno por CPU)')
+    parser.add_argument('--folds', type=int, default=5, help='Folds de la validación cruzada')
+    parser.add_argument('--sin-busqueda', action='store_true',
+                        help='Entrenar directamente con C=1.0, lbfgs y sin pesos de clase')
+    args = parser.parse_args(argv)
+
+    print("🤖 Entrenando modelo con 10 características...")
+    print("=" * 70)
+
+    # Crear dataset sintético con las 10 variables de tu sistema. Las
+    # distribuciones y la regla de rendimiento viven en utils/synthetic.py, las
+    # mismas que usan los benchmarks, la prueba de carga y el entrenamiento por
+    # bloques; legacy_seed conserva las filas con las que se entrenó el modelo
+    # publicado
+    n_samples = 200
+    matrix = generate_matrix(n_samples, legacy_seed=42)
+
+    # Columnas en el orden del esquema compartido con la API
+    df = pd.DataFrame(matrix, columns=FEATURE_COLUMNS)
+
+    # Lógica: buenos estudiantes = más horas estudio + apoyo + motivación
+    df['Rendimiento'] = performance_labels(matrix)  # 0=Bajo, 1=Medio, 2=Alto
+
+    print(f"📊 Dataset generado:")
+    print(f"   - Total de muestras: {len(df)}")
+    print(f"   - Bajo: {(df['Rendimiento'] == 0).sum()}")
+    print(f"   - Medio: {(df['Rendimiento'] == 1).sum()}")
+    print(f"   - Alto: {(df['Rendimiento'] == 2).sum()}")
+
+    # Separar X e y
+    X = df[FEATURE_COLUMNS]
+    y = df['Rendimiento']
+
+    print(f"\n📋 Columnas del modelo (en orden):")
+    for i, col in enumerate(X.columns, 1):
+        print(f"   {i}. {col}")
+
+    # Dividir datos
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.3, random_state=42, stratify=y
+    )
+
+    print(f"\n🔧 Conjuntos de datos:")
+    print(f"   - Entrenamiento: {len(X_train)} muestras")
+    print(f"   - Prueba: {len(X_test)} muestras")
+
+    # Normalizar (IMPORTANTE: convertir a numpy array)
+    scaler = MinMaxScaler()
+    X_train_array = X_train.values  # Convertir a numpy
+    X_test_array = X_test.values
+
+    X_train_scaled = scaler.fit_transform(X_train_array)
+    X_test_scaled = scaler.transform(X_test_array)
+
+    print(f"\n✅ Normalización completada")
+    print(f"   - Features esperadas: {scaler.n_features_in_}")
+    assert scaler.n_features_in_ == N_FEATURES, 'El scaler no coincide con el esquema de la API'
+
+    # Búsqueda de hiperparámetros: cada candidato se evalúa con k-fold sobre
+    # el conjunto de entrenamiento (cada fold con su propio scaler)
+    y_train_array = y_train.to_numpy(dtype=np.int64)
+    grid = {'C': (1.0,), 'class_weight': (None,), 'solver': ('lbfgs',)} if args.sin_busqueda else DEFAULT_GRID
+    n_candidates = int(np.prod([len(values) for values in grid.values()]))
+    print(f"\n🔎 Búsqueda de hiperparámetros: {n_candidates} candidatos × {args.folds} folds, "
+          f"{min(max(args.procesos or 1, 1), n_candidates * args.folds)} proceso(s)")
+    search_started = time.perf_counter()
+    resultados = cross_validate_grid(X_train_array, y_train_array, grid, n_folds=args.folds, processes=args.procesos)
+    search_seconds = time.perf_counter() - search_started
+    mejor = resultados[0]
+
+    for resultado in resultados[:5]:
+        print(f"   {resultado['precision_media']:.2%} ± {resultado['desviacion']:.2%}  "
+              f"{resultado['tiempo_s'] * 1000:8.1f} ms  {resultado['parametros']}"
+              f"{'' if resultado['convergio'] else '  (no convergió)'}")
+    print(f"   Búsqueda completada en {search_seconds:.2f} s")
+
+    # Entrenar modelo
+    print(f"\n🤖 Entrenando Regresión Logística con {mejor['parametros']}...")
+    modelo = LogisticRegression(max_iter=1000, random_state=42, **mejor['parametros'])
+    modelo.fit(X_train_scaled, y_train_array)
+
+    # Evaluar
+    accuracy_train = modelo.score(X_train_scaled, y_train_array)
+    accuracy_test = modelo.score(X_test_scaled, y_test.to_numpy(dtype=np.int64))
+    accuracy_cv = mejor['precision_media']
+
+    print(f"\n✅ Modelo entrenado exitosamente")
+    print(f"   - Precisión en entrenamiento: {accuracy_train:.2%}")
+    print(f"   - Precisión en prueba: {accuracy_test:.2%}")
+    print(f"   - Validación cruzada ({args.folds} folds): {accuracy_cv:.2%} ± {mejor['desviacion']:.2%}")
+
+    # Crear carpeta model si no existe
+    os.makedirs('model', exist_ok=True)
+
+    # IMPORTANTE: Hacer backup del modelo anterior (copiando, para que el servidor
+    # en ejecución nunca encuentre los archivos ausentes)
+    if os.path.exists('model/modelo_rl.pkl'):
+        shutil.copy2('model/modelo_rl.pkl', 'model/modelo_rl_old.pkl')
+        print(f"\n📦 Backup creado: modelo_rl_old.pkl")
+
+    if os.path.exists('model/scaler.pkl'):
+        shutil.copy2('model/scaler.pkl', 'model/scaler_old.pkl')
+        print(f"📦 Backup creado: scaler_old.pkl")
+
+    # Guardar nuevo modelo y scaler en archivos temporales y reemplazar los
+    # actuales con os.replace (atómico), para que la recarga en caliente del
+    # servidor nunca lea un archivo escrito a medias
+    joblib.dump(modelo, 'model/modelo_rl.pkl.tmp')
+    joblib.dump(scaler, 'model/scaler.pkl.tmp')
+    os.replace('model/scaler.pkl.tmp', 'model/scaler.pkl')
+    os.replace('model/modelo_rl.pkl.tmp', 'model/modelo_rl.pkl')
+
+    # Artefacto binario que la API mapea en memoria (sin sklearn ni pickle)
+    artefacto_size = save_artifact('model/modelo_rl.bin', modelo, scaler)
+
+    # Métricas de esta versión, que la API muestra en /api/model-info. Se
+    # escriben al final con la huella de cada archivo: hasta entonces la API no
+    # carga la versión nueva, aunque vea el scaler o el artefacto ya reemplazados
+    save_metadata(
+        'model/modelo_rl.json',
+        {
+            'precision_entrenamiento': accuracy_train,
+            'precision_prueba': accuracy_test,
+            'validacion_cruzada': accuracy_cv
+        },
+        files=['model/modelo_rl.pkl', 'model/scaler.pkl', 'model/modelo_rl.bin'],
+        modelo='Regresión Logística',
+        muestras={'entrenamiento': len(X_train), 'prueba': len(X_test)},
+        clases=['Bajo', 'Medio', 'Alto'],
+        hiperparametros=mejor['parametros'],
+        busqueda={
+            'folds': args.folds,
+            'tiempo_s': round(search_seconds, 3),
+            'candidatos': [
+                {key: round(value, 4) if isinstance(value, float) else value for key, value in resultado.items()}
+                for resultado in resultados
+            ]
+        }
+    )
+
+    modelo_size = os.path.getsize('model/modelo_rl.pkl')
+    scaler_size = os.path.getsize('model/scaler.pkl')
+
+    print(f"\n💾 Archivos guardados:")
+    print(f"   ✅ modelo_rl.pkl ({modelo_size:,} bytes)")
+    print(f"   ✅ scaler.pkl ({scaler_size:,} bytes)")
+    print(f"   ✅ modelo_rl.bin ({artefacto_size:,} bytes)")
+    print(f"   ✅ modelo_rl.json (métricas y huellas)")
+
+    # Verificar que funciona
+    print(f"\n🧪 Verificando el modelo...")
+    try:
+        test_modelo = joblib.load('model/modelo_rl.pkl')
+        test_scaler = joblib.load('model/scaler.pkl')
+
+        # Prueba con datos de ejemplo, preprocesados igual que en la API
+        datos_array = preprocess_input({
+            'genero': 'F',
+            'apoyo_familiar': 4,
+            'ingresos_familiares': 3,
+            'horas_estudio': 15.0,
+            'actividades_extra': 5.0,
+            'nivel_educativo_padres': 4,
+            'acceso_internet': 1,
+            'clima_familiar': 4,
+            'asistencia': 90.0,
+            'motivacion': 4
+        })
+
+        datos_norm = test_scaler.transform(datos_array)
+        prediccion = test_modelo.predict(datos_norm)[0]
+        probs = test_modelo.predict_proba(datos_norm)[0]
+
+        clases = ['Bajo', 'Medio', 'Alto']
+        print(f"   ✅ Predicción de prueba: {clases[prediccion]}")
+        print(f"   ✅ Probabilidades: {probs}")
+
+    except Exception as e:
+        print(f"   ❌ ERROR: {e}")
+
+    print("\n" + "=" * 70)
+    print("✨ ¡Modelo compatible creado exitosamente!")
+    print("=" * 70)
+    print("\n📝 Próximos pasos:")
+    print("1. Si el servidor vigila backend/model/ (MODEL_WATCH_INTERVAL), cargará el modelo solo")
+    print("   o recárgalo con POST /api/admin/reload (cabecera X-Admin-Token)")
+    print("2. Si no, detén el servidor backend (Ctrl+C) y ejecuta: python app.py")
+    print("3. Prueba la predicción en el navegador")
+    print("\n💡 El modelo anterior fue respaldado como modelo_rl_old.pkl")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Convierte modelo_rl.pkl y scaler.pkl al artefacto binario modelo_rl.bin.
+
+El artefacto contiene los coeficientes, el scaler, los pesos fusionados, las
+clases y los nombres de columnas en un archivo plano que la API mapea en
+memoria sin importar sklearn.
+
+Uso:
+    python export_model.py
+    python export_model.py --modelo model/modelo_rl.pkl --scaler model/scaler.pkl --salida model/modelo_rl.bin
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import joblib
+import numpy as np
+
+from utils.artifact import save_artifact, load_artifact
+from utils.features import N_FEATURES
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, 'model', 'modelo_rl.pkl')
+SCALER_PATH = os.path.join(BASE_DIR, 'model', 'scaler.pkl')
+ARTIFACT_PATH = os.path.join(BASE_DIR, 'model', 'modelo_rl.bin')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Convierte los pickles del modelo al artefacto binario')
+    parser.add_argument('--modelo', default=MODEL_PATH, help='Ruta a modelo_rl.pkl')
+    parser.add_argument('--scaler', default=SCALER_PATH, help='Ruta a scaler.pkl')
+    parser.add_argument('--salida', default=ARTIFACT_PATH, help='Ruta del artefacto a escribir')
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("📦 Convirtiendo el modelo al artefacto binario")
+    print("=" * 60)
+
+    modelo = joblib.load(args.modelo)
+    scaler = joblib.load(args.scaler)
+
+    try:
+        size = save_artifact(args.salida, modelo, scaler)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        return 1
+
+    # Releer el artefacto y comparar con sklearn sobre el rango del scaler
+    fused = load_artifact(args.salida)
+    probe = np.linspace(scaler.data_min_, scaler.data_max_, 11)
+    expected = modelo.predict_proba(scaler.transform(probe))
+    if fused.n_features_in_ != N_FEATURES or not np.allclose(fused.predict_proba(probe), expected, rtol=0.0, atol=1e-9):
+        os.remove(args.salida)
+        print("❌ ERROR: El artefacto no reproduce las predicciones de sklearn")
+        return 1
+
+    print(f"✅ {args.salida} ({size:,} bytes)")
+    print(f"   Clases: {fused.classes_.tolist()}")
+    print(f"   Características: {fused.n_features_in_}")
+    print("=" * 60)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
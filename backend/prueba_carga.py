@@ -0,0 +1,304 @@
+"""
+Generador de carga y reporte de capacidad de la API.
+
+Envía estudiantes sintéticos (con las distribuciones del entrenamiento) a
+/api/predict, o lotes a /api/predict/batch, a tasas objetivo fijas. La carga es
+de lazo abierto: cada petición sale en su instante programado aunque las
+anteriores no hayan respondido, y la latencia se mide desde ese instante, así
+que una API saturada se ve como colas crecientes y no como un cliente que
+espera y baja el ritmo.
+
+Para cada tasa reporta peticiones enviadas y completadas por segundo, p50, p90,
+p99 y máximo de latencia y la tasa de errores. Al final indica el throughput de
+saturación y la primera tasa en que el p99 supera --slo-ms (o los errores
+superan --max-errores).
+
+Se puede apuntar a una API en marcha (--url) o levantar una local con --local,
+que arranca servir.py en un proceso aparte: en el mismo proceso el servidor y el
+generador compartirían el GIL y se mediría al cliente.
+
+Uso:
+    python prueba_carga.py --local --tasas 50,100,200,400 --duracion 10
+    python prueba_carga.py --url http://10.0.0.5:5000 --tasas 100,200,400,800 --slo-ms 100
+    python prueba_carga.py --local --endpoint batch --lote 500 --tasas 5,10,20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.synthetic import generate_students
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Estudiantes distintos que se reparten entre las peticiones
+_POOL_SIZE = 5000
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _wait_ready(url, process=None, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f'El servidor terminó al arrancar (código {process.returncode})')
+        try:
+            with urllib.request.urlopen(f'{url}/api/health', timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'{url} no respondió a /api/health a tiempo')
+
+def start_local_server(workers, threads):
+    """Arranca servir.py en un puerto libre; devuelve (url, proceso)"""
+    port = _free_port()
+    env = dict(os.environ, MODEL_WATCH_INTERVAL='0', LOG_LEVEL=os.environ.get('LOG_LEVEL', 'WARNING'))
+    process = subprocess.Popen(
+        [sys.executable, 'servir.py', '--host', '127.0.0.1', '--puerto', str(port),
+         '--workers', str(workers), '--hilos', str(threads)],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}'
+    try:
+        _wait_ready(url, process)
+    except Exception:
+        process.terminate()
+        raise
+    return url, process
+
+def build_requests(url, endpoint, batch_size, seed):
+    """
+    Peticiones HTTP/1.1 ya codificadas, listas para enviar tal cual
+
+    Returns:
+        tuple: (host, puerto, lista de peticiones en bytes)
+    """
+    parsed = urllib.parse.urlsplit(url)
+    host, port = parsed.hostname, parsed.port or 80
+    base_path = parsed.path.rstrip('/')
+    students = generate_students(_POOL_SIZE, seed=seed)
+
+    if endpoint == 'batch':
+        path = f'{base_path}/api/predict/batch'
+        n_bodies = max(1, len(students) // batch_size)
+        bodies = [
+            json.dumps([students[(i * batch_size + k) % len(students)] for k in range(batch_size)]).encode()
+            for i in range(n_bodies)
+        ]
+    else:
+        path = f'{base_path}/api/predict'
+        bodies = [json.dumps(student).encode() for student in students]
+
+    head = (f'POST {path} HTTP/1.1\r\nHost: {parsed.netloc}\r\nContent-Type: application/json\r\n'
+            f'Connection: close\r\nContent-Length: ').encode()
+    return host, port, [head + str(len(body)).encode() + b'\r\n\r\n' + body for body in bodies]
+
+async def _send_request(host, port, payload, timeout):
+    """Envía una petición y devuelve el código HTTP"""
+    async def exchange():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(payload)
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+        finally:
+            writer.close()
+        return int(status_line.split()[1]) if status_line else 0
+
+    return await asyncio.wait_for(exchange(), timeout)
+
+async def run_rate(host, port, payloads, rate, duration, poisson, max_pending, timeout):
+    """
+    Mantiene una tasa objetivo de peticiones por segundo durante `duration` segundos
+
+    Returns:
+        dict: Resultado de la tasa
+    """
+    loop = asyncio.get_running_loop()
+    latencies = []
+    status_errors = 0
+    connection_errors = 0
+    dropped = 0
+    client_lag = []
+    pending = set()
+
+    async def one(payload, scheduled):
+        nonlocal status_errors, connection_errors
+        try:
+            status = await _send_request(host, port, payload, timeout)
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            connection_errors += 1
+            return
+        if status == 200:
+            # Desde el instante programado: incluye la espera si el cliente se atrasó
+            latencies.append(loop.time() - scheduled)
+        else:
+            status_errors += 1
+
+    rng = random.Random(rate)
+    started = loop.time()
+    scheduled = started
+    sent = 0
+    while True:
+        scheduled += rng.expovariate(rate) if poisson else 1.0 / rate
+        if scheduled - started >= duration:
+            break
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        client_lag.append(max(0.0, loop.time() - scheduled))
+        if len(pending) >= max_pending:
+            dropped += 1
+            continue
+        task = asyncio.create_task(one(payloads[sent % len(payloads)], scheduled))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        sent += 1
+
+    send_window = loop.time() - started
+    if pending:
+        await asyncio.wait(set(pending))
+    elapsed = loop.time() - started
+
+    latencies.sort()
+    client_lag.sort()
+    attempted = sent + dropped
+    failed = status_errors + connection_errors + dropped
+
+    def percentile(values, q):
+        if not values:
+            return float('nan')
+        return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+    return {
+        'tasa_objetivo': rate,
+        'enviadas_por_segundo': sent / send_window if send_window else 0.0,
+        'completadas_por_segundo': len(latencies) / elapsed if elapsed else 0.0,
+        'peticiones': attempted,
+        'exitosas': len(latencies),
+        'p50_ms': percentile(latencies, 0.50),
+        'p90_ms': percentile(latencies, 0.90),
+        'p99_ms': percentile(latencies, 0.99),
+        'max_ms': latencies[-1] * 1000 if latencies else float('nan'),
+        'errores_http': status_errors,
+        'errores_conexion': connection_errors,
+        'descartadas_cliente': dropped,
+        'tasa_errores': failed / attempted if attempted else 0.0,
+        'retraso_cliente_p99_ms': percentile(client_lag, 0.99)
+    }
+
+def capacity_report(rows, slo_ms, max_error_rate):
+    """
+    Resume las tasas medidas
+
+    Returns:
+        dict: throughput de saturación, tasa máxima dentro del SLO y primera tasa que lo rompe
+    """
+    def within_slo(row):
+        return row['p99_ms'] <= slo_ms and row['tasa_errores'] <= max_error_rate
+
+    breaking = next((row['tasa_objetivo'] for row in rows if not within_slo(row)), None)
+    sustained = [row['tasa_objetivo'] for row in rows
+                 if within_slo(row) and (breaking is None or row['tasa_objetivo'] < breaking)]
+    return {
+        'throughput_saturacion': max((row['completadas_por_segundo'] for row in rows), default=0.0),
+        'tasa_maxima_en_slo': max(sustained, default=None),
+        'tasa_que_rompe_slo': breaking,
+        'slo_p99_ms': slo_ms,
+        'max_tasa_errores': max_error_rate
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prueba de carga de lazo abierto y reporte de capacidad')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--url', help='API en marcha, por ejemplo http://localhost:5000')
+    target.add_argument('--local', action='store_true', help='Arrancar servir.py en un puerto libre')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Workers del servidor local')
+    parser.add_argument('--hilos', type=int, default=8, help='Hilos por worker del servidor local')
+    parser.add_argument('--tasas', default='25,50,100,200,400',
+                        help='Peticiones por segundo objetivo, separadas por comas y en orden creciente')
+    parser.add_argument('--duracion', type=float, default=10.0, help='Segundos por tasa')
+    parser.add_argument('--endpoint', choices=('predict', 'batch'), default='predict', help='Endpoint a cargar')
+    parser.add_argument('--lote', type=int, default=100, help='Estudiantes por petición con --endpoint batch')
+    parser.add_argument('--poisson', action='store_true',
+                        help='Llegadas de Poisson en lugar de intervalos constantes')
+    parser.add_argument('--slo-ms', type=float, default=250.0, help='p99 máximo aceptable')
+    parser.add_argument('--max-errores', type=float, default=0.01, help='Fracción de errores aceptable')
+    parser.add_argument('--max-pendientes', type=int, default=2000,
+                        help='Peticiones en vuelo antes de descartar (límite de sockets del cliente)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Segundos máximos por petición')
+    parser.add_argument('--semilla', type=int, default=42, help='Semilla de los estudiantes sintéticos')
+    parser.add_argument('--json', action='store_true', help='Imprimir el resultado como JSON')
+    args = parser.parse_args(argv)
+
+    rates = [float(rate) for rate in args.tasas.split(',') if rate.strip()]
+    if not rates or min(rates) <= 0:
+        parser.error('--tasas debe contener valores mayores que 0')
+    if args.lote < 1:
+        parser.error('--lote debe ser al menos 1')
+
+    process = None
+    if args.local:
+        url, process = start_local_server(args.workers, args.hilos)
+    else:
+        url = args.url.rstrip('/')
+        _wait_ready(url, timeout=10.0)
+
+    try:
+        host, port, payloads = build_requests(url, args.endpoint, args.lote, args.semilla)
+        if not args.json:
+            print("=" * 96)
+            print(f"📈 Prueba de carga: {url} /api/{'predict/batch' if args.endpoint == 'batch' else 'predict'}, "
+                  f"{args.duracion:.0f} s por tasa, {'Poisson' if args.poisson else 'intervalos constantes'}")
+            print("=" * 96)
+            print(f"{'objetivo':>9} {'enviadas/s':>11} {'ok/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} "
+                  f"{'max ms':>9} {'errores':>8} {'retraso cliente':>16}")
+
+        rows = []
+        for rate in rates:
+            row = asyncio.run(run_rate(host, port, payloads, rate, args.duracion, args.poisson,
+                                       args.max_pendientes, args.timeout))
+            rows.append(row)
+            if not args.json:
+                print(f"{row['tasa_objetivo']:>9.0f} {row['enviadas_por_segundo']:>11.1f} "
+                      f"{row['completadas_por_segundo']:>9.1f} {row['p50_ms']:>9.1f} {row['p90_ms']:>9.1f} "
+                      f"{row['p99_ms']:>9.1f} {row['max_ms']:>9.1f} {row['tasa_errores']:>8.1%} "
+                      f"{row['retraso_cliente_p99_ms']:>13.1f} ms", flush=True)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=60)
+
+    report = capacity_report(rows, args.slo_ms, args.max_errores)
+
+    if args.json:
+        print(json.dumps({'url': url, 'endpoint': args.endpoint, 'tasas': rows, 'capacidad': report}, indent=2))
+        return 0
+
+    print("=" * 96)
+    print(f"   Throughput de saturación:   {report['throughput_saturacion']:.1f} peticiones/s")
+    sustained = report['tasa_maxima_en_slo']
+    print(f"   Tasa máxima dentro del SLO: {f'{sustained:.0f} peticiones/s' if sustained else 'ninguna'} "
+          f"(p99 ≤ {args.slo_ms:.0f} ms, errores ≤ {args.max_errores:.0%})")
+    breaking = report['tasa_que_rompe_slo']
+    print(f"   Primera tasa fuera del SLO: {f'{breaking:.0f} peticiones/s' if breaking else 'ninguna de las medidas'}")
+    if any(row['retraso_cliente_p99_ms'] > 10 for row in rows):
+        print("⚠️  El generador se atrasó más de 10 ms en alguna tasa: sus resultados subestiman la carga")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Puntuación masiva de cohortes desde archivos CSV o Parquet.
+
+Lee el archivo por bloques de tamaño fijo y pasa cada bloque por la misma
+cadena que la API (validación con el esquema, predicción vectorizada, factores
+clave y recomendaciones). Los resultados se escriben bloque a bloque, así que
+la memoria no depende del tamaño del archivo.
+
+Uso:
+    python puntuar_cohorte.py matriculados.csv predicciones.csv
+    python puntuar_cohorte.py matriculados.parquet predicciones.parquet --procesos 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from utils.features import FEATURE_COLUMNS, REQUIRED_FIELDS, CLASS_NAMES
+from utils.inference import load_inference_pair
+from utils.predictor import predict_batch
+from utils.validation import validate_records
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, 'model', 'modelo_rl.pkl')
+SCALER_PATH = os.path.join(BASE_DIR, 'model', 'scaler.pkl')
+ARTIFACT_PATH = os.path.join(BASE_DIR, 'model', 'modelo_rl.bin')
+
+# Las columnas pueden venir con el nombre del formulario o el del modelo
+_COLUMN_ALIASES = dict(zip(FEATURE_COLUMNS, REQUIRED_FIELDS))
+
+# Par (modelo, scaler) de cada proceso
+_pair = None
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in ('.parquet', '.pq')
+
+def read_chunks(path, chunk_size):
+    """
+    Lee un archivo CSV o Parquet por bloques
+
+    Args:
+        path (str): Ruta del archivo de entrada
+        chunk_size (int): Filas por bloque
+
+    Yields:
+        pd.DataFrame: Bloque con las columnas renombradas a los campos del formulario
+    """
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        batches = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size))
+    else:
+        batches = pd.read_csv(path, chunksize=chunk_size)
+
+    for chunk in batches:
+        yield chunk.rename(columns=_COLUMN_ALIASES)
+
+def _init_worker(model_path, scaler_path, use_sklearn, artifact_path=None):
+    """Carga los artefactos una vez por proceso (el .bin se comparte entre procesos)"""
+    global _pair
+    _pair = load_inference_pair(model_path, scaler_path, use_sklearn=use_sklearn, artifact_path=artifact_path)
+
+def score_chunk(chunk, start, id_columns, contributions=False):
+    """
+    Valida y puntúa un bloque
+
+    Args:
+        chunk (pd.DataFrame): Bloque de estudiantes
+        start (int): Número de fila del primer registro del bloque
+        id_columns (list): Columnas que se copian tal cual a la salida
+        contributions (bool): Agregar la columna factores_modelo (características
+            que más empujan hacia la clase predicha, según el modelo)
+
+    Returns:
+        pd.DataFrame: Una fila de resultado por registro de entrada
+    """
+    n_rows = len(chunk)
+    records = chunk[REQUIRED_FIELDS].to_dict('records')
+    matrix, valid_indices, errors = validate_records(records)
+    predictions = predict_batch(*_pair, matrix, contributions=contributions)
+
+    output = {'fila': np.arange(start, start + n_rows)}
+    for column in id_columns:
+        output[column] = chunk[column].to_numpy()
+
+    prediction_column = np.full(n_rows, None, dtype=object)
+    probabilities = np.full((n_rows, len(CLASS_NAMES)), np.nan)
+    confidence = np.full(n_rows, np.nan)
+    factors = np.full(n_rows, None, dtype=object)
+    recommendations = np.full(n_rows, None, dtype=object)
+    model_factors = np.full(n_rows, None, dtype=object)
+    error_column = np.full(n_rows, None, dtype=object)
+
+    for index, result in zip(valid_indices, predictions):
+        prediction_column[index] = result['prediccion']
+        probabilities[index] = [result['probabilidades'][name] for name in CLASS_NAMES]
+        confidence[index] = result['confianza']
+        factors[index] = ' | '.join(result['factores_clave'])
+        recommendations[index] = ' | '.join(result['recomendaciones'])
+        if contributions:
+            model_factors[index] = ' | '.join(
+                f"{factor['nombre']} (+{factor['impacto']:.3f})" for factor in result['factores_modelo']
+            )
+
+    for index, row_errors in errors.items():
+        error_column[index] = '; '.join(error['mensaje'] for error in row_errors)
+
+    output['prediccion'] = prediction_column
+    for j, name in enumerate(CLASS_NAMES):
+        output[f'prob_{name.lower()}'] = probabilities[:, j]
+    output['confianza'] = confidence
+    output['factores_clave'] = factors
+    output['recomendaciones'] = recommendations
+    if contributions:
+        output['factores_modelo'] = model_factors
+    output['error'] = error_column
+
+    return pd.DataFrame(output)
+
+def _numbered(chunks):
+    """Agrega a cada bloque el número de su primera fila"""
+    start = 0
+    for chunk in chunks:
+        yield chunk, start
+        start += len(chunk)
+
+def score_stream(chunks, id_columns, processes, init_args, contributions=False):
+    """
+    Puntúa bloques en orden, en este proceso o repartidos en un pool
+
+    Con procesos > 1 solo hay como máximo 2 bloques por proceso en vuelo, de
+    modo que la memoria sigue acotada aunque la lectura sea más rápida.
+
+    Yields:
+        pd.DataFrame: Resultados de cada bloque, en el orden de entrada
+    """
+    if processes <= 1:
+        _init_worker(*init_args)
+        for chunk, start in _numbered(chunks):
+            yield score_chunk(chunk, start, id_columns, contributions)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=init_args) as pool:
+        pending = deque()
+        for chunk, start in _numbered(chunks):
+            pending.append(pool.submit(score_chunk, chunk, start, id_columns, contributions))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+class ResultWriter:
+    """Escribe los bloques de resultados en CSV o Parquet a medida que llegan"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = _is_parquet(path)
+        self._writer = None
+        self._started = False
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            frame.to_csv(self.path, mode='a' if self._started else 'w',
+                         header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Puntúa una cohorte completa desde un archivo CSV o Parquet')
+    parser.add_argument('entrada', help='Archivo CSV o Parquet con un estudiante por fila')
+    parser.add_argument('salida', help='Archivo CSV o Parquet donde escribir las predicciones')
+    parser.add_argument('--tamano-bloque', type=int, default=50000, help='Filas por bloque (por defecto 50000)')
+    parser.add_argument('--procesos', type=int, default=1, help='Procesos para puntuar bloques en paralelo')
+    parser.add_argument('--columna-id', action='append', default=[],
+                        help='Columna a copiar en la salida (se puede repetir)')
+    parser.add_argument('--sklearn', action='store_true', help='Usar sklearn en lugar del modelo fusionado')
+    parser.add_argument('--modelo', default=MODEL_PATH, help='Ruta a modelo_rl.pkl')
+    parser.add_argument('--scaler', default=SCALER_PATH, help='Ruta a scaler.pkl')
+    parser.add_argument('--artefacto', default=ARTIFACT_PATH,
+                        help='Ruta a modelo_rl.bin; si existe se usa en lugar de los pickles')
+    parser.add_argument('--contribuciones', action='store_true',
+                        help='Agregar la columna factores_modelo con el aporte de cada característica')
+    args = parser.parse_args(argv)
+
+    if args.tamano_bloque <= 0:
+        parser.error('--tamano-bloque debe ser mayor que 0')
+
+    chunks = read_chunks(args.entrada, args.tamano_bloque)
+    first = next(chunks, None)
+    if first is None:
+        print("❌ ERROR: El archivo de entrada está vacío")
+        return 1
+
+    missing = [column for column in REQUIRED_FIELDS + args.columna_id if column not in first.columns]
+    if missing:
+        print(f"❌ ERROR: Faltan columnas en el archivo de entrada: {', '.join(missing)}")
+        return 1
+
+    def all_chunks():
+        yield first
+        yield from chunks
+
+    print("=" * 60)
+    print(f"📂 Entrada: {args.entrada}")
+    print(f"💾 Salida: {args.salida}")
+    print(f"⚙️  Bloques de {args.tamano_bloque:,} filas, {max(args.procesos, 1)} proceso(s)")
+    print("=" * 60)
+
+    init_args = (args.modelo, args.scaler, args.sklearn, args.artefacto)
+    writer = ResultWriter(args.salida)
+    total = valid = 0
+    started = time.perf_counter()
+    try:
+        for frame in score_stream(all_chunks(), args.columna_id, args.procesos, init_args, args.contribuciones):
+            writer.write(frame)
+            total += len(frame)
+            valid += int(frame['error'].isna().sum())
+            print(f"   {total:,} filas procesadas")
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - started
+
+    print("=" * 60)
+    print(f"✅ {total:,} filas en {elapsed:.2f} s ({total / elapsed if elapsed else 0:,.0f} filas/s)")
+    print(f"   Válidas: {valid:,}  |  Con errores: {total - valid:,}")
+    print("=" * 60)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
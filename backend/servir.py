@@ -0,0 +1,322 @@
+"""
+Servidor de producción con procesos prefork.
+
+El proceso maestro importa la API, carga el modelo (y termina con error si no
+puede) y abre el socket; después crea los workers con fork, de modo que todos
+heredan el modelo ya cargado y comparten sus páginas por copy-on-write (o por
+el mapa de memoria del artefacto binario). Cada worker atiende el socket con un
+pool fijo de hilos.
+
+Señales del maestro:
+    SIGTERM / SIGINT  Apagado ordenado: los workers dejan de aceptar conexiones,
+                      terminan las peticiones en curso y salen
+    SIGHUP            Recarga el modelo en el maestro y recicla los workers
+
+Los workers se reciclan solos tras --max-peticiones (con un margen aleatorio
+para que no se reinicien todos a la vez) y el maestro repone cualquier worker
+que termine.
+
+Uso:
+    python servir.py --workers 4 --hilos 8 --puerto 5000
+"""
+
+import argparse
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from utils.logs import get_logger, fields, shutdown_logging
+
+log = get_logger('servidor')
+
+class _RequestHandler(WSGIRequestHandler):
+    # Una petición por conexión: una conexión keep-alive inactiva no debe
+    # ocupar un hilo del pool
+    protocol_version = 'HTTP/1.0'
+    access_log = False
+
+    def log_request(self, *args, **kwargs):
+        if self.access_log:
+            super().log_request(*args, **kwargs)
+
+class PooledWSGIServer(BaseWSGIServer):
+    """Servidor WSGI que atiende las conexiones con un pool fijo de hilos"""
+
+    multithread = True
+    multiprocess = True
+    # Segundos que se espera un hilo libre antes de volver a serve_forever
+    ACCEPT_WAIT = 0.5
+
+    def __init__(self, host, port, app, threads, fd=None):
+        super().__init__(host, port, app, handler=_RequestHandler, fd=fd)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='http')
+        # Solo se acepta una conexión si hay un hilo libre para atenderla; el
+        # resto espera en la cola del socket, donde otro worker puede tomarla
+        self._slots = threading.BoundedSemaphore(threads)
+
+    def get_request(self):
+        # Con todos los hilos ocupados se vuelve a serve_forever (que así ve un
+        # shutdown pendiente) sin aceptar nada
+        if not self._slots.acquire(timeout=self.ACCEPT_WAIT):
+            raise BlockingIOError('Sin hilos libres')
+        # El socket de escucha es no bloqueante y compartido entre workers: el
+        # que pierde la carrera por accept() recibe BlockingIOError y sigue
+        try:
+            request, client_address = self.socket.accept()
+        except BaseException:
+            self._slots.release()
+            raise
+        request.setblocking(True)
+        return request, client_address
+
+    def process_request(self, request, client_address):
+        try:
+            self._pool.submit(self._process_in_thread, request, client_address)
+        except RuntimeError:
+            # El pool ya se cerró (apagado en curso)
+            self._slots.release()
+            self.shutdown_request(request)
+
+    def _process_in_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def drain(self):
+        """Espera a que terminen las peticiones en curso"""
+        self._pool.shutdown(wait=True)
+
+class _RequestCounter:
+    """Middleware WSGI que pide el reciclaje del worker tras N peticiones"""
+
+    def __init__(self, app, limit, on_limit):
+        self.app = app
+        self.limit = limit
+        self.on_limit = on_limit
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            self.count += 1
+            reached = self.limit and self.count == self.limit
+        if reached:
+            self.on_limit()
+        return self.app(environ, start_response)
+
+def _stop_server(server):
+    # shutdown() bloquea hasta que serve_forever termina: se llama desde otro hilo
+    threading.Thread(target=server.shutdown, daemon=True).start()
+
+def run_worker(listener, wsgi_app, args):
+    """Cuerpo de un worker: atiende el socket heredado hasta que se le pide parar"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    server = None
+    stopping = threading.Event()
+
+    def stop(*_):
+        if not stopping.is_set():
+            stopping.set()
+            _stop_server(server)
+
+    limit = 0
+    if args.max_peticiones > 0:
+        limit = args.max_peticiones + random.randint(0, args.max_peticiones_margen)
+
+    server = PooledWSGIServer(
+        args.host, args.puerto,
+        _RequestCounter(wsgi_app, limit, stop),
+        threads=args.hilos, fd=listener.fileno()
+    )
+    signal.signal(signal.SIGTERM, stop)
+
+    server.serve_forever(poll_interval=0.5)
+    server.drain()
+    server.server_close()
+
+def _bind(host, port, backlog):
+    listener = socket.create_server((host, port), backlog=backlog, reuse_port=False)
+    listener.set_inheritable(True)
+    listener.setblocking(False)
+    return listener
+
+class Master:
+    """Proceso maestro: crea, vigila, recicla y apaga los workers"""
+
+    def __init__(self, listener, wsgi_app, registry, args):
+        self.listener = listener
+        self.wsgi_app = wsgi_app
+        self.registry = registry
+        self.args = args
+        self.workers = {}
+        # Workers que terminan sus peticiones tras un reciclaje; ya no cuentan
+        # para el número de workers activos
+        self.retiring = {}
+        self.served_bundle = registry.current
+        self.stopping = False
+        self.reload_requested = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(self.listener, self.wsgi_app, self.args)
+            except BaseException as e:
+                log.error(f"❌ Worker terminó con error: {e}", extra=fields(pid=os.getpid()))
+                code = 1
+            finally:
+                # os._exit no ejecuta atexit: vaciar la cola de logs antes de salir
+                shutdown_logging()
+                sys.stdout.flush()
+                os._exit(code)
+        self.workers[pid] = time.monotonic()
+
+    def signal_workers(self, signum):
+        for pid in list(self.workers) + list(self.retiring):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def reap(self):
+        while self.workers or self.retiring:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                self.retiring.clear()
+                return
+            if pid == 0:
+                return
+            self.retiring.pop(pid, None)
+            if self.workers.pop(pid, None) is not None and not self.stopping and status != 0:
+                log.warning("⚠️  Worker terminó inesperadamente; se crea otro", extra=fields(pid=pid, estado=status))
+
+    def recycle(self):
+        """Pide a los workers actuales que terminen; se reponen en el bucle principal"""
+        log.info("🔄 Reciclando workers",
+                 extra=fields(workers=len(self.workers), version_modelo=self.registry.current.version))
+        self.served_bundle = self.registry.current
+        self.retiring.update(self.workers)
+        self.workers.clear()
+        for pid in self.retiring:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        def request_stop(*_):
+            self.stopping = True
+
+        def request_reload(*_):
+            self.reload_requested = True
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGHUP, request_reload)
+
+        while not self.stopping:
+            while len(self.workers) < self.args.workers and not self.stopping:
+                self.spawn()
+
+            if self.reload_requested:
+                self.reload_requested = False
+                self.registry.reload_async()
+
+            # El vigilante de archivos o SIGHUP cambiaron el bundle del maestro
+            if self.registry.current is not self.served_bundle:
+                self.recycle()
+
+            time.sleep(0.2)
+            self.reap()
+
+        self.shutdown()
+
+    def shutdown(self):
+        log.info("🛑 Apagando workers", extra=fields(workers=len(self.workers) + len(self.retiring)))
+        self.signal_workers(signal.SIGTERM)
+        deadline = time.monotonic() + self.args.tiempo_gracia
+        while (self.workers or self.retiring) and time.monotonic() < deadline:
+            time.sleep(0.1)
+            self.reap()
+        if self.workers or self.retiring:
+            log.warning("⚠️  Workers que no terminaron a tiempo; se fuerzan",
+                        extra=fields(workers=len(self.workers) + len(self.retiring)))
+            self.signal_workers(signal.SIGKILL)
+            while self.workers or self.retiring:
+                self.reap()
+                time.sleep(0.05)
+        self.listener.close()
+        log.info("✅ Servidor detenido")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor de producción de la API de predicción')
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'), help='Dirección de escucha')
+    parser.add_argument('--puerto', type=int, default=int(os.environ.get('PORT', 5000)), help='Puerto de escucha')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_WORKERS', os.cpu_count() or 1)),
+                        help='Procesos worker (por defecto uno por CPU)')
+    parser.add_argument('--hilos', type=int, default=int(os.environ.get('WEB_THREADS', 8)),
+                        help='Hilos por worker (por defecto 8)')
+    parser.add_argument('--max-peticiones', type=int, default=int(os.environ.get('WEB_MAX_REQUESTS', 0)),
+                        help='Reciclar cada worker tras N peticiones (0 = nunca)')
+    parser.add_argument('--max-peticiones-margen', type=int, default=int(os.environ.get('WEB_MAX_REQUESTS_JITTER', 0)),
+                        help='Peticiones extra aleatorias antes de reciclar, para escalonar los reinicios')
+    parser.add_argument('--tiempo-gracia', type=float, default=float(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30)),
+                        help='Segundos para terminar las peticiones en curso al apagar')
+    parser.add_argument('--backlog', type=int, default=2048, help='Conexiones pendientes en el socket')
+    parser.add_argument('--registro-accesos', action='store_true', help='Registrar cada petición HTTP')
+    args = parser.parse_args(argv)
+
+    if args.workers < 1 or args.hilos < 1:
+        parser.error('--workers y --hilos deben ser al menos 1')
+
+    _RequestHandler.access_log = args.registro_accesos
+
+    import app as api
+
+    # Cargar el modelo antes de crear los workers; sin modelo no se arranca
+    if not api.load_model():
+        return 1
+
+    listener = _bind(args.host, args.puerto, args.backlog)
+
+    log.info("🚀 Servidor de producción", extra=fields(
+        url=f'http://{args.host}:{args.puerto}', workers=args.workers, hilos=args.hilos, pid_maestro=os.getpid()
+    ))
+
+    if not hasattr(os, 'fork'):
+        # Sin fork (Windows) se atiende en este proceso con el pool de hilos
+        log.warning("⚠️  Esta plataforma no admite fork; se usa un solo proceso")
+        server = PooledWSGIServer(args.host, args.puerto, api.app, threads=args.hilos, fd=listener.fileno())
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.drain()
+            server.server_close()
+        return 0
+
+    api.SERVING_MASTER_PID = os.getpid()
+    Master(listener, api.app, api.registry, args).run()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
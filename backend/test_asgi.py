@@ -0,0 +1,83 @@
+"""
+Pruebas de la variante ASGI (app_async.py) frente a las rutas de Flask.
+
+Cada petición se envía a app_async.app con un scope, receive y send sintéticos,
+sin servidor ASGI.
+
+Uso:
+    python -m pytest -q test_asgi.py
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import app as api
+import app_async
+
+ESTUDIANTE = {
+    'genero': 'F',
+    'apoyo_familiar': 4,
+    'ingresos_familiares': 3,
+    'horas_estudio': 20.5,
+    'actividades_extra': 5,
+    'nivel_educativo_padres': 4,
+    'acceso_internet': 1,
+    'clima_familiar': 4,
+    'asistencia': 90,
+    'motivacion': 5
+}
+
+def _asgi(method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': b'',
+        'headers': [(b'content-type', b'application/json')],
+        'client': ('127.0.0.1', 50000),
+    }
+    try:
+        asyncio.run(app_async.app(scope, receive, send))
+    finally:
+        # El pool se crea dentro de cada event loop
+        app_async.executor.shutdown()
+    start, response = sent
+    return start['status'], response['body']
+
+def _flask(method, path, payload=None):
+    client = api.app.test_client()
+    response = client.open(path, method=method, json=payload)
+    return response.status_code, response.get_data()
+
+@pytest.mark.parametrize('method, path, payload', [
+    ('POST', '/api/predict', ESTUDIANTE),
+    ('POST', '/api/predict', dict(ESTUDIANTE, asistencia=150)),
+    ('POST', '/api/predict/batch', {'estudiantes': [ESTUDIANTE, dict(ESTUDIANTE, genero='X')]}),
+    ('POST', '/api/predict/batch', {'estudiantes': []}),
+    ('GET', '/api/no-existe', None),
+], ids=['prediccion', 'registro-invalido', 'lote', 'lote-vacio', 'ruta-inexistente'])
+def test_mismo_estado_y_cuerpo_que_flask(method, path, payload):
+    status, body = _asgi(method, path, payload)
+    expected_status, expected_body = _flask(method, path, payload)
+    assert status == expected_status
+    assert body == expected_body
+
+def test_codigos_esperados():
+    assert _asgi('POST', '/api/predict', dict(ESTUDIANTE, asistencia=150))[0] == 400
+    assert _asgi('GET', '/api/no-existe')[0] == 404
+    status, body = _asgi('POST', '/api/predict/batch', [ESTUDIANTE, 'no es un objeto'])
+    body = json.loads(body)
+    assert status == 200
+    assert (body['exitosos'], body['fallidos']) == (1, 1)
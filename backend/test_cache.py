@@ -0,0 +1,86 @@
+"""
+Pruebas de la caché de predicciones (utils/cache.py).
+
+Uso:
+    python -m pytest -q test_cache.py
+"""
+
+import numpy as np
+import pytest
+
+from utils.cache import PredictionCache, parse_rounding
+from utils.features import FEATURE_INDEX, N_FEATURES
+
+def _row(horas=10.0):
+    row = np.full((1, N_FEATURES), 3.0)
+    row[0, FEATURE_INDEX['Horas_Estudio']] = horas
+    return row
+
+def test_fallo_y_acierto():
+    cache = PredictionCache(max_size=10)
+    owner = object()
+    key = cache.make_keys(_row())[0]
+    assert cache.get(key, owner) is None
+    cache.put(key, {'prediccion': 'Medio'}, owner)
+    assert cache.get(key, owner) == {'prediccion': 'Medio'}
+
+    stats = cache.stats()
+    assert (stats['aciertos'], stats['fallos'], stats['entradas']) == (1, 1, 1)
+    assert stats['tasa_aciertos'] == 0.5
+
+def test_desaloja_la_entrada_menos_usada():
+    cache = PredictionCache(max_size=2)
+    owner = object()
+    a, b, c = (cache.make_keys(_row(horas))[0] for horas in (1.0, 2.0, 3.0))
+    cache.put(a, 'a', owner)
+    cache.put(b, 'b', owner)
+    assert cache.get(a, owner) == 'a'  # a pasa a ser la más reciente
+    cache.put(c, 'c', owner)
+
+    assert cache.get(b, owner) is None
+    assert cache.get(a, owner) == 'a'
+    assert cache.get(c, owner) == 'c'
+    assert cache.stats()['desalojos'] == 1
+
+def test_otro_modelo_vacia_la_cache():
+    cache = PredictionCache(max_size=10)
+    old, new = object(), object()
+    key = cache.make_keys(_row())[0]
+    cache.put(key, 'viejo', old)
+
+    assert cache.get(key, new) is None
+    assert cache.stats()['invalidaciones'] == 1
+    assert cache.get(key, old) is None
+
+def test_invalidate():
+    cache = PredictionCache(max_size=10)
+    owner = object()
+    key = cache.make_keys(_row())[0]
+    cache.put(key, 'x', owner)
+    cache.invalidate()
+    assert cache.get(key, owner) is None
+
+def test_redondeo_une_filas_cercanas():
+    cache = PredictionCache(max_size=10, rounding=parse_rounding('Horas_Estudio:0'))
+    first = cache.normalize(_row(10.2))
+    second = cache.normalize(_row(9.8))
+    assert first[0, FEATURE_INDEX['Horas_Estudio']] == 10.0
+    assert cache.make_keys(first) == cache.make_keys(second)
+
+def test_parse_rounding():
+    assert parse_rounding('Horas_Estudio:1, Asistencia:0') == {'Horas_Estudio': 1, 'Asistencia': 0}
+    assert parse_rounding('') == {}
+    assert parse_rounding(None) == {}
+
+def test_columna_no_redondeable():
+    with pytest.raises(ValueError):
+        PredictionCache(rounding={'Genero': 0})
+
+def test_cache_desactivada():
+    cache = PredictionCache(max_size=0)
+    owner = object()
+    key = cache.make_keys(_row())[0]
+    cache.put(key, 'x', owner)
+    assert not cache.enabled
+    assert cache.get(key, owner) is None
+    assert cache.stats()['entradas'] == 0
@@ -0,0 +1,85 @@
+"""
+Pruebas del desglose de la predicción por característica (utils/predictor.py).
+
+Uso:
+    python -m pytest -q test_contribuciones.py
+"""
+
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from utils.artifact import load_artifact
+from utils.features import CLASS_NAMES, FEATURE_SCHEMA
+from utils.inference import FusedLogisticModel
+from utils.predictor import feature_contributions, predict_batch
+from utils.synthetic import generate_matrix
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model')
+
+FIELDS = [spec['campo'] for spec in FEATURE_SCHEMA]
+
+@pytest.fixture(scope='module')
+def sklearn_pair():
+    model = joblib.load(os.path.join(MODEL_DIR, 'modelo_rl.pkl'))
+    scaler = joblib.load(os.path.join(MODEL_DIR, 'scaler.pkl'))
+    return model, scaler
+
+@pytest.fixture(scope='module')
+def rows():
+    return generate_matrix(500, seed=3)
+
+def _pairs(sklearn_pair):
+    model, scaler = sklearn_pair
+    return {
+        'sklearn': (model, scaler),
+        'fusionado': (FusedLogisticModel.from_sklearn(model, scaler), None),
+        'artefacto': (load_artifact(os.path.join(MODEL_DIR, 'modelo_rl.bin')), None),
+    }
+
+@pytest.mark.parametrize('source', ['sklearn', 'fusionado', 'artefacto'])
+def test_aportes_mas_intercepto_son_los_logits(sklearn_pair, rows, source):
+    model, scaler = _pairs(sklearn_pair)[source]
+    sk_model, sk_scaler = sklearn_pair
+    values, intercept = feature_contributions(model, scaler, rows)
+
+    assert values.shape == (len(rows), len(FIELDS), len(CLASS_NAMES))
+    expected = sk_model.decision_function(sk_scaler.transform(rows))
+    np.testing.assert_allclose(values.sum(axis=1) + intercept, expected, rtol=0, atol=1e-10)
+
+@pytest.mark.parametrize('source', ['sklearn', 'fusionado', 'artefacto'])
+def test_mismas_probabilidades_con_y_sin_desglose(sklearn_pair, rows, source):
+    model, scaler = _pairs(sklearn_pair)[source]
+    plain = predict_batch(model, scaler, rows)
+    explained = predict_batch(model, scaler, rows, contributions=True)
+    for a, b in zip(plain, explained):
+        assert a['prediccion'] == b['prediccion']
+        for name in CLASS_NAMES:
+            assert b['probabilidades'][name] == pytest.approx(a['probabilidades'][name], abs=1e-12)
+
+def test_factores_modelo_solo_impactos_positivos_hacia_la_prediccion(sklearn_pair, rows):
+    model, scaler = _pairs(sklearn_pair)['fusionado']
+    for result in predict_batch(model, scaler, rows, contributions=True):
+        predicted = CLASS_NAMES.index(result['prediccion'])
+        runner_up = max(
+            (k for k in range(len(CLASS_NAMES)) if k != predicted),
+            key=lambda k: result['probabilidades'][CLASS_NAMES[k]]
+        )
+        breakdown = result['contribuciones']
+        impacts = {field: breakdown[field][predicted] - breakdown[field][runner_up] for field in FIELDS}
+
+        ranking = result['factores_modelo']
+        assert [factor['campo'] for factor in ranking] == sorted(
+            (field for field in FIELDS if impacts[field] > 0), key=lambda field: -impacts[field]
+        )
+        for factor in ranking:
+            assert factor['impacto'] > 0
+            assert factor['impacto'] == pytest.approx(impacts[factor['campo']], abs=1e-12)
+
+        # Los impactos más la diferencia de interceptos dan log(P(predicha) / P(segunda))
+        total = sum(impacts.values()) + breakdown['intercepto'][predicted] - breakdown['intercepto'][runner_up]
+        probabilities = result['probabilidades']
+        expected = np.log(probabilities[CLASS_NAMES[predicted]] / probabilities[CLASS_NAMES[runner_up]])
+        assert total == pytest.approx(expected, abs=1e-9)
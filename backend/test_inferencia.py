@@ -0,0 +1,61 @@
+"""
+Pruebas del modelo fusionado (utils/inference.py) frente a scikit-learn.
+
+Uso:
+    python -m pytest -q test_inferencia.py
+"""
+
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from utils.artifact import load_artifact, save_artifact
+from utils.inference import FusedLogisticModel, verify_fused_model
+from utils.synthetic import generate_matrix
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model')
+
+@pytest.fixture(scope='module')
+def sklearn_pair():
+    model = joblib.load(os.path.join(MODEL_DIR, 'modelo_rl.pkl'))
+    scaler = joblib.load(os.path.join(MODEL_DIR, 'scaler.pkl'))
+    return model, scaler
+
+def _rows(scaler, n_rows=1000):
+    # Filas sintéticas con las distribuciones del entrenamiento, más las esquinas
+    # del rango visto por el scaler
+    corners = np.vstack([scaler.data_min_, scaler.data_max_])
+    return np.vstack([generate_matrix(n_rows, seed=42), corners])
+
+def test_fusionado_reproduce_sklearn(sklearn_pair):
+    model, scaler = sklearn_pair
+    rows = _rows(scaler)
+    fused = FusedLogisticModel.from_sklearn(model, scaler)
+
+    expected = model.predict_proba(scaler.transform(rows))
+    np.testing.assert_allclose(fused.predict_proba(rows), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(fused.predict(rows), model.predict(scaler.transform(rows)))
+    assert verify_fused_model(fused, model, scaler)
+
+def test_verify_detecta_un_modelo_distinto(sklearn_pair):
+    model, scaler = sklearn_pair
+    fused = FusedLogisticModel.from_sklearn(model, scaler)
+    # Sumar lo mismo a todas las clases no cambia el softmax: se mueve solo una
+    fused.bias = fused.bias + np.eye(fused.bias.size)[0]
+    assert not verify_fused_model(fused, model, scaler)
+
+@pytest.mark.parametrize('source', ['commit', 'exportado'])
+def test_artefacto_reproduce_sklearn(sklearn_pair, tmp_path, source):
+    model, scaler = sklearn_pair
+    path = os.path.join(MODEL_DIR, 'modelo_rl.bin')
+    if source == 'exportado':
+        path = str(tmp_path / 'modelo_rl.bin')
+        save_artifact(path, model, scaler)
+    fused = load_artifact(path)
+    rows = _rows(scaler)
+
+    expected = model.predict_proba(scaler.transform(rows))
+    np.testing.assert_allclose(fused.predict_proba(rows), expected, rtol=0, atol=1e-12)
+    assert verify_fused_model(fused, model, scaler)
@@ -3,6 +3,9 @@ import pandas as pd
 import numpy as np
 import os
 
+from utils.features import N_FEATURES
+from utils.preprocessing import preprocess_input
+
 print("=" * 70)
 print("🔍 DIAGNÓSTICO DEL MODELO")
 print("=" * 70)
@@ -34,6 +37,8 @@ try:
     
     if hasattr(modelo, 'n_features_in_'):
         print(f"   Características: {modelo.n_features_in_}")
+        if modelo.n_features_in_ != N_FEATURES:
+            print(f"   ⚠️  La API envía {N_FEATURES} características")
     if hasattr(modelo, 'classes_'):
         print(f"   Clases: {modelo.classes_}")
         
@@ -51,6 +56,8 @@ try:
     
     if hasattr(scaler, 'n_features_in_'):
         print(f"   Características: {scaler.n_features_in_}")
+        if scaler.n_features_in_ != N_FEATURES:
+            print(f"   ⚠️  La API envía {N_FEATURES} características")
         
 except Exception as e:
     print(f"❌ ERROR al cargar scaler:")
@@ -63,17 +70,18 @@ except Exception as e:
 print("\n🧪 Prueba de predicción...")
 
 try:
-    datos_prueba = pd.DataFrame({
-        'Genero': [1],
-        'Apoyo_Familiar': [4],
-        'Ingresos_Familiares': [3],
-        'Horas_Estudio': [15.0],
-        'Actividades_Extra': [5.0],
-        'Nivel_Educativo_Padres': [4],
-        'Acceso_Internet': [1],
-        'Clima_Familiar': [4],
-        'Asistencia': [90.0],
-        'Motivacion': [4]
+    # Preprocesar igual que la API
+    datos_prueba = preprocess_input({
+        'genero': 'F',
+        'apoyo_familiar': 4,
+        'ingresos_familiares': 3,
+        'horas_estudio': 15.0,
+        'actividades_extra': 5.0,
+        'nivel_educativo_padres': 4,
+        'acceso_internet': 1,
+        'clima_familiar': 4,
+        'asistencia': 90.0,
+        'motivacion': 4
     })
     
     datos_norm = scaler.transform(datos_prueba)
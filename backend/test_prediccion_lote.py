@@ -0,0 +1,63 @@
+"""
+Pruebas del endpoint de predicción por lotes (/api/predict/batch).
+
+Uso:
+    python -m pytest -q test_prediccion_lote.py
+"""
+
+import pytest
+
+import app as api
+
+ESTUDIANTE = {
+    'genero': 'F',
+    'apoyo_familiar': 4,
+    'ingresos_familiares': 3,
+    'horas_estudio': 20.5,
+    'actividades_extra': 5,
+    'nivel_educativo_padres': 4,
+    'acceso_internet': 1,
+    'clima_familiar': 4,
+    'asistencia': 90,
+    'motivacion': 5
+}
+
+@pytest.fixture
+def client():
+    return api.app.test_client()
+
+def test_lote_con_registros_invalidos(client):
+    otro = dict(ESTUDIANTE, genero='M', horas_estudio=2, asistencia=55, motivacion=1)
+    sin_horas = {key: value for key, value in ESTUDIANTE.items() if key != 'horas_estudio'}
+    records = [ESTUDIANTE, dict(ESTUDIANTE, asistencia=150), sin_horas, otro, 'no es un objeto']
+
+    response = client.post('/api/predict/batch', json={'estudiantes': records})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['total'], body['exitosos'], body['fallidos']) == (5, 2, 3)
+    assert [result['indice'] for result in body['resultados']] == [0, 3]
+    assert sorted(error['indice'] for error in body['errores']) == [1, 2, 4]
+
+    # Cada fila válida coincide con la predicción individual
+    for result, student in zip(body['resultados'], [ESTUDIANTE, otro]):
+        single = client.post('/api/predict', json=student).get_json()
+        assert result['prediccion'] == single['prediccion']
+        for name, probability in single['probabilidades'].items():
+            assert result['probabilidades'][name] == pytest.approx(probability, abs=1e-9)
+
+def test_lista_directa(client):
+    response = client.post('/api/predict/batch', json=[ESTUDIANTE])
+    assert response.status_code == 200
+    assert response.get_json()['exitosos'] == 1
+
+@pytest.mark.parametrize('payload', [{'estudiantes': []}, [], {'estudiantes': ESTUDIANTE}])
+def test_lote_vacio_o_sin_lista(client, payload):
+    response = client.post('/api/predict/batch', json=payload)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'No se recibieron datos'
+
+def test_lote_demasiado_grande(client, monkeypatch):
+    monkeypatch.setattr(api, 'MAX_BATCH_SIZE', 2)
+    response = client.post('/api/predict/batch', json=[ESTUDIANTE] * 3)
+    assert response.status_code == 413
+    assert response.get_json()['error'] == 'Lote demasiado grande'
@@ -0,0 +1,145 @@
+"""
+Pruebas de la carga y recarga del modelo (utils/registry.py).
+
+Cada prueba copia los archivos de model/ a una carpeta temporal; los
+originales no se modifican.
+
+Uso:
+    python -m pytest -q test_registro.py
+"""
+
+import os
+import shutil
+import time
+
+import joblib
+import pytest
+
+from utils.artifact import save_artifact
+from utils.metadata import save_metadata
+from utils.registry import ModelRegistry
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model')
+
+pytestmark = pytest.mark.filterwarnings('ignore')
+
+def _registry(folder, use_sklearn=False):
+    path = lambda name: os.path.join(folder, name)
+    return ModelRegistry(path('modelo_rl.pkl'), path('scaler.pkl'), use_sklearn=use_sklearn,
+                         artifact_path=path('modelo_rl.bin'), metadata_path=path('modelo_rl.json'))
+
+def _copy(folder, *names):
+    for name in names:
+        shutil.copy2(os.path.join(MODEL_DIR, name), os.path.join(folder, name))
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+def _scaled_model(factor):
+    model = joblib.load(os.path.join(MODEL_DIR, 'modelo_rl.pkl'))
+    scaler = joblib.load(os.path.join(MODEL_DIR, 'scaler.pkl'))
+    model.coef_ = model.coef_ * factor
+    return model, scaler
+
+def test_carga_desde_pickles(tmp_path):
+    _copy(tmp_path, 'modelo_rl.pkl', 'scaler.pkl')
+    bundle = _registry(tmp_path).load()
+    assert bundle.source == 'pickle'
+    assert bundle.fused is not None
+    assert bundle.version.startswith('v1-')
+
+def test_carga_desde_artefacto(tmp_path):
+    _copy(tmp_path, 'modelo_rl.bin')
+    bundle = _registry(tmp_path).load()
+    assert bundle.source == 'artefacto'
+    assert bundle.model is None
+
+def test_use_sklearn_ignora_el_artefacto(tmp_path):
+    _copy(tmp_path, 'modelo_rl.pkl', 'scaler.pkl', 'modelo_rl.bin')
+    bundle = _registry(tmp_path, use_sklearn=True).load()
+    assert bundle.source == 'pickle'
+    assert bundle.fused is None
+
+def test_recarga_sin_cambios_conserva_la_version(tmp_path):
+    _copy(tmp_path, 'modelo_rl.bin')
+    registry = _registry(tmp_path)
+    first = registry.load()
+    assert registry.load(force=False) is first
+    assert registry.load(force=True).version.startswith('v2-')
+
+def test_error_de_carga_conserva_el_bundle_activo(tmp_path):
+    _copy(tmp_path, 'modelo_rl.bin')
+    registry = _registry(tmp_path)
+    first = registry.load()
+    with open(tmp_path / 'modelo_rl.bin', 'r+b') as f:
+        f.truncate(10)
+
+    with pytest.raises(ValueError):
+        registry.load(force=False)
+    assert registry.current is first
+    assert 'truncado' in registry.status()['ultimo_error']
+
+def test_vigilancia_sin_pickles(tmp_path):
+    # Solo el artefacto: reemplazarlo publica una versión aunque falten los pickles
+    _copy(tmp_path, 'modelo_rl.bin')
+    registry = _registry(tmp_path)
+    first = registry.load()
+    assert registry._mtimes()[:2] == (None, None)
+
+    registry.start_watcher(0.05)
+    try:
+        save_artifact(str(tmp_path / 'modelo_rl.bin'), *_scaled_model(1.1))
+        assert _wait_for(lambda: registry.current is not first)
+    finally:
+        registry.stop_watcher()
+    assert registry.current.source == 'artefacto'
+
+def test_publicacion_a_medias_no_se_carga(tmp_path):
+    _copy(tmp_path, 'modelo_rl.pkl', 'scaler.pkl')
+    model_path, scaler_path = str(tmp_path / 'modelo_rl.pkl'), str(tmp_path / 'scaler.pkl')
+    metadata = str(tmp_path / 'modelo_rl.json')
+    save_metadata(metadata, {'precision_prueba': 0.85}, files=[model_path, scaler_path])
+    registry = _registry(tmp_path)
+    first = registry.load()
+
+    # Modelo nuevo con los metadatos de la versión anterior
+    model, _ = _scaled_model(1.1)
+    joblib.dump(model, model_path)
+    with pytest.raises(ValueError, match='publicación'):
+        registry.load(force=False)
+    assert registry.current is first
+
+    # Al escribirse los metadatos la publicación queda completa
+    save_metadata(metadata, {'precision_prueba': 0.86}, files=[model_path, scaler_path])
+    bundle = registry.load(force=False)
+    assert bundle is not first
+    assert bundle.fused.weights_t != pytest.approx(first.fused.weights_t)
+
+def test_artefacto_nuevo_con_metadatos_viejos_no_se_carga(tmp_path):
+    _copy(tmp_path, 'modelo_rl.bin')
+    artifact = str(tmp_path / 'modelo_rl.bin')
+    metadata = str(tmp_path / 'modelo_rl.json')
+    save_metadata(metadata, {'precision_prueba': 0.85}, files=[artifact])
+    registry = _registry(tmp_path)
+    first = registry.load()
+
+    save_artifact(artifact, *_scaled_model(1.1))
+    with pytest.raises(ValueError, match='publicación'):
+        registry.load(force=False)
+    assert registry.current is first
+
+    save_metadata(metadata, {'precision_prueba': 0.86}, files=[artifact])
+    assert registry.load(force=False) is not first
+
+def test_on_swap_recibe_el_bundle_nuevo(tmp_path):
+    _copy(tmp_path, 'modelo_rl.pkl', 'scaler.pkl')
+    swapped = []
+    registry = _registry(tmp_path)
+    registry.on_swap = swapped.append
+    bundle = registry.load()
+    assert swapped == [bundle]
@@ -0,0 +1,152 @@
+"""
+Pruebas del motor de reglas (utils/rules.py) frente a las funciones originales.
+
+_factores_originales y _recomendaciones_originales son copia de las funciones
+con if/elif que reemplazó la tabla de reglas.
+
+Uso:
+    python -m pytest -q test_reglas.py
+"""
+
+import numpy as np
+import pytest
+
+from utils.features import CLASS_NAMES, FEATURE_INDEX, N_FEATURES
+from utils.rules import DEFAULT_FALLBACK_FACTORS, RuleEngine, get_rule_engine
+
+# Valores alrededor de cada umbral de las reglas
+_VALORES = {
+    'Apoyo_Familiar': [1, 2, 3, 4, 5],
+    'Ingresos_Familiares': [1, 2, 3, 4, 5],
+    'Horas_Estudio': [0, 4.9, 5, 9.9, 10, 14.9, 15, 40],
+    'Nivel_Educativo_Padres': [1, 3, 4, 5],
+    'Clima_Familiar': [1, 3, 4, 5],
+    'Motivacion': [1, 2, 3, 4, 5],
+    'Asistencia': [0, 69.9, 70, 84.9, 85, 89.9, 90, 100],
+}
+
+def _factores_originales(row):
+    apoyo_familiar = row['Apoyo_Familiar']
+    ingresos = row['Ingresos_Familiares']
+    horas_estudio = row['Horas_Estudio']
+    nivel_educativo = row['Nivel_Educativo_Padres']
+    clima_familiar = row['Clima_Familiar']
+    motivacion = row['Motivacion']
+    asistencia = row['Asistencia']
+
+    factors = []
+    if apoyo_familiar >= 4:
+        factors.append('Alto Apoyo Familiar')
+    elif apoyo_familiar <= 2:
+        factors.append('Bajo Apoyo Familiar (⚠️)')
+    if horas_estudio >= 15:
+        factors.append('Buenos Hábitos de Estudio')
+    elif horas_estudio < 5:
+        factors.append('Pocas Horas de Estudio (⚠️)')
+    if motivacion >= 4:
+        factors.append('Alta Motivación')
+    elif motivacion <= 2:
+        factors.append('Baja Motivación (⚠️)')
+    if asistencia >= 90:
+        factors.append('Excelente Asistencia')
+    elif asistencia < 70:
+        factors.append('Baja Asistencia (⚠️)')
+    if clima_familiar >= 4:
+        factors.append('Buen Clima Familiar')
+    if nivel_educativo >= 4:
+        factors.append('Alto Nivel Educativo de los Padres')
+    if ingresos >= 4:
+        factors.append('Buenos Recursos Económicos')
+    elif ingresos <= 2:
+        factors.append('Recursos Económicos Limitados (⚠️)')
+    if len(factors) == 0:
+        factors = ['Apoyo Familiar', 'Horas de Estudio', 'Motivación']
+    return factors[:5]
+
+def _recomendaciones_originales(prediction, row):
+    horas_estudio = row['Horas_Estudio']
+    motivacion = row['Motivacion']
+    asistencia = row['Asistencia']
+
+    recommendations = []
+    if prediction == 'Bajo':
+        recommendations.append('Incrementar las horas de estudio semanales')
+        recommendations.append('Buscar apoyo tutorial o asesoría académica')
+        recommendations.append('Mejorar la asistencia a clases')
+        recommendations.append('Establecer un plan de estudio estructurado')
+        recommendations.append('Fomentar la comunicación con la familia sobre el progreso académico')
+    elif prediction == 'Medio':
+        if horas_estudio < 10:
+            recommendations.append('Aumentar gradualmente las horas de estudio')
+        if motivacion <= 3:
+            recommendations.append('Participar en actividades que refuercen el interés académico')
+        if asistencia < 85:
+            recommendations.append('Mejorar la asistencia regular a clases')
+        recommendations.append('Establecer metas académicas claras a corto plazo')
+        recommendations.append('Mantener comunicación constante con docentes')
+    else:
+        recommendations.append('Mantener los buenos hábitos de estudio')
+        recommendations.append('Participar en actividades de liderazgo académico')
+        recommendations.append('Considerar programas de tutoría para apoyar a otros estudiantes')
+        recommendations.append('Explorar oportunidades de investigación o proyectos avanzados')
+    return recommendations
+
+def _matrix(n_rows=5000, seed=7):
+    rng = np.random.default_rng(seed)
+    data = np.zeros((n_rows, N_FEATURES))
+    for column, values in _VALORES.items():
+        data[:, FEATURE_INDEX[column]] = rng.choice(values, n_rows)
+    return data
+
+def _as_dict(row):
+    return {column: row[index] for column, index in FEATURE_INDEX.items()}
+
+def test_factores_coinciden_con_el_codigo_original():
+    data = _matrix()
+    obtained = get_rule_engine().key_factors(data)
+    expected = [_factores_originales(_as_dict(row)) for row in data]
+    assert obtained == expected
+
+    # La muestra incluye filas con más de 5 factores y filas sin ninguno
+    assert any(len(factors) == 5 for factors in expected)
+    assert list(DEFAULT_FALLBACK_FACTORS) in expected
+
+def test_tope_de_cinco_factores():
+    row = np.zeros((1, N_FEATURES))
+    for column in _VALORES:
+        row[0, FEATURE_INDEX[column]] = max(_VALORES[column])
+    factors = get_rule_engine().key_factors(row)[0]
+    assert factors == _factores_originales(_as_dict(row[0]))
+    assert len(factors) == 5
+
+def test_factores_por_defecto():
+    row = np.zeros((1, N_FEATURES))
+    for column, value in [('Apoyo_Familiar', 3), ('Ingresos_Familiares', 3), ('Horas_Estudio', 10),
+                          ('Nivel_Educativo_Padres', 3), ('Clima_Familiar', 3), ('Motivacion', 3),
+                          ('Asistencia', 80)]:
+        row[0, FEATURE_INDEX[column]] = value
+    assert get_rule_engine().key_factors(row) == [['Apoyo Familiar', 'Horas de Estudio', 'Motivación']]
+
+@pytest.mark.parametrize('prediction', CLASS_NAMES)
+def test_recomendaciones_coinciden_con_el_codigo_original(prediction):
+    data = _matrix(seed=11)
+    obtained = get_rule_engine().recommendations([prediction] * len(data), data)
+    assert obtained == [_recomendaciones_originales(prediction, _as_dict(row)) for row in data]
+
+def test_recomendaciones_con_indices_de_clase():
+    data = _matrix(n_rows=30)
+    predictions = np.arange(len(data)) % len(CLASS_NAMES)
+    engine = get_rule_engine()
+    by_name = engine.recommendations([CLASS_NAMES[i] for i in predictions], data)
+    assert engine.recommendations(predictions, data) == by_name
+
+def test_clase_desconocida_recibe_las_recomendaciones_de_alto():
+    data = _matrix(n_rows=1)
+    engine = get_rule_engine()
+    obtained = engine.recommendations(['Excelente'], data)
+    assert obtained == engine.recommendations(['Alto'], data)
+    assert obtained[0] == _recomendaciones_originales('Excelente', _as_dict(data[0]))
+
+def test_regla_con_columna_desconocida():
+    with pytest.raises(ValueError, match='Columna desconocida'):
+        RuleEngine(factor_rules=[('Edad', '>=', 18, 'Mayor de edad', 'positivo')])
@@ -0,0 +1,64 @@
+"""
+Pruebas de los datos sintéticos (utils/synthetic.py).
+
+_datos_originales es copia del código con el que entrenar_modelo_10_features.py
+generaba su dataset antes de usar generate_matrix.
+
+Uso:
+    python -m pytest -q test_sintetico.py
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.features import FEATURE_COLUMNS
+from utils.synthetic import generate_matrix, performance_labels
+
+def _datos_originales(n_samples, seed):
+    np.random.seed(seed)
+    data = {
+        'Genero': np.random.randint(0, 2, n_samples),
+        'Apoyo_Familiar': np.random.randint(1, 6, n_samples),
+        'Ingresos_Familiares': np.random.randint(1, 6, n_samples),
+        'Horas_Estudio': np.random.uniform(0, 40, n_samples),
+        'Actividades_Extra': np.random.uniform(0, 20, n_samples),
+        'Nivel_Educativo_Padres': np.random.randint(1, 6, n_samples),
+        'Acceso_Internet': np.random.randint(0, 2, n_samples),
+        'Clima_Familiar': np.random.randint(1, 6, n_samples),
+        'Asistencia': np.random.uniform(60, 100, n_samples),
+        'Motivacion': np.random.randint(1, 6, n_samples)
+    }
+    df = pd.DataFrame(data, columns=FEATURE_COLUMNS)
+    rendimiento_score = (
+        (df['Horas_Estudio'] / 40) * 0.3 +
+        (df['Apoyo_Familiar'] / 5) * 0.25 +
+        (df['Motivacion'] / 5) * 0.2 +
+        (df['Asistencia'] / 100) * 0.15 +
+        (df['Clima_Familiar'] / 5) * 0.1
+    )
+    labels = pd.cut(rendimiento_score, bins=[0, 0.4, 0.7, 1.0], labels=[0, 1, 2])
+    return df.to_numpy(np.float64), labels.astype(int).to_numpy()
+
+def test_legacy_seed_reproduce_el_dataset_del_modelo_publicado():
+    expected, expected_labels = _datos_originales(200, 42)
+    matrix = generate_matrix(200, legacy_seed=42)
+    np.testing.assert_array_equal(matrix, expected)
+    np.testing.assert_array_equal(performance_labels(matrix), expected_labels)
+
+def test_legacy_seed_no_toca_el_estado_global():
+    np.random.seed(0)
+    before = np.random.get_state()[1].copy()
+    generate_matrix(10, legacy_seed=42)
+    np.testing.assert_array_equal(np.random.get_state()[1], before)
+
+def test_etiquetas_coinciden_con_pd_cut():
+    matrix = generate_matrix(5000, seed=1)
+    expected = pd.cut(
+        (matrix[:, FEATURE_COLUMNS.index('Horas_Estudio')] / 40) * 0.3 +
+        (matrix[:, FEATURE_COLUMNS.index('Apoyo_Familiar')] / 5) * 0.25 +
+        (matrix[:, FEATURE_COLUMNS.index('Motivacion')] / 5) * 0.2 +
+        (matrix[:, FEATURE_COLUMNS.index('Asistencia')] / 100) * 0.15 +
+        (matrix[:, FEATURE_COLUMNS.index('Clima_Familiar')] / 5) * 0.1,
+        bins=[0, 0.4, 0.7, 1.0], labels=[0, 1, 2]
+    ).astype(int)
+    np.testing.assert_array_equal(performance_labels(matrix), expected)
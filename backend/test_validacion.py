@@ -0,0 +1,83 @@
+"""
+Pruebas de la validación de estudiantes (utils/validation.py).
+
+Uso:
+    python -m pytest -q test_validacion.py
+"""
+
+import numpy as np
+
+from utils.features import FEATURE_INDEX, REQUIRED_FIELDS
+from utils.preprocessing import preprocess_input
+from utils.validation import describe_errors, validate_record, validate_records
+
+ESTUDIANTE = {
+    'genero': 'F',
+    'apoyo_familiar': 4,
+    'ingresos_familiares': 3,
+    'horas_estudio': 20.5,
+    'actividades_extra': 5,
+    'nivel_educativo_padres': 4,
+    'acceso_internet': 1,
+    'clima_familiar': 4,
+    'asistencia': 90,
+    'motivacion': 5
+}
+
+def test_estudiante_valido_sin_errores():
+    row, errors = validate_record(ESTUDIANTE)
+    assert errors == []
+    assert row[FEATURE_INDEX['Horas_Estudio']] == 20.5
+    np.testing.assert_array_equal(row, preprocess_input(ESTUDIANTE).reshape(-1))
+
+def test_campo_faltante():
+    data = {key: value for key, value in ESTUDIANTE.items() if key != 'horas_estudio'}
+    _, errors = validate_record(data)
+    assert errors == [{
+        'campo': 'horas_estudio',
+        'tipo': 'faltante',
+        'mensaje': 'Campo requerido faltante: horas_estudio'
+    }]
+
+def test_valor_fuera_de_rango():
+    _, errors = validate_record(dict(ESTUDIANTE, horas_estudio=500))
+    assert [error['tipo'] for error in errors] == ['rango']
+    assert errors[0]['mensaje'] == 'Horas_Estudio debe estar entre 0 y 168. Valor recibido: 500.0'
+
+def test_tipo_invalido():
+    _, errors = validate_record(dict(ESTUDIANTE, asistencia='mucha'))
+    assert errors[0]['campo'] == 'asistencia'
+    assert errors[0]['tipo'] == 'formato'
+    assert errors[0]['mensaje'].endswith("Valor recibido: 'mucha'")
+
+def test_se_reportan_todos_los_errores():
+    _, errors = validate_record({'genero': 'X', 'horas_estudio': -1})
+    assert len(errors) == len(REQUIRED_FIELDS)
+    assert {error['tipo'] for error in errors} == {'formato', 'rango', 'faltante'}
+
+def test_registro_que_no_es_objeto():
+    _, errors = validate_record(['F', 4])
+    assert errors == [{'campo': None, 'tipo': 'formato', 'mensaje': 'Cada estudiante debe ser un objeto JSON'}]
+
+def test_describe_errors_con_faltantes():
+    _, errors = validate_record({'genero': 'F'})
+    body = describe_errors(errors)
+    assert body['error'] == 'Campos faltantes'
+    assert body['campos_requeridos'] == REQUIRED_FIELDS
+    assert body['campos_faltantes'] == [field for field in REQUIRED_FIELDS if field != 'genero']
+    assert body['detalle'] == '; '.join(error['mensaje'] for error in errors)
+
+def test_describe_errors_sin_faltantes():
+    _, errors = validate_record(dict(ESTUDIANTE, motivacion=9))
+    body = describe_errors(errors)
+    assert body['error'] == 'Error en validación de datos'
+    assert 'campos_faltantes' not in body
+
+def test_lote_con_registros_invalidos():
+    records = [ESTUDIANTE, dict(ESTUDIANTE, asistencia=150), 'no es un objeto', dict(ESTUDIANTE, genero='M')]
+    matrix, valid_indices, errors = validate_records(records)
+    assert list(valid_indices) == [0, 3]
+    assert matrix.shape == (2, len(REQUIRED_FIELDS))
+    assert sorted(errors) == [1, 2]
+    assert errors[1][0]['tipo'] == 'rango'
+    np.testing.assert_array_equal(matrix[0], validate_record(ESTUDIANTE)[0])
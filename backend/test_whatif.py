@@ -0,0 +1,96 @@
+"""
+Pruebas del análisis "¿qué pasaría si...?" (utils/whatif.py).
+
+Uso:
+    python -m pytest -q test_whatif.py
+"""
+
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from utils.features import FEATURE_INDEX
+from utils.inference import load_inference_pair
+from utils.predictor import predict_batch
+from utils.whatif import parse_variations, what_if
+
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'model')
+
+@pytest.fixture(scope='module')
+def pair():
+    return load_inference_pair(
+        os.path.join(MODEL_DIR, 'modelo_rl.pkl'), os.path.join(MODEL_DIR, 'scaler.pkl'),
+        artifact_path=os.path.join(MODEL_DIR, 'modelo_rl.bin')
+    )
+
+def _base_row():
+    row = np.array([1, 2, 3, 5, 5, 4, 1, 2, 70, 2], dtype=np.float64)
+    assert row.size == len(FEATURE_INDEX)
+    return row
+
+def test_rango_por_defecto():
+    [(column, field, values)] = parse_variations({'asistencia': None}, 10000)
+    assert (column, field) == (FEATURE_INDEX['Asistencia'], 'asistencia')
+    assert values[0] == 0 and values[-1] == 100 and len(values) == 101
+
+def test_paso_diminuto_se_rechaza_sin_reservar_memoria():
+    tracemalloc.start()
+    try:
+        with pytest.raises(ValueError, match='combinaciones'):
+            parse_variations({'asistencia': {'desde': 0, 'hasta': 100, 'paso': 1e-9}}, 10000)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < 1 << 20
+
+def test_limite_de_combinaciones():
+    variations = {'horas_estudio': {'desde': 0, 'hasta': 99}, 'asistencia': {'desde': 1, 'hasta': 100}}
+    assert len(parse_variations(variations, 10000)) == 2
+    with pytest.raises(ValueError, match='máximo es 9999'):
+        parse_variations(variations, 9999)
+
+@pytest.mark.parametrize('variations, message', [
+    ({}, '1 o 2'),
+    ({'horas_estudio': {}, 'asistencia': {}, 'motivacion': {}}, '1 o 2'),
+    ({'edad': {}}, 'Campo desconocido'),
+    ({'genero': {}}, 'no es numérico'),
+    ({'asistencia': {'desde': 50, 'hasta': 120}}, 'debe cumplir'),
+    ({'asistencia': {'paso': 0}}, 'mayor que 0'),
+    ({'asistencia': {'paso': 'uno'}}, 'deben ser números'),
+])
+def test_variaciones_invalidas(variations, message):
+    with pytest.raises(ValueError, match=message):
+        parse_variations(variations, 10000)
+
+def test_rejilla_coincide_con_la_prediccion_directa(pair):
+    variables = parse_variations({
+        'horas_estudio': {'desde': 0, 'hasta': 40, 'paso': 10},
+        'asistencia': {'desde': 60, 'hasta': 100, 'paso': 20}
+    }, 10000)
+    base = _base_row()
+    result = what_if(*pair, base, variables)
+
+    assert np.shape(result['probabilidades']['Alto']) == (5, 3)
+    row = base.copy()
+    row[FEATURE_INDEX['Horas_Estudio']] = 30
+    row[FEATURE_INDEX['Asistencia']] = 80
+    expected = predict_batch(*pair, row)[0]
+    assert result['prediccion'][3][1] == expected['prediccion']
+    for name, probability in expected['probabilidades'].items():
+        assert result['probabilidades'][name][3][1] == pytest.approx(probability, abs=1e-12)
+
+def test_cambio_minimo_alcanza_la_clase_siguiente(pair):
+    variables = parse_variations({'horas_estudio': {'desde': 0, 'hasta': 168}}, 10000)
+    result = what_if(*pair, _base_row(), variables)
+    change = result['cambio_minimo']['horas_estudio']
+    if result['clase_siguiente'] is None or change is None:
+        pytest.skip('El estudiante base no puede subir de clase variando las horas de estudio')
+
+    row = _base_row()
+    row[FEATURE_INDEX['Horas_Estudio']] = change['valor']
+    assert predict_batch(*pair, row)[0]['prediccion'] == change['prediccion']
+    # Un paso menos no alcanza la clase siguiente
+    row[FEATURE_INDEX['Horas_Estudio']] = change['valor'] - 1
+    assert predict_batch(*pair, row)[0]['prediccion'] == result['prediccion_base']
@@ -1,17 +1,78 @@
 """
 Paquete de utilidades para el sistema de predicción de rendimiento académico.
-Contiene módulos para preprocesamiento y predicción.
+Contiene módulos para preprocesamiento, predicción e inferencia.
+
+Los submódulos se importan bajo demanda: `import utils.features` no arrastra
+NumPy ni el resto del paquete, y `from utils import X` solo carga el módulo
+que define X.
 """
 
-from .preprocessing import preprocess_input, validate_input
-from .predictor import predict_performance, identify_key_factors, get_recommendations
+import importlib
+
+# Nombre exportado -> submódulo que lo define
+_EXPORTS = {
+    'FEATURE_SCHEMA': 'features',
+    'FEATURE_COLUMNS': 'features',
+    'REQUIRED_FIELDS': 'features',
+    'N_FEATURES': 'features',
+    'FEATURE_INDEX': 'features',
+    'ValidationError': 'validation',
+    'validate_record': 'validation',
+    'validate_records': 'validation',
+    'preprocess_input': 'preprocessing',
+    'preprocess_batch': 'preprocessing',
+    'to_dataframe': 'preprocessing',
+    'validate_input': 'preprocessing',
+    'predict_performance': 'predictor',
+    'predict_batch': 'predictor',
+    'feature_contributions': 'predictor',
+    'identify_key_factors': 'predictor',
+    'get_recommendations': 'predictor',
+    'what_if': 'whatif',
+    'FusedLogisticModel': 'inference',
+    'verify_fused_model': 'inference',
+    'fuse_model': 'inference',
+    'load_inference_pair': 'inference',
+    'save_artifact': 'artifact',
+    'read_artifact': 'artifact',
+    'load_artifact': 'artifact',
+    'RuleEngine': 'rules',
+    'load_rules': 'rules',
+    'get_rule_engine': 'rules',
+    'set_rule_engine': 'rules',
+    'PredictionCache': 'cache',
+    'MicroBatcher': 'batching',
+    'AdmissionController': 'admission',
+    'FeedbackBuffer': 'feedback',
+    'FeedbackUpdater': 'feedback',
+    'StaticResponse': 'serialization',
+    'load_metadata': 'metadata',
+    'save_metadata': 'metadata',
+    'configure_logging': 'logs',
+    'get_logger': 'logs',
+    'get_sampled_logger': 'logs',
+    'generate_students': 'synthetic',
+    'generate_matrix': 'synthetic',
+    'IncrementalSoftmax': 'incremental',
+    'cross_validate_grid': 'search',
+    'profile_call': 'profiling',
+    'MetricsRegistry': 'metrics',
+    'render_metrics': 'metrics',
+    'ModelBundle': 'registry',
+    'ModelRegistry': 'registry'
+}
+
+__all__ = list(_EXPORTS)
+
+__version__ = '1.0.0'
 
-__all__ = [
-    'preprocess_input',
-    'validate_input',
-    'predict_performance',
-    'identify_key_factors',
-    'get_recommendations'
-]
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
 
-__version__ = '1.0.0'
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,169 @@
+"""
+Control de admisión para los endpoints de predicción.
+
+Antes de predecir, cada petición pasa por tres filtros:
+
+1. Cubeta de tokens por cliente (opcional): cada cliente recibe `client_rate`
+   peticiones por segundo con ráfagas de hasta `client_burst`.
+2. Límite de peticiones en curso: como mucho `max_in_flight` predicciones a la
+   vez en el proceso.
+3. Presupuesto de espera: si no hay hueco, la petición espera como mucho
+   `queue_timeout_ms` (contando lo que ya esperó antes de llegar aquí) y si no
+   lo consigue se rechaza.
+
+Una petición rechazada recibe al instante un 503 (o 429 si superó su cubeta)
+con Retry-After, en lugar de esperar detrás de los workers hasta que el cliente
+corte. Los endpoints baratos (/api/health, /api/model-info) no pasan por aquí,
+así que siempre quedan hilos para ellos mientras el límite sea menor que los
+hilos del servidor.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from .metrics import REGISTRY
+
+# Motivo del rechazo y segundos sugeridos para reintentar
+Rejection = namedtuple('Rejection', ['motivo', 'retry_after'])
+
+admission_total = REGISTRY.counter(
+    'rendimiento_admision_total',
+    'Peticiones de predicción admitidas o rechazadas por el control de admisión',
+    ('resultado', 'motivo')
+)
+
+_ADMITTED = admission_total.labels('admitida', 'ninguno')
+
+class TokenBuckets:
+    """
+    Una cubeta de tokens por cliente, con un máximo de clientes recordados
+
+    Args:
+        rate (float): Tokens que recupera cada cliente por segundo
+        burst (float): Capacidad de la cubeta (ráfaga máxima)
+        max_clients (int): Clientes recordados; se olvidan los menos recientes
+    """
+
+    def __init__(self, rate, burst, max_clients=10000):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client_id, now=None):
+        """
+        Consume un token del cliente
+
+        Returns:
+            float: 0 si había token, o segundos hasta que haya uno
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, last = self._buckets.pop(client_id, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1.0:
+                tokens -= 1.0
+                wait = 0.0
+            else:
+                wait = (1.0 - tokens) / self.rate
+            self._buckets[client_id] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+class AdmissionController:
+    """
+    Límite de predicciones en curso con presupuesto de espera y cubetas por cliente
+
+    Args:
+        max_in_flight (int): Predicciones simultáneas permitidas (0 = sin límite)
+        queue_timeout_ms (float): Espera máxima por un hueco antes de rechazar
+        client_rate (float): Peticiones por segundo por cliente (0 = sin límite)
+        client_burst (float, optional): Ráfaga por cliente; por defecto max(1, client_rate)
+        retry_after (int): Segundos de Retry-After cuando no hay hueco
+    """
+
+    def __init__(self, max_in_flight=0, queue_timeout_ms=0.0, client_rate=0.0,
+                 client_burst=None, retry_after=1):
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout_ms / 1000.0
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_in_flight) if max_in_flight > 0 else None
+        self._buckets = None
+        if client_rate > 0:
+            self._buckets = TokenBuckets(client_rate, client_burst or max(1.0, client_rate))
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._admitted = 0
+        self._rejected = {'cliente': 0, 'concurrencia': 0, 'espera': 0}
+
+    @property
+    def enabled(self):
+        return self._slots is not None or self._buckets is not None
+
+    def _reject(self, reason, retry_after):
+        with self._lock:
+            self._rejected[reason] += 1
+        admission_total.labels('rechazada', reason).inc()
+        return Rejection(reason, max(1, int(math.ceil(retry_after))))
+
+    def admit(self, client_id=None, arrived=None, blocking=True):
+        """
+        Decide si una petición de predicción se atiende
+
+        Si se admite, quien llama debe invocar release() al terminar.
+
+        Args:
+            client_id (str, optional): Identificador del cliente para su cubeta
+            arrived (float, optional): time.monotonic() al recibir la petición;
+                el tiempo ya esperado se descuenta del presupuesto
+            blocking (bool): Esperar un hueco dentro del presupuesto; con False
+                se decide al instante (para llamar desde un event loop)
+
+        Returns:
+            Rejection | None: None si se admite
+        """
+        if self._buckets is not None and client_id is not None:
+            wait = self._buckets.take(client_id)
+            if wait > 0:
+                return self._reject('cliente', wait)
+
+        if self._slots is not None:
+            budget = self.queue_timeout
+            if arrived is not None:
+                budget -= time.monotonic() - arrived
+                if budget < 0 and self.queue_timeout > 0:
+                    return self._reject('espera', self.retry_after)
+            if budget > 0 and blocking:
+                acquired = self._slots.acquire(timeout=budget)
+            else:
+                acquired = self._slots.acquire(blocking=False)
+            if not acquired:
+                return self._reject('espera' if budget > 0 and blocking else 'concurrencia', self.retry_after)
+
+        with self._lock:
+            self._in_flight += 1
+            self._admitted += 1
+        _ADMITTED.inc()
+        return None
+
+    def release(self):
+        """Libera el hueco de una petición admitida"""
+        with self._lock:
+            self._in_flight -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def stats(self):
+        """Estado para /api/health"""
+        with self._lock:
+            return {
+                'habilitado': self.enabled,
+                'max_en_curso': self.max_in_flight,
+                'en_curso': self._in_flight,
+                'admitidas': self._admitted,
+                'rechazadas': dict(self._rejected)
+            }
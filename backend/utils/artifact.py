@@ -0,0 +1,201 @@
+"""
+Artefacto binario de inferencia (modelo_rl.bin).
+
+Guarda en un solo archivo plano todo lo que necesita la inferencia: coeficientes
+e interceptos de la regresión, min_/scale_ del scaler, pesos ya fusionados,
+orden de las clases y nombres de las columnas. El archivo empieza con una
+cabecera fija de 64 bytes y sigue con los arreglos float64 little-endian,
+alineados a 8 bytes:
+
+    cabecera | nombres (UTF-8) | clases | coef | intercept | scale | min | W^T | b
+
+Al cargar se mapea en memoria de solo lectura y los arreglos son vistas sobre
+ese mapa, así que todos los procesos que abren el mismo archivo comparten las
+mismas páginas y no se importa sklearn ni se ejecuta código de pickle.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from .features import FEATURE_COLUMNS
+from .inference import FusedLogisticModel, fuse_model
+
+MAGIC = b'RPAMODEL'
+FORMAT_VERSION = 1
+HEADER_SIZE = 64
+
+# magic, versión, flags, n_features, n_salidas, n_clases, bytes de nombres, crc32
+_HEADER = struct.Struct('<8sHHIIIII')
+
+_FLAG_MULTINOMIAL = 0x1
+
+_FLOAT = np.dtype('<f8')
+_INT = np.dtype('<i8')
+
+def _padded(size):
+    return (size + 7) & ~7
+
+def _layout(n_features, n_outputs, n_classes, names_len):
+    """Desplazamiento, dtype y forma de cada sección del archivo"""
+    sections = [
+        ('classes', _INT, (n_classes,)),
+        ('coef', _FLOAT, (n_outputs, n_features)),
+        ('intercept', _FLOAT, (n_outputs,)),
+        ('scale', _FLOAT, (n_features,)),
+        ('min', _FLOAT, (n_features,)),
+        ('weights_t', _FLOAT, (n_features, n_outputs)),
+        ('bias', _FLOAT, (n_outputs,)),
+    ]
+    offset = HEADER_SIZE + _padded(names_len)
+    layout = []
+    for name, dtype, shape in sections:
+        layout.append((name, dtype, shape, offset))
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return layout, offset
+
+def save_artifact(path, model, scaler, feature_names=None):
+    """
+    Escribe el artefacto binario a partir del modelo y scaler entrenados
+
+    El archivo se escribe en un temporal y se reemplaza con os.replace, de modo
+    que un servidor que vigila la carpeta nunca lee un archivo a medias.
+
+    Args:
+        path (str): Ruta de salida (por ejemplo model/modelo_rl.bin)
+        model: LogisticRegression entrenada
+        scaler: MinMaxScaler entrenado
+        feature_names (list, optional): Nombres de columnas; por defecto FEATURE_COLUMNS
+
+    Returns:
+        int: Tamaño del archivo en bytes
+
+    Raises:
+        ValueError: Si el par no se puede fusionar o las clases no son enteras
+    """
+    fused, reason = fuse_model(model, scaler)
+    if fused is None:
+        raise ValueError(reason)
+
+    classes = np.asarray(model.classes_)
+    if not np.issubdtype(classes.dtype, np.integer):
+        raise ValueError(f'Las clases del modelo deben ser enteras, no {classes.dtype}')
+
+    names = list(feature_names if feature_names is not None else FEATURE_COLUMNS)
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    n_outputs, n_features = coef.shape
+    if len(names) != n_features:
+        raise ValueError(f'Se indicaron {len(names)} nombres de columnas para {n_features} características')
+
+    arrays = {
+        'classes': classes,
+        'coef': coef,
+        'intercept': model.intercept_,
+        'scale': scaler.scale_,
+        'min': scaler.min_,
+        'weights_t': fused.weights_t,
+        'bias': fused.bias,
+    }
+
+    encoded_names = '\n'.join(names).encode('utf-8')
+    layout, total = _layout(n_features, n_outputs, len(classes), len(encoded_names))
+
+    payload = bytearray(total - HEADER_SIZE)
+    payload[:len(encoded_names)] = encoded_names
+    for name, dtype, shape, offset in layout:
+        block = np.ascontiguousarray(np.asarray(arrays[name]).reshape(shape), dtype=dtype).tobytes()
+        start = offset - HEADER_SIZE
+        payload[start:start + len(block)] = block
+
+    flags = _FLAG_MULTINOMIAL if fused.multinomial else 0
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, flags, n_features, n_outputs, len(classes),
+        len(encoded_names), zlib.crc32(payload)
+    ).ljust(HEADER_SIZE, b'\0')
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return total
+
+def read_artifact(path, verify=True):
+    """
+    Mapea el artefacto en memoria y devuelve vistas de solo lectura de sus arreglos
+
+    Args:
+        path (str): Ruta del artefacto
+        verify (bool): Comprobar el CRC32 del contenido
+
+    Returns:
+        dict: Arreglos del archivo más 'feature_names', 'multinomial' y 'version'
+
+    Raises:
+        ValueError: Si el archivo no es un artefacto válido
+    """
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise ValueError('El artefacto está vacío')
+
+    if len(buffer) < HEADER_SIZE:
+        raise ValueError('El artefacto está truncado')
+
+    magic, version, flags, n_features, n_outputs, n_classes, names_len, crc = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError('El archivo no es un artefacto de modelo')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'Versión de artefacto no soportada: {version}')
+
+    layout, total = _layout(n_features, n_outputs, n_classes, names_len)
+    if len(buffer) != total:
+        raise ValueError(f'El artefacto mide {len(buffer)} bytes y debería medir {total}')
+    if verify and zlib.crc32(memoryview(buffer)[HEADER_SIZE:]) != crc:
+        raise ValueError('El artefacto está corrupto (CRC32 no coincide)')
+
+    artifact = {
+        'version': version,
+        'multinomial': bool(flags & _FLAG_MULTINOMIAL),
+        'feature_names': buffer[HEADER_SIZE:HEADER_SIZE + names_len].decode('utf-8').split('\n'),
+    }
+    for name, dtype, shape, offset in layout:
+        count = int(np.prod(shape))
+        artifact[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+    return artifact
+
+def load_artifact(path, verify=True):
+    """
+    Carga el artefacto como un FusedLogisticModel listo para predict_batch
+
+    Los pesos son vistas sobre el mapa de memoria; no se copian.
+
+    Args:
+        path (str): Ruta del artefacto
+        verify (bool): Comprobar el CRC32 del contenido
+
+    Returns:
+        FusedLogisticModel: Modelo con feature_names_in_ tomado del artefacto
+
+    Raises:
+        ValueError: Si el archivo no es válido o sus columnas no coinciden con el esquema
+    """
+    artifact = read_artifact(path, verify=verify)
+    if artifact['feature_names'] != FEATURE_COLUMNS:
+        raise ValueError(
+            f"Las columnas del artefacto {artifact['feature_names']} no coinciden con el esquema {FEATURE_COLUMNS}"
+        )
+
+    fused = FusedLogisticModel.from_arrays(
+        artifact['weights_t'], artifact['bias'], artifact['classes'], artifact['multinomial'],
+        offsets_t=(artifact['coef'] * artifact['min']).T, intercept=artifact['intercept']
+    )
+    fused.unfused = {key: artifact[key] for key in ('coef', 'intercept', 'scale', 'min')}
+    fused.feature_names_in_ = artifact['feature_names']
+    return fused
@@ -0,0 +1,192 @@
+"""
+Micro-batching de predicciones individuales.
+
+Con muchas peticiones concurrentes a /api/predict cada una haría su propia
+multiplicación 1×10. El MicroBatcher encola las filas ya validadas y un hilo de
+fondo las agrupa en una sola llamada vectorizada a predict_batch cuando el lote
+llega al tamaño máximo, cuando pasa la espera máxima o cuando ya están en el
+lote todas las peticiones que esperan (así una petición aislada no paga la
+espera). Cada resultado se entrega al hilo de la petición que lo pidió.
+"""
+
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .features import N_FEATURES
+
+class _Pending:
+    """Fila encolada por una petición y el resultado que espera"""
+
+    __slots__ = ('bundle', 'row', 'result', 'error', 'done', 'queued_at')
+
+    def __init__(self, bundle, row):
+        self.bundle = bundle
+        self.row = row
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self.queued_at = time.perf_counter()
+
+def _predict_rows(bundle, matrix):
+    from .predictor import predict_batch
+
+    return predict_batch(*bundle.inference_pair(), matrix)
+
+class MicroBatcher:
+    """
+    Agrupa predicciones concurrentes en llamadas vectorizadas
+
+    Args:
+        max_batch_size (int): Filas máximas por llamada al modelo
+        max_wait_ms (float): Espera máxima desde que llega la primera fila del lote
+        max_queue (int): Filas máximas en cola; si se llena, la petición predice
+            directamente en su propio hilo
+        predict (callable, optional): predict(bundle, matriz) -> lista de resultados
+    """
+
+    def __init__(self, max_batch_size=64, max_wait_ms=2.0, max_queue=1024, predict=None):
+        if max_batch_size < 1:
+            raise ValueError('El tamaño máximo de lote debe ser al menos 1')
+        if max_wait_ms < 0:
+            raise ValueError('La espera máxima no puede ser negativa')
+
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait = float(max_wait_ms) / 1000.0
+        self.max_queue = int(max_queue)
+        self._predict = predict or _predict_rows
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+        self._waiting = 0
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+        self.overflows = 0
+        self.errors = 0
+        self._queue_wait = 0.0
+
+    def _ensure_worker(self):
+        # El hilo se crea en el primer uso y de nuevo tras un fork
+        if self._worker is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker is None or self._pid != os.getpid():
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue(maxsize=self.max_queue)
+                    self._waiting = 0
+                self._pid = os.getpid()
+                self._worker = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+                self._worker.start()
+
+    def predict(self, bundle, row):
+        """
+        Predice una fila esperando a que salga en el siguiente lote
+
+        Args:
+            bundle (ModelBundle): Bundle con el que se calcula la predicción
+            row (np.ndarray): Fila 1×10 (o de 10 posiciones) preprocesada
+
+        Returns:
+            dict: Resultado con la misma estructura que predict_performance
+        """
+        self._ensure_worker()
+        pending = _Pending(bundle, np.asarray(row, dtype=np.float64).reshape(N_FEATURES))
+
+        with self._lock:
+            self._waiting += 1
+        try:
+            try:
+                self._queue.put_nowait(pending)
+            except queue.Full:
+                with self._lock:
+                    self.overflows += 1
+                return self._predict(bundle, pending.row.reshape(1, N_FEATURES))[0]
+
+            pending.done.wait()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect(self):
+        """Espera la primera fila y reúne el resto del lote"""
+        batch = [self._queue.get()]
+        deadline = batch[0].queued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            # Todas las peticiones en espera ya están en el lote: no tiene sentido esperar
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or len(batch) >= self._waiting:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            self._flush(self._collect())
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+
+        # Una recarga puede dejar filas de dos bundles en el mismo lote
+        groups = {}
+        for pending in batch:
+            groups.setdefault(id(pending.bundle), []).append(pending)
+
+        for group in groups.values():
+            matrix = np.empty((len(group), N_FEATURES), dtype=np.float64)
+            for i, pending in enumerate(group):
+                matrix[i] = pending.row
+            try:
+                results = self._predict(group[0].bundle, matrix)
+                for pending, result in zip(group, results):
+                    pending.result = result
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                for pending in group:
+                    pending.error = e
+
+        queue_wait = sum(started - pending.queued_at for pending in batch)
+        with self._lock:
+            self.batches += 1
+            self.rows += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self._queue_wait += queue_wait
+
+        for pending in batch:
+            pending.done.set()
+
+    def stats(self):
+        """Configuración y contadores del micro-batching"""
+        with self._lock:
+            return {
+                'habilitado': True,
+                'tamano_maximo': self.max_batch_size,
+                'espera_maxima_ms': self.max_wait * 1000.0,
+                'profundidad_maxima': self.max_queue,
+                'profundidad_cola': self._queue.qsize(),
+                'en_espera': self._waiting,
+                'lotes': self.batches,
+                'filas': self.rows,
+                'tamano_medio': self.rows / self.batches if self.batches else 0.0,
+                'tamano_mayor': self.largest_batch,
+                'espera_media_ms': self._queue_wait / self.rows * 1000.0 if self.rows else 0.0,
+                'desbordes': self.overflows,
+                'errores': self.errors
+            }
@@ -0,0 +1,155 @@
+"""
+Caché LRU de predicciones en memoria.
+
+La clave es la fila de características ya validada, con redondeo configurable
+para las columnas continuas. Cada entrada pertenece al modelo con el que se
+calculó: si el modelo activo cambia, la caché se vacía sola antes de responder.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .features import FEATURE_INDEX
+
+# Columnas continuas que admiten redondeo antes de formar la clave
+ROUNDABLE_COLUMNS = ('Horas_Estudio', 'Actividades_Extra', 'Asistencia')
+
+def parse_rounding(text):
+    """
+    Interpreta una configuración de redondeo del tipo 'Horas_Estudio:1,Asistencia:0'
+
+    Args:
+        text (str): Pares columna:decimales separados por comas
+
+    Returns:
+        dict: Decimales por columna
+    """
+    rounding = {}
+    for item in (text or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        column, _, decimals = item.partition(':')
+        rounding[column.strip()] = int(decimals)
+    return rounding
+
+class PredictionCache:
+    """
+    Caché LRU acotada de resultados de predicción
+
+    Args:
+        max_size (int): Número máximo de entradas; 0 desactiva la caché
+        rounding (dict, optional): Decimales por columna continua, por ejemplo
+            {'Horas_Estudio': 1, 'Asistencia': 0}
+    """
+
+    def __init__(self, max_size=10000, rounding=None):
+        rounding = rounding or {}
+        for column in rounding:
+            if column not in ROUNDABLE_COLUMNS:
+                raise ValueError(f'No se puede redondear la columna {column}')
+
+        self.max_size = int(max_size)
+        self.rounding = [(FEATURE_INDEX[column], int(decimals)) for column, decimals in rounding.items()]
+        self._entries = OrderedDict()
+        self._owner = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def normalize(self, data):
+        """
+        Redondea en el lugar las columnas configuradas de una fila o matriz
+
+        La predicción se calcula sobre los mismos valores redondeados que forman
+        la clave, de modo que una entrada en caché coincide siempre con lo que
+        se habría calculado.
+
+        Args:
+            data (np.ndarray): Fila 1×10 o matriz N×10 preprocesada
+
+        Returns:
+            np.ndarray: El mismo array, redondeado
+        """
+        for index, decimals in self.rounding:
+            column = data[..., index]
+            np.round(column, decimals, out=column)
+        return data
+
+    def make_keys(self, data):
+        """Devuelve la clave de cada fila de una matriz N×10 ya normalizada"""
+        return [tuple(row) for row in np.atleast_2d(data).tolist()]
+
+    def _check_owner(self, owner):
+        # Llamar con el lock tomado
+        if owner is not self._owner:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._owner = owner
+
+    def get(self, key, owner):
+        """
+        Busca un resultado en la caché
+
+        Args:
+            key (tuple): Clave devuelta por make_keys
+            owner: Modelo activo; si no es el que llenó la caché, esta se vacía
+
+        Returns:
+            dict | None: Resultado guardado (no debe modificarse) o None
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._check_owner(owner)
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result, owner):
+        """Guarda un resultado calculado con el modelo `owner`"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._check_owner(owner)
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Vacía la caché (por ejemplo, al recargar el modelo)"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._owner = None
+
+    def stats(self):
+        """Contadores de uso de la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'habilitada': self.enabled,
+                'entradas': len(self._entries),
+                'capacidad': self.max_size,
+                'aciertos': self.hits,
+                'fallos': self.misses,
+                'desalojos': self.evictions,
+                'invalidaciones': self.invalidations,
+                'tasa_aciertos': self.hits / lookups if lookups else 0.0
+            }
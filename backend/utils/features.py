@@ -0,0 +1,82 @@
+"""
+Esquema de las características del modelo.
+
+FEATURE_SCHEMA es la única fuente de verdad sobre las 10 variables: nombre del
+campo en el formulario, columna del modelo, tipo, rango válido y mapeo del
+género. El orden de la lista es el orden de columnas con el que se entrenó el
+modelo; cada estudiante se representa como una fila float64 en ese orden.
+"""
+
+# Mapeo de género
+GENERO_MAP = {'M': 0, 'F': 1}
+
+# Tipos de campo: 'categorico' (mapeo de texto), 'entero', 'real' y 'binario'
+FEATURE_SCHEMA = [
+    {'campo': 'genero', 'columna': 'Genero', 'nombre': 'Género',
+     'tipo': 'categorico', 'valores': GENERO_MAP},
+    {'campo': 'apoyo_familiar', 'columna': 'Apoyo_Familiar', 'nombre': 'Apoyo Familiar',
+     'tipo': 'entero', 'rango': (1, 5)},
+    {'campo': 'ingresos_familiares', 'columna': 'Ingresos_Familiares', 'nombre': 'Ingresos Familiares',
+     'tipo': 'entero', 'rango': (1, 5)},
+    {'campo': 'horas_estudio', 'columna': 'Horas_Estudio', 'nombre': 'Horas de Estudio',
+     'tipo': 'real', 'rango': (0, 168)},
+    {'campo': 'actividades_extra', 'columna': 'Actividades_Extra', 'nombre': 'Actividades Extracurriculares',
+     'tipo': 'real', 'rango': (0, 40)},
+    {'campo': 'nivel_educativo_padres', 'columna': 'Nivel_Educativo_Padres', 'nombre': 'Nivel Educativo Padres',
+     'tipo': 'entero', 'rango': (1, 5)},
+    {'campo': 'acceso_internet', 'columna': 'Acceso_Internet', 'nombre': 'Acceso a Internet',
+     'tipo': 'binario', 'rango': (0, 1)},
+    {'campo': 'clima_familiar', 'columna': 'Clima_Familiar', 'nombre': 'Clima Familiar',
+     'tipo': 'entero', 'rango': (1, 5)},
+    {'campo': 'asistencia', 'columna': 'Asistencia', 'nombre': 'Asistencia',
+     'tipo': 'real', 'rango': (0, 100), 'unidad': '%'},
+    {'campo': 'motivacion', 'columna': 'Motivacion', 'nombre': 'Motivación',
+     'tipo': 'entero', 'rango': (1, 5)},
+]
+
+# Orden de columnas con el que se entrenó el modelo
+FEATURE_COLUMNS = [spec['columna'] for spec in FEATURE_SCHEMA]
+
+# Campos del formulario en el mismo orden que FEATURE_COLUMNS
+REQUIRED_FIELDS = [spec['campo'] for spec in FEATURE_SCHEMA]
+
+N_FEATURES = len(FEATURE_SCHEMA)
+
+# Posición de cada característica dentro de la fila
+(
+    GENERO,
+    APOYO_FAMILIAR,
+    INGRESOS_FAMILIARES,
+    HORAS_ESTUDIO,
+    ACTIVIDADES_EXTRA,
+    NIVEL_EDUCATIVO_PADRES,
+    ACCESO_INTERNET,
+    CLIMA_FAMILIAR,
+    ASISTENCIA,
+    MOTIVACION,
+) = range(N_FEATURES)
+
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_COLUMNS)}
+
+# Índices de clase del modelo (0=Bajo, 1=Medio, 2=Alto)
+CLASS_NAMES = ['Bajo', 'Medio', 'Alto']
+
+def describe_features():
+    """
+    Describe las variables del modelo para mostrarlas en la API
+
+    Returns:
+        list: Nombre, tipo y rango o valores permitidos de cada variable
+    """
+    tipos = {'categorico': 'Categórico', 'entero': 'Numérico', 'real': 'Numérico', 'binario': 'Binario'}
+    variables = []
+    for spec in FEATURE_SCHEMA:
+        variable = {'nombre': spec['nombre'], 'tipo': tipos[spec['tipo']]}
+        if spec['tipo'] == 'categorico':
+            variable['valores'] = list(spec['valores'])
+        elif spec['tipo'] == 'binario':
+            variable['valores'] = list(range(spec['rango'][0], spec['rango'][1] + 1))
+        else:
+            variable['rango'] = f"{spec['rango'][0]}-{spec['rango'][1]}{spec.get('unidad', '')}"
+        variables.append(variable)
+    return variables
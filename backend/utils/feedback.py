@@ -0,0 +1,339 @@
+"""
+Retroalimentación con la clase real de estudiantes ya puntuados.
+
+Cuando termina el periodo se conoce el rendimiento real de cada estudiante.
+/api/feedback valida esas observaciones y las agrega a un archivo JSONL
+(FeedbackBuffer) que solo crece. La petición no espera a ningún
+entrenamiento: cada línea se escribe con una sola llamada a os.write en modo
+O_APPEND, así que varios workers pueden escribir en el mismo archivo sin
+mezclar líneas.
+
+FeedbackUpdater corre en un hilo de fondo. Cada cierto tiempo lee las
+observaciones pendientes y ajusta los pesos de una copia del modelo activo
+con unas pocas épocas de IncrementalSoftmax. Después compara la copia con el
+modelo activo sobre la parte reservada de esas observaciones. Si la copia no
+empeora, se escriben los archivos del modelo nuevo y el registro publica una
+versión nueva, como haría una recarga. En ambos casos el cursor avanza: las
+observaciones no se vuelven a aplicar, pero siguen en el archivo para el
+siguiente reentrenamiento completo.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from .features import CLASS_NAMES, N_FEATURES
+from .incremental import IncrementalSoftmax, holdout_mask
+from .logs import get_logger, fields
+
+log = get_logger('retroalimentacion')
+
+# La clase puede venir como índice (0, 1, 2) o como nombre ('Bajo', 'Medio', 'Alto')
+_CLASS_CODES = {name.lower(): i for i, name in enumerate(CLASS_NAMES)}
+
+def parse_label(value):
+    """
+    Convierte la clase observada a su índice
+
+    Returns:
+        int | None: 0 (Bajo), 1 (Medio), 2 (Alto), o None si no es válida
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value if 0 <= value < len(CLASS_NAMES) else None
+    if isinstance(value, str):
+        return _CLASS_CODES.get(value.strip().lower())
+    return None
+
+class FeedbackBuffer:
+    """
+    Archivo JSONL de observaciones etiquetadas con un cursor de lo ya aplicado
+
+    Args:
+        path (str): Ruta del archivo (el cursor se guarda en path + '.cursor')
+        fsync (bool): Forzar cada escritura a disco antes de responder
+    """
+
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.cursor_path = f'{path}.cursor'
+        self.fsync = fsync
+
+    def append(self, matrix, labels, ids=None):
+        """
+        Agrega observaciones validadas
+
+        Args:
+            matrix (np.ndarray): Filas N×10 ya preprocesadas
+            labels (list): Clase observada de cada fila (0, 1 o 2)
+            ids (list, optional): Identificador del estudiante de cada fila
+
+        Returns:
+            int: Observaciones escritas
+        """
+        received = time.strftime('%Y-%m-%dT%H:%M:%S')
+        lines = []
+        for i, (row, label) in enumerate(zip(matrix.tolist(), labels)):
+            entry = {'fila': row, 'clase': int(label), 'recibido_en': received}
+            if ids is not None and ids[i] is not None:
+                entry['id'] = ids[i]
+            lines.append(json.dumps(entry, ensure_ascii=False, separators=(',', ':')))
+        if not lines:
+            return 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            # Una sola escritura por petición, para que las líneas de dos
+            # workers no se intercalen
+            os.write(fd, data)
+            if self.fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        return len(lines)
+
+    def offset(self):
+        """Byte del archivo hasta el que ya se aplicaron las observaciones"""
+        try:
+            with open(self.cursor_path, encoding='utf-8') as f:
+                return int(json.load(f)['offset'])
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def pending_bytes(self):
+        try:
+            return max(os.path.getsize(self.path) - self.offset(), 0)
+        except OSError:
+            return 0
+
+    def read_pending(self, max_rows=None):
+        """
+        Lee las observaciones que aún no se aplicaron
+
+        Una línea sin salto final (escritura en curso) se deja para la próxima
+        lectura.
+
+        Args:
+            max_rows (int, optional): Máximo de observaciones a leer
+
+        Returns:
+            tuple: (matriz N×10, clases, posición de cada línea en el archivo,
+                    byte donde termina lo leído)
+        """
+        start = self.offset()
+        rows, labels, positions = [], [], []
+        end = start
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return np.empty((0, N_FEATURES)), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), start
+        with f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b'\n') or (max_rows is not None and len(rows) >= max_rows):
+                    break
+                try:
+                    entry = json.loads(line)
+                    row, label = entry['fila'], int(entry['clase'])
+                except (ValueError, KeyError, TypeError):
+                    row = None
+                if row is not None and len(row) == N_FEATURES and 0 <= label < len(CLASS_NAMES):
+                    rows.append(row)
+                    labels.append(label)
+                    positions.append(end)
+                end += len(line)
+        matrix = np.array(rows, dtype=np.float64).reshape(-1, N_FEATURES)
+        return matrix, np.array(labels, dtype=np.int64), np.array(positions, dtype=np.int64), end
+
+    def commit(self, offset, **info):
+        """Guarda el cursor de forma atómica"""
+        tmp_path = f'{self.cursor_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(info, offset=offset), f, ensure_ascii=False)
+        os.replace(tmp_path, self.cursor_path)
+
+class FeedbackUpdater:
+    """
+    Aplica las observaciones pendientes a una copia del modelo y la publica si pasa la reserva
+
+    Args:
+        buffer (FeedbackBuffer): Observaciones etiquetadas
+        registry (ModelRegistry): Registro que carga la versión publicada
+        model_path (str): modelo_rl.pkl que se reemplaza (y del que se parte si el
+            bundle activo no conserva el modelo)
+        scaler_path (str): scaler.pkl; se reescribe con el escalado del modelo activo, que no cambia
+        artifact_path (str, optional): modelo_rl.bin que se regenera
+        metadata_path (str, optional): modelo_rl.json donde se anota la actualización
+        min_rows (int): Observaciones pendientes necesarias para intentar una actualización
+        max_rows (int): Observaciones aplicadas como máximo por actualización
+        holdout_fraction (float): Fracción reservada para comparar copia y modelo activo
+        learning_rate (float): Paso de Adam (pequeño: se ajusta un modelo ya entrenado)
+        epochs (int): Pasadas sobre las observaciones de cada actualización
+        max_degradation (float): Pérdida de precisión en la reserva que se tolera
+    """
+
+    def __init__(self, buffer, registry, model_path, scaler_path, artifact_path=None, metadata_path=None,
+                 min_rows=200, max_rows=100000, holdout_fraction=0.2, learning_rate=0.01, epochs=3,
+                 max_degradation=0.0):
+        self.buffer = buffer
+        self.registry = registry
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.artifact_path = artifact_path
+        self.metadata_path = metadata_path
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.holdout_fraction = holdout_fraction
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.max_degradation = max_degradation
+        self.last_result = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def run_once(self):
+        """
+        Intenta una actualización con las observaciones pendientes
+
+        Returns:
+            dict: Resultado ('estado' es 'en_curso', 'insuficientes',
+                  'publicada', 'rechazada' o 'error')
+        """
+        if not self._lock.acquire(blocking=False):
+            return {'estado': 'en_curso'}
+        try:
+            result = self._update()
+        except Exception as e:
+            result = {'estado': 'error', 'detalle': f'{type(e).__name__}: {e}'}
+            log.error("❌ Falló la actualización con retroalimentación", extra=fields(detalle=result['detalle']))
+        finally:
+            self._lock.release()
+        if result['estado'] != 'insuficientes':
+            result['fecha'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self.last_result = result
+        return result
+
+    def _active_model(self):
+        """
+        Modelo y scaler de la versión que se está sirviendo
+
+        Se toman del bundle activo (también si se cargó del artefacto) para
+        ajustar y comparar contra lo que responde la API. Solo si el bundle no
+        los conserva se leen los pickles.
+
+        Returns:
+            tuple: (versión, LogisticRegression, MinMaxScaler)
+        """
+        bundle = self.registry.current
+        if bundle is not None:
+            if bundle.model is not None and bundle.scaler is not None:
+                return bundle.version, bundle.model, bundle.scaler
+            if bundle.fused is not None and bundle.fused.unfused is not None:
+                return (bundle.version,) + bundle.fused.unfuse()
+
+        import joblib
+
+        return bundle.version if bundle is not None else None, joblib.load(self.model_path), joblib.load(self.scaler_path)
+
+    def _update(self):
+        matrix, labels, positions, end = self.buffer.read_pending(self.max_rows)
+        if len(labels) < self.min_rows:
+            return {'estado': 'insuficientes', 'pendientes': len(labels), 'minimo': self.min_rows}
+
+        reserved = holdout_mask(positions, self.holdout_fraction)
+        if reserved.all() or not reserved.any():
+            return {'estado': 'insuficientes', 'pendientes': len(labels), 'minimo': self.min_rows}
+
+        version, model, scaler = self._active_model()
+        scaled = scaler.transform(matrix)
+
+        current = IncrementalSoftmax.from_model(model)
+        candidate = IncrementalSoftmax.from_model(model, learning_rate=self.learning_rate,
+                                                  batch_size=min(256, int((~reserved).sum())), seed=0)
+        for _ in range(self.epochs):
+            candidate.partial_fit(scaled[~reserved], labels[~reserved])
+            candidate.end_epoch()
+
+        n_reserved = int(reserved.sum())
+        before = current.evaluate(scaled[reserved], labels[reserved])[0] / n_reserved
+        after = candidate.evaluate(scaled[reserved], labels[reserved])[0] / n_reserved
+        result = {
+            'observaciones': len(labels),
+            'reservadas': n_reserved,
+            'precision_reserva_antes': round(before, 4),
+            'precision_reserva_despues': round(after, 4),
+            'version_base': version
+        }
+
+        if after + self.max_degradation < before:
+            self.buffer.commit(end, resultado='rechazada', fecha=time.strftime('%Y-%m-%dT%H:%M:%S'))
+            log.warning("⚠️  Actualización rechazada: la copia empeora en la reserva", extra=fields(**result))
+            return dict(result, estado='rechazada')
+
+        self._publish(candidate.to_sklearn(), scaler, result)
+        self.buffer.commit(end, resultado='publicada', fecha=time.strftime('%Y-%m-%dT%H:%M:%S'))
+        bundle = self.registry.load(force=False)
+        result['version_nueva'] = bundle.version
+        log.info("✅ Modelo actualizado con retroalimentación", extra=fields(**result))
+        return dict(result, estado='publicada')
+
+    def _publish(self, model, scaler, result):
+        """Escribe el modelo actualizado con os.replace, igual que el entrenamiento"""
+        import joblib
+
+        from .artifact import save_artifact
+        from .metadata import load_metadata, save_metadata
+
+        # El scaler también se escribe: si el modelo activo salió del artefacto,
+        # los pickles en disco pueden no existir o ser de otra versión
+        for path, artifact in ((self.scaler_path, scaler), (self.model_path, model)):
+            if os.path.exists(path):
+                shutil.copy2(path, os.path.splitext(path)[0] + '_old.pkl')
+            joblib.dump(artifact, f'{path}.tmp')
+            os.replace(f'{path}.tmp', path)
+        if self.artifact_path:
+            save_artifact(self.artifact_path, model, scaler)
+
+        if self.metadata_path:
+            metadata = load_metadata(self.metadata_path)
+            metrics = dict(metadata.pop('metricas', {}), precision_retroalimentacion=result['precision_reserva_despues'])
+            metadata.pop('entrenado_en', None)
+            updates = metadata.pop('actualizaciones', [])[-19:]
+            updates.append(dict(
+                {key: value for key, value in result.items() if key != 'version_base'},
+                fecha=time.strftime('%Y-%m-%dT%H:%M:%S')
+            ))
+            files = [self.model_path, self.scaler_path] + ([self.artifact_path] if self.artifact_path else [])
+            save_metadata(self.metadata_path, metrics, files=files, actualizaciones=updates, **metadata)
+
+    def start(self, interval):
+        """Revisa las observaciones pendientes cada `interval` segundos en un hilo de fondo"""
+        if self._thread is not None:
+            return self._thread
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.run_once()
+
+        self._thread = threading.Thread(target=loop, name='feedback-updater', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        """Estado para /api/health"""
+        return {
+            'habilitado': self._thread is not None and not self._stop.is_set(),
+            'bytes_pendientes': self.buffer.pending_bytes(),
+            'ultima_actualizacion': self.last_result
+        }
@@ -0,0 +1,183 @@
+"""
+Regresión logística multinomial entrenada por bloques.
+
+IncrementalSoftmax ajusta el mismo modelo que LogisticRegression(lbfgs)
+(softmax sobre W·x + b con penalización L2) pero con descenso por
+mini-lotes y Adam, de modo que los datos pueden llegar bloque a bloque desde
+disco sin tenerlos nunca todos en memoria. El estado del optimizador vive en
+el objeto: cada partial_fit() continúa donde quedó el anterior.
+
+Al terminar, to_sklearn() devuelve un LogisticRegression con los pesos
+aprendidos, que se guarda como modelo_rl.pkl y se exporta al artefacto
+binario igual que el modelo del entrenamiento completo.
+"""
+
+import numpy as np
+
+# Constantes de Adam (las habituales)
+_BETA1 = 0.9
+_BETA2 = 0.999
+_EPSILON = 1e-8
+
+def _softmax(logits):
+    """Softmax por filas, en el mismo arreglo"""
+    logits -= logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+def holdout_mask(rows, fraction):
+    """
+    Filas reservadas para evaluación
+
+    Se usa un hash multiplicativo del identificador de cada fila (su número de
+    fila o su posición en un archivo). Así la partición es estable entre
+    ejecuciones y no depende de cómo se agrupen las filas en bloques.
+
+    Args:
+        rows (np.ndarray): Identificador entero de cada fila
+        fraction (float): Fracción aproximada de filas reservadas
+
+    Returns:
+        np.ndarray: Máscara booleana
+    """
+    hashed = (np.asarray(rows).astype(np.uint64) * np.uint64(2654435761)) & np.uint64(0xFFFFFFFF)
+    return hashed < np.uint64(int(fraction * 2 ** 32))
+
+class IncrementalSoftmax:
+    """
+    Regresión logística multinomial con actualizaciones por mini-lotes
+
+    Args:
+        n_features (int): Número de características
+        classes (array-like): Clases enteras en orden (p. ej. [0, 1, 2])
+        learning_rate (float): Paso inicial de Adam; decae como 1/sqrt(1 + época)
+        batch_size (int): Filas por actualización
+        alpha (float): Penalización L2 por fila; 1 / (C · n) equivale a
+            LogisticRegression(C=C) entrenado con n filas
+        seed (int, optional): Semilla para barajar cada bloque
+    """
+
+    def __init__(self, n_features, classes, learning_rate=0.2, batch_size=1024, alpha=0.0, seed=None):
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = n_features
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size
+        self.alpha = alpha
+        self.coef_ = np.zeros((len(self.classes_), n_features))
+        self.intercept_ = np.zeros(len(self.classes_))
+        self.epochs_ = 0
+        self.steps_ = 0
+        self.rows_seen_ = 0
+        self._rng = np.random.default_rng(seed)
+        self._moments = [np.zeros_like(self.coef_), np.zeros_like(self.coef_),
+                         np.zeros_like(self.intercept_), np.zeros_like(self.intercept_)]
+
+    @classmethod
+    def from_model(cls, model, **kwargs):
+        """
+        Parte de los pesos de un LogisticRegression ya entrenado
+
+        Args:
+            model: LogisticRegression multinomial (coef_ de forma clases × características)
+            **kwargs: Parámetros de IncrementalSoftmax
+
+        Returns:
+            IncrementalSoftmax: Modelo con coef_ e intercept_ copiados
+        """
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.shape[0] != len(model.classes_):
+            raise ValueError('Solo se pueden continuar modelos multinomiales (una fila de coeficientes por clase)')
+        incremental = cls(coef.shape[1], model.classes_, **kwargs)
+        incremental.coef_[:] = coef
+        incremental.intercept_[:] = model.intercept_
+        return incremental
+
+    def _class_indices(self, y):
+        indices = np.searchsorted(self.classes_, y)
+        if np.any(indices >= len(self.classes_)) or np.any(self.classes_[np.minimum(indices, len(self.classes_) - 1)] != y):
+            raise ValueError(f'Etiquetas fuera de las clases del modelo {self.classes_.tolist()}')
+        return indices
+
+    def partial_fit(self, X, y):
+        """
+        Recorre un bloque en mini-lotes barajados y actualiza los pesos
+
+        Args:
+            X (np.ndarray): Bloque N×características ya escalado
+            y (np.ndarray): Clase de cada fila
+
+        Returns:
+            float: Log-loss media del bloque (antes de cada actualización)
+        """
+        targets = self._class_indices(np.asarray(y))
+        order = self._rng.permutation(len(targets))
+        step_size = self.learning_rate / np.sqrt(1.0 + self.epochs_)
+        m_coef, v_coef, m_bias, v_bias = self._moments
+        total_loss = 0.0
+
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            xb, tb = X[batch], targets[batch]
+            rows = np.arange(len(tb))
+
+            probabilities = _softmax(xb @ self.coef_.T + self.intercept_)
+            total_loss -= np.log(np.maximum(probabilities[rows, tb], 1e-15)).sum()
+
+            # Gradiente de la entropía cruzada media: (P - Y) / n
+            probabilities[rows, tb] -= 1.0
+            probabilities /= len(tb)
+            grad_coef = probabilities.T @ xb + self.alpha * self.coef_
+            grad_bias = probabilities.sum(axis=0)
+
+            self.steps_ += 1
+            correction1 = 1.0 - _BETA1 ** self.steps_
+            correction2 = 1.0 - _BETA2 ** self.steps_
+            for param, grad, m, v in ((self.coef_, grad_coef, m_coef, v_coef),
+                                      (self.intercept_, grad_bias, m_bias, v_bias)):
+                m *= _BETA1
+                m += (1.0 - _BETA1) * grad
+                v *= _BETA2
+                v += (1.0 - _BETA2) * grad * grad
+                param -= step_size * (m / correction1) / (np.sqrt(v / correction2) + _EPSILON)
+
+        self.rows_seen_ += len(targets)
+        return total_loss / max(len(targets), 1)
+
+    def end_epoch(self):
+        """Marca el fin de una pasada completa (reduce el paso de las siguientes)"""
+        self.epochs_ += 1
+
+    def predict_proba(self, X):
+        """Probabilidades de cada clase"""
+        return _softmax(X @ self.coef_.T + self.intercept_)
+
+    def evaluate(self, X, y):
+        """
+        Aciertos y log-loss de un bloque, para acumular sobre varios bloques
+
+        Returns:
+            tuple: (aciertos, suma de log-loss)
+        """
+        targets = self._class_indices(np.asarray(y))
+        probabilities = self.predict_proba(X)
+        hits = int((probabilities.argmax(axis=1) == targets).sum())
+        loss = float(-np.log(np.maximum(probabilities[np.arange(len(targets)), targets], 1e-15)).sum())
+        return hits, loss
+
+    def to_sklearn(self):
+        """
+        LogisticRegression equivalente, listo para joblib.dump y save_artifact
+
+        Returns:
+            LogisticRegression: Con coef_, intercept_ y classes_ de este modelo
+        """
+        from sklearn.linear_model import LogisticRegression
+
+        model = LogisticRegression(max_iter=1000)
+        model.coef_ = self.coef_.copy()
+        model.intercept_ = self.intercept_.copy()
+        model.classes_ = self.classes_.copy()
+        model.n_features_in_ = self.n_features_in_
+        model.n_iter_ = np.array([self.steps_], dtype=np.int32)
+        return model
@@ -0,0 +1,262 @@
+import os
+
+import numpy as np
+
+class FusedLogisticModel:
+    """
+    Modelo de inferencia que combina el MinMaxScaler y la Regresión Logística
+    en una sola transformación afín, sin pasar por scikit-learn.
+
+    El scaler calcula x * scale_ + min_, y el modelo calcula z @ coef_.T + intercept_.
+    Ambos pasos se pliegan al cargar en:
+
+        W = coef_ * scale_
+        b = coef_ @ min_ + intercept_
+
+    de modo que cada predicción es una multiplicación de matrices más un softmax
+    sobre los datos sin normalizar.
+
+    Para desglosar los logits por característica se conservan además
+    offsets_t = (min_ · coef_).T y el intercepto original: el aporte de la
+    columna j a la clase k es x_j · W[k, j] + offsets_t[j, k], que es
+    exactamente coef_[k, j] por el valor escalado de la columna.
+    """
+
+    def __init__(self, weights, bias, classes, multinomial=True, offsets=None, intercept=None):
+        self.weights_t = np.ascontiguousarray(np.asarray(weights, dtype=np.float64).T)
+        self.bias = np.asarray(bias, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.multinomial = multinomial
+        self.n_features_in_ = self.weights_t.shape[0]
+        self._set_offsets(offsets, intercept)
+        self.unfused = None
+
+    def _set_offsets(self, offsets, intercept):
+        # Sin los términos originales el sesgo completo queda como intercepto
+        if offsets is None:
+            self.offsets_t = np.zeros_like(self.weights_t)
+            self.intercept_ = self.bias
+        else:
+            self.offsets_t = np.ascontiguousarray(np.asarray(offsets, dtype=np.float64).T)
+            self.intercept_ = np.asarray(intercept, dtype=np.float64)
+
+    @classmethod
+    def from_arrays(cls, weights_t, bias, classes, multinomial=True, offsets_t=None, intercept=None):
+        """
+        Construye el modelo sobre arreglos ya fusionados sin copiarlos
+
+        Se usa con el artefacto mapeado en memoria: los pesos siguen siendo
+        vistas de solo lectura compartidas entre procesos.
+
+        Args:
+            weights_t (np.ndarray): Pesos fusionados F×C (ya transpuestos)
+            bias (np.ndarray): Sesgo fusionado de cada salida
+            classes (np.ndarray): Etiquetas de las clases
+            multinomial (bool): Softmax (True) o sigmoide de una sola salida
+            offsets_t (np.ndarray, optional): Aporte constante F×C de cada columna
+                (min_ · coef_ transpuesto), para contributions()
+            intercept (np.ndarray, optional): Intercepto original del modelo
+
+        Returns:
+            FusedLogisticModel: Modelo que comparte la memoria de los arreglos
+        """
+        fused = cls.__new__(cls)
+        fused.weights_t = weights_t
+        fused.bias = bias
+        fused.classes_ = classes
+        fused.multinomial = multinomial
+        fused.n_features_in_ = weights_t.shape[0]
+        fused._set_offsets(None if offsets_t is None else offsets_t.T, intercept)
+        fused.unfused = None
+        return fused
+
+    @classmethod
+    def from_sklearn(cls, model, scaler):
+        """
+        Construye el modelo fusionado a partir del modelo y scaler entrenados
+
+        Args:
+            model: LogisticRegression entrenada
+            scaler: MinMaxScaler entrenado
+
+        Returns:
+            FusedLogisticModel: Modelo equivalente al par (scaler, model)
+        """
+        if getattr(scaler, 'clip', False):
+            raise ValueError('No se puede fusionar un MinMaxScaler con clip=True')
+
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        intercept = np.asarray(model.intercept_, dtype=np.float64)
+        scale = np.asarray(scaler.scale_, dtype=np.float64)
+        offset = np.asarray(scaler.min_, dtype=np.float64)
+
+        if coef.shape[1] != scale.shape[0]:
+            raise ValueError(
+                f'El modelo espera {coef.shape[1]} características y el scaler {scale.shape[0]}'
+            )
+
+        # Con dos clases sklearn guarda un solo vector de coeficientes (sigmoide)
+        multinomial = coef.shape[0] > 1
+
+        fused = cls(
+            weights=coef * scale,
+            bias=coef @ offset + intercept,
+            classes=model.classes_,
+            multinomial=multinomial,
+            offsets=coef * offset,
+            intercept=intercept
+        )
+        fused.unfused = {'coef': coef, 'intercept': intercept, 'scale': scale, 'min': offset}
+        return fused
+
+    def unfuse(self):
+        """
+        Reconstruye el LogisticRegression y el MinMaxScaler de los que sale el modelo
+
+        Sirve para seguir entrenando la versión que se está sirviendo aunque se
+        haya cargado desde el artefacto binario.
+
+        Returns:
+            tuple: (LogisticRegression, MinMaxScaler)
+
+        Raises:
+            ValueError: Si el modelo no conserva los arreglos sin fusionar
+        """
+        if self.unfused is None:
+            raise ValueError('El modelo fusionado no conserva los coeficientes ni el escalado originales')
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import MinMaxScaler
+
+        coef = np.array(self.unfused['coef'], dtype=np.float64)
+        scale = np.array(self.unfused['scale'], dtype=np.float64)
+        offset = np.array(self.unfused['min'], dtype=np.float64)
+
+        model = LogisticRegression(max_iter=1000)
+        model.coef_ = coef
+        model.intercept_ = np.array(self.unfused['intercept'], dtype=np.float64)
+        model.classes_ = np.array(self.classes_)
+        model.n_features_in_ = coef.shape[1]
+
+        # Con feature_range (0, 1): scale_ = 1 / rango y min_ = -data_min_ * scale_
+        scaler = MinMaxScaler()
+        scaler.scale_ = scale
+        scaler.min_ = offset
+        scaler.data_min_ = -offset / scale
+        scaler.data_range_ = 1.0 / scale
+        scaler.data_max_ = scaler.data_min_ + scaler.data_range_
+        scaler.n_features_in_ = scale.shape[0]
+        scaler.n_samples_seen_ = 0
+        return model, scaler
+
+    def decision_function(self, data):
+        """Calcula los logits de cada clase para una matriz N×F sin normalizar"""
+        return np.asarray(data, dtype=np.float64) @ self.weights_t + self.bias
+
+    def contributions(self, data):
+        """
+        Desglosa los logits de cada fila en el aporte de cada característica
+
+        Args:
+            data (np.ndarray): Matriz N×F sin normalizar
+
+        Returns:
+            tuple: (aportes N×F×C, intercepto de cada salida); la suma de los
+                   aportes de una fila más el intercepto da decision_function
+        """
+        data = np.asarray(data, dtype=np.float64)
+        return data[:, :, None] * self.weights_t + self.offsets_t, self.intercept_
+
+    def predict_proba(self, data):
+        """Calcula las probabilidades de cada clase (softmax de los logits)"""
+        logits = self.decision_function(data)
+
+        if not self.multinomial:
+            positive = 1.0 / (1.0 + np.exp(-logits[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+        return logits
+
+    def predict(self, data):
+        """Devuelve la clase de mayor probabilidad de cada fila"""
+        return self.classes_[self.predict_proba(data).argmax(axis=1)]
+
+def verify_fused_model(fused, model, scaler, atol=1e-9):
+    """
+    Comprueba que el modelo fusionado reproduce el resultado de sklearn
+
+    Se evalúan las esquinas del rango visto por el scaler y puntos intermedios.
+
+    Args:
+        fused (FusedLogisticModel): Modelo fusionado
+        model: LogisticRegression original
+        scaler: MinMaxScaler original
+        atol (float): Tolerancia absoluta en las probabilidades
+
+    Returns:
+        bool: True si ambas rutas producen las mismas probabilidades y clases
+    """
+    low = np.asarray(scaler.data_min_, dtype=np.float64)
+    high = np.asarray(scaler.data_max_, dtype=np.float64)
+    steps = np.linspace(0.0, 1.0, 5)[:, None]
+    probe = low + steps * (high - low)
+
+    expected = model.predict_proba(scaler.transform(probe))
+    obtained = fused.predict_proba(probe)
+
+    return bool(
+        np.allclose(expected, obtained, rtol=0.0, atol=atol)
+        and np.array_equal(expected.argmax(axis=1), obtained.argmax(axis=1))
+    )
+
+def fuse_model(model, scaler):
+    """
+    Intenta fusionar el scaler y el modelo, verificando el resultado
+
+    Args:
+        model: LogisticRegression entrenada
+        scaler: MinMaxScaler entrenado
+
+    Returns:
+        tuple: (FusedLogisticModel | None, str | None) - (modelo fusionado,
+               motivo por el que no se pudo fusionar)
+    """
+    try:
+        fused = FusedLogisticModel.from_sklearn(model, scaler)
+    except (AttributeError, ValueError) as e:
+        return None, f'No se pudo fusionar el modelo: {e}'
+    if not verify_fused_model(fused, model, scaler):
+        return None, 'El modelo fusionado no coincide con sklearn'
+    return fused, None
+
+def load_inference_pair(model_path, scaler_path, use_sklearn=False, artifact_path=None):
+    """
+    Carga los artefactos del modelo y devuelve el par listo para predict_batch
+
+    Si existe el artefacto binario se mapea en memoria y no se abren los pickles.
+
+    Args:
+        model_path (str): Ruta a modelo_rl.pkl
+        scaler_path (str): Ruta a scaler.pkl
+        use_sklearn (bool): No fusionar; usar scaler.transform + predict_proba
+        artifact_path (str, optional): Ruta a modelo_rl.bin
+
+    Returns:
+        tuple: (modelo, scaler) - el scaler es None si el modelo ya lo incluye
+    """
+    if artifact_path and not use_sklearn and os.path.exists(artifact_path):
+        from .artifact import load_artifact
+
+        return load_artifact(artifact_path), None
+
+    import joblib
+
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path)
+    if not use_sklearn:
+        fused, _ = fuse_model(model, scaler)
+        if fused is not None:
+            return fused, None
+    return model, scaler
@@ -0,0 +1,226 @@
+"""
+Registro estructurado y no bloqueante.
+
+Todos los loggers del servicio cuelgan de 'rendimiento'. Sus registros pasan por
+un QueueHandler con cola acotada: el hilo de la petición solo encola (y si la
+cola está llena descarta y cuenta), y un QueueListener en segundo plano los
+formatea como JSON de una línea (o texto legible con LOG_FORMAT=texto) y los
+escribe en stdout.
+
+Los eventos del camino caliente (una línea por predicción) se emiten con
+SampledLogger, que aplica una tasa de muestreo por nivel antes de construir el
+registro; por ejemplo LOG_SAMPLE_RATES='INFO:0.01' deja pasar el 1% de las
+predicciones exitosas y todos los errores. Cada evento muestreado lleva su tasa
+en el campo 'muestreo'.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = 'rendimiento'
+
+# Tasas por defecto del camino caliente: 1% de INFO, todo lo demás
+DEFAULT_SAMPLE_RATES = 'DEBUG:0,INFO:0.01'
+
+# Registros máximos en cola antes de empezar a descartar
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+def parse_sample_rates(text):
+    """
+    Interpreta tasas de muestreo del tipo 'INFO:0.01,WARNING:1'
+
+    Args:
+        text (str): Pares nivel:tasa separados por comas (tasa entre 0 y 1)
+
+    Returns:
+        dict: Tasa por nivel numérico de logging
+    """
+    rates = {}
+    for item in (text or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, rate = item.partition(':')
+        level = logging.getLevelName(name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f'Nivel de log desconocido: {name}')
+        rate = float(rate)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f'La tasa de muestreo de {name} debe estar entre 0 y 1')
+        rates[level] = rate
+    return rates
+
+def _fields(record):
+    fields = getattr(record, 'campos', None) or {}
+    extra = {key: value for key, value in vars(record).items() if key not in _RESERVED and key != 'campos'}
+    return {**extra, **fields}
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro con marca de tiempo, nivel, mensaje y campos"""
+
+    def format(self, record):
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f'.{int(record.msecs):03d}',
+            'nivel': record.levelname,
+            'logger': record.name,
+            'mensaje': record.getMessage(),
+        }
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry['excepcion'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['excepcion'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    """Formato legible para desarrollo: mensaje seguido de clave=valor"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = _fields(record)
+        if fields:
+            line += '  ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler que nunca espera: si la cola está llena descarta el registro"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class SampledLogger:
+    """
+    Logger con una tasa de muestreo por nivel, evaluada antes de crear el registro
+
+    Args:
+        name (str): Nombre bajo 'rendimiento' (por ejemplo 'predicciones')
+    """
+
+    def __init__(self, name):
+        self.logger = logging.getLogger(f'{LOGGER_NAME}.{name}')
+        self.rates = _state['rates']
+
+    def rate(self, level):
+        # Los niveles sin tasa configurada no se muestrean
+        return self.rates.get(level, 1.0)
+
+    def log(self, level, message, **fields):
+        rate = self.rate(level)
+        if rate <= 0.0 or (rate < 1.0 and random.random() >= rate):
+            return
+        if not self.logger.isEnabledFor(level):
+            return
+        fields['muestreo'] = rate
+        self.logger.log(level, message, extra={'campos': fields})
+
+    def info(self, message, **fields):
+        self.log(logging.INFO, message, **fields)
+
+    def warning(self, message, **fields):
+        self.log(logging.WARNING, message, **fields)
+
+    def error(self, message, **fields):
+        self.log(logging.ERROR, message, **fields)
+
+_sampled_loggers = {}
+_state = {'listener': None, 'handler': None, 'output': None, 'rates': parse_sample_rates(DEFAULT_SAMPLE_RATES)}
+_state_lock = threading.Lock()
+
+def get_logger(name):
+    """Logger estándar bajo 'rendimiento'"""
+    return logging.getLogger(f'{LOGGER_NAME}.{name}')
+
+def get_sampled_logger(name):
+    """SampledLogger compartido bajo 'rendimiento'"""
+    sampled = _sampled_loggers.get(name)
+    if sampled is None:
+        sampled = _sampled_loggers.setdefault(name, SampledLogger(name))
+    return sampled
+
+def fields(**values):
+    """Campos estructurados para el argumento extra de logging"""
+    return {'campos': values}
+
+def _start_listener():
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    handler = NonBlockingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, _state['output'])
+    listener.start()
+    _state['listener'], _state['handler'] = listener, handler
+
+    root = logging.getLogger(LOGGER_NAME)
+    root.handlers = [handler]
+    root.propagate = False
+
+def configure_logging(level=None, fmt=None, sample_rates=None, stream=None):
+    """
+    Configura el registro del servicio
+
+    Sin argumentos toma LOG_LEVEL (INFO), LOG_FORMAT (json | texto) y
+    LOG_SAMPLE_RATES (por defecto 'DEBUG:0,INFO:0.01') del entorno.
+
+    Args:
+        level (str | int, optional): Nivel mínimo
+        fmt (str, optional): 'json' o 'texto'
+        sample_rates (str | dict, optional): Tasas de muestreo del camino caliente
+        stream (file, optional): Destino; por defecto stdout
+    """
+    level = level or os.environ.get('LOG_LEVEL', 'INFO')
+    fmt = (fmt or os.environ.get('LOG_FORMAT', 'json')).lower()
+    if sample_rates is None:
+        sample_rates = os.environ.get('LOG_SAMPLE_RATES', DEFAULT_SAMPLE_RATES)
+    rates = parse_sample_rates(sample_rates) if isinstance(sample_rates, str) else dict(sample_rates)
+
+    with _state_lock:
+        shutdown_logging()
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(TextFormatter() if fmt == 'texto' else JsonFormatter())
+        _state['output'] = output
+        _start_listener()
+        logging.getLogger(LOGGER_NAME).setLevel(level)
+
+    _state['rates'] = rates
+    for sampled in _sampled_loggers.values():
+        sampled.rates = rates
+
+def shutdown_logging():
+    """Vacía la cola y detiene el hilo de escritura"""
+    listener = _state['listener']
+    if listener is not None:
+        _state['listener'] = None
+        listener.stop()
+
+def dropped_records():
+    """Registros descartados porque la cola estaba llena"""
+    handler = _state['handler']
+    return handler.dropped if handler is not None else 0
+
+def _restart_after_fork():
+    # El hilo del listener no existe en el proceso hijo: se crea otro con su propia cola
+    if _state['listener'] is not None:
+        _start_listener()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+atexit.register(shutdown_logging)
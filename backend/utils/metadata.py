@@ -0,0 +1,105 @@
+"""
+Metadatos del modelo entrenado.
+
+El script de entrenamiento guarda junto al modelo un JSON (modelo_rl.json) con
+las métricas de esa versión; la API las lee al cargar el modelo en lugar de
+tener cifras fijas en el código.
+
+El JSON se escribe al final de cada publicación e incluye la huella de los
+archivos publicados ('archivos'). Mientras los archivos no coinciden con esas
+huellas la publicación está a medias, y el registro no la carga.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+def file_digest(path):
+    """SHA-256 (16 caracteres) del contenido de un archivo"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+def save_metadata(path, metrics, files=None, **extra):
+    """
+    Escribe los metadatos de forma atómica
+
+    Debe llamarse después de escribir los archivos del modelo: es el paso que
+    cierra la publicación.
+
+    Args:
+        path (str): Ruta del JSON (por ejemplo model/modelo_rl.json)
+        metrics (dict): Métricas como fracciones, p. ej. {'precision_prueba': 0.85}
+        files (list, optional): Archivos publicados cuya huella se guarda en 'archivos'
+        **extra: Otros campos (muestras, clases, etc.)
+
+    Returns:
+        dict: Metadatos escritos
+    """
+    metadata = {
+        'entrenado_en': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metricas': {name: round(float(value), 4) for name, value in metrics.items()},
+        **extra
+    }
+    if files:
+        metadata['archivos'] = {os.path.basename(file): file_digest(file) for file in files}
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return metadata
+
+def load_metadata(path):
+    """
+    Lee los metadatos del modelo
+
+    Returns:
+        dict: Metadatos, o {} si el archivo no existe
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def check_release(metadata, paths):
+    """
+    Comprueba que los archivos son los que anotó la última publicación
+
+    Los archivos que no figuran en 'archivos' (o metadatos sin ese campo) no se comprueban.
+
+    Args:
+        metadata (dict): Metadatos leídos con load_metadata
+        paths (iterable): Archivos que se van a cargar
+
+    Raises:
+        ValueError: Si algún archivo no coincide (publicación a medias)
+    """
+    expected = metadata.get('archivos') or {}
+    for path in paths:
+        name = os.path.basename(path)
+        if name in expected and file_digest(path) != expected[name]:
+            raise ValueError(f'{name} no coincide con los metadatos: la publicación aún no termina')
+
+def format_metrics(metadata):
+    """
+    Métricas en el formato de /api/model-info ('85.0%')
+
+    Returns:
+        dict | None: None si la versión cargada no trae métricas
+    """
+    metrics = metadata.get('metricas')
+    if not metrics:
+        return None
+    formatted = {name: f'{value:.1%}' for name, value in metrics.items()}
+    train, test = metrics.get('precision_entrenamiento'), metrics.get('precision_prueba')
+    if train is not None and test is not None:
+        # Diferencia entre entrenamiento y prueba como indicador de overfitting
+        gap = train - test
+        formatted['estabilidad'] = 'Excelente (sin overfitting)' if gap <= 0.05 else (
+            'Aceptable' if gap <= 0.15 else 'Posible overfitting'
+        )
+    return formatted
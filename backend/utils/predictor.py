@@ -1,125 +1,205 @@
+from time import perf_counter
+
 import numpy as np
-import pandas as pd
 
-def predict_performance(model, scaler, data):
+from .features import CLASS_NAMES, FEATURE_SCHEMA
+from .metrics import STAGE
+from .rules import get_rule_engine
+
+_SCALE_STAGE = STAGE['escalado']
+_MODEL_STAGE = STAGE['modelo']
+_FACTORS_STAGE = STAGE['factores']
+_RECOMMENDATIONS_STAGE = STAGE['recomendaciones']
+
+_FIELDS = [spec['campo'] for spec in FEATURE_SCHEMA]
+_NAMES = [spec['nombre'] for spec in FEATURE_SCHEMA]
+
+def predict_performance(model, scaler, data, contributions=False):
     """
     Realiza la predicción del rendimiento académico
     
     Args:
-        model: Modelo de ML cargado (Regresión Logística)
-        scaler: Scaler para normalización
-        data (pd.DataFrame): Datos preprocesados del estudiante
+        model: Modelo de ML cargado (Regresión Logística) o FusedLogisticModel
+        scaler: Scaler para normalización, o None si el modelo ya lo incluye
+        data (np.ndarray | pd.DataFrame): Fila 1×10 preprocesada del estudiante
+        contributions (bool): Agregar el aporte de cada característica a cada clase
     
     Returns:
         dict: Resultado con predicción, probabilidades y factores clave
     """
     try:
-        # IMPORTANTE: Convertir a numpy array para evitar warning de feature names
-        data_array = data.values
-        
-        # Normalizar datos usando el scaler entrenado
-        data_scaled = scaler.transform(data_array)
-        
-        # Realizar predicción
-        prediction = model.predict(data_scaled)[0]
-        
-        # Obtener probabilidades para cada clase
-        probabilities = model.predict_proba(data_scaled)[0]
-        
-        # Mapear índices a nombres de clases
-        class_names = ['Bajo', 'Medio', 'Alto']
-        
-        # Crear diccionario de probabilidades
-        prob_dict = {
-            class_names[i]: float(probabilities[i])
-            for i in range(len(class_names))
-        }
-        
-        # Determinar predicción final
-        predicted_class = class_names[prediction]
-        
-        # Identificar factores clave basados en los valores de entrada
-        key_factors = identify_key_factors(data)
-        
-        # Obtener recomendaciones personalizadas
-        recommendations = get_recommendations(predicted_class, data)
-        
-        # Construir respuesta
-        result = {
-            'prediccion': predicted_class,
-            'probabilidades': prob_dict,
-            'factores_clave': key_factors,
-            'recomendaciones': recommendations,
-            'confianza': float(max(probabilities))
-        }
-        
-        print(f"✅ Predicción exitosa: {predicted_class}")
-        print(f"   Probabilidades: {prob_dict}")
-        
-        return result
-        
+        return predict_batch(model, scaler, data, contributions)[0]
     except Exception as e:
-        print(f"❌ Error en predicción: {type(e).__name__}: {e}")
         raise Exception(f'Error en la predicción: {str(e)}')
 
+def feature_contributions(model, scaler, data):
+    """
+    Aporte de cada característica al logit de cada clase
+
+    Como el modelo es lineal, el aporte de la columna j a la clase k es
+    coef_[k, j] por el valor escalado de la columna. Con dos clases sklearn
+    guarda una sola salida (la de la clase positiva); se agrega la de la
+    clase negativa en cero para que el softmax dé la misma sigmoide.
+
+    Args:
+        model: Modelo de ML cargado (Regresión Logística) o FusedLogisticModel
+        scaler: Scaler para normalización, o None si el modelo ya lo incluye
+        data (np.ndarray): Matriz N×10 de datos preprocesados
+
+    Returns:
+        tuple: (aportes N×10×clases, intercepto por clase); la suma de los
+               aportes de una fila más el intercepto son sus logits
+    """
+    if scaler is not None:
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        values = scaler.transform(data)[:, :, None] * coef.T
+        intercept = np.asarray(model.intercept_, dtype=np.float64)
+    else:
+        values, intercept = model.contributions(data)
+
+    if values.shape[2] == 1:
+        values = np.concatenate([np.zeros_like(values), values], axis=2)
+        intercept = np.concatenate([np.zeros(1), intercept])
+    return values, intercept
+
+def _softmax(logits):
+    logits -= logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+def explain_contributions(values, intercept, probabilities, predictions):
+    """
+    Arma el desglose de cada fila y el ranking de características hacia la clase predicha
+
+    El impacto de una característica es su aporte a la clase predicha menos su
+    aporte a la segunda clase más probable. Los impactos más la diferencia de
+    interceptos suman exactamente log(P(predicha) / P(segunda)).
+
+    Args:
+        values (np.ndarray): Aportes N×10×clases (feature_contributions)
+        intercept (np.ndarray): Intercepto por clase
+        probabilities (np.ndarray): Probabilidades N×clases
+        predictions (np.ndarray): Índice de la clase predicha de cada fila
+
+    Returns:
+        tuple: (desglose por fila: campo -> aportes en el orden de CLASS_NAMES,
+                más 'intercepto'; ranking por fila)
+    """
+    rows = np.arange(len(predictions))
+    ranked = probabilities.copy()
+    ranked[rows, predictions] = -np.inf
+    runner_up = ranked.argmax(axis=1)
+    impacts = values[rows, :, predictions] - values[rows, :, runner_up]
+    order = np.argsort(-impacts, axis=1, kind='stable')
+
+    intercepts = intercept.tolist()
+    impact_rows = impacts.tolist()
+    breakdowns, rankings = [], []
+    for per_feature, impact, ranked_columns in zip(values.tolist(), impact_rows, order.tolist()):
+        breakdown = dict(zip(_FIELDS, per_feature))
+        breakdown['intercepto'] = list(intercepts)
+        breakdowns.append(breakdown)
+        rankings.append([
+            {'campo': _FIELDS[j], 'nombre': _NAMES[j], 'impacto': impact[j]}
+            for j in ranked_columns if impact[j] > 0
+        ])
+    return breakdowns, rankings
+
+def predict_batch(model, scaler, data, contributions=False):
+    """
+    Realiza la predicción de varios estudiantes en una sola pasada
+    
+    Args:
+        model: Modelo de ML cargado (Regresión Logística) o FusedLogisticModel
+        scaler: Scaler para normalización, o None si el modelo ya lo incluye
+        data (pd.DataFrame | np.ndarray): Matriz N×10 de datos preprocesados
+        contributions (bool): Calcular los logits a partir del aporte de cada
+            característica y devolverlo en 'contribuciones', junto con el
+            ranking de 'factores_modelo'
+    
+    Returns:
+        list: Un resultado por fila, con la misma estructura que predict_performance
+    """
+    # IMPORTANTE: Convertir a numpy array para evitar warning de feature names
+    data_array = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    if data_array.shape[0] == 0:
+        return []
+    
+    # Normalizar y obtener probabilidades de todas las filas a la vez; con el
+    # modelo fusionado la normalización va dentro de predict_proba
+    started = perf_counter()
+    if contributions:
+        # Los logits salen de sumar los aportes: el desglose no cuesta otra pasada
+        values, intercept = feature_contributions(model, scaler, data_array)
+        probabilities = _softmax(values.sum(axis=1) + intercept)
+    elif scaler is not None:
+        data_scaled = scaler.transform(data_array)
+        now = perf_counter()
+        _SCALE_STAGE.observe(now - started)
+        started = now
+        probabilities = model.predict_proba(data_scaled)
+    else:
+        probabilities = model.predict_proba(data_array)
+    
+    # La clase predicha es la de mayor probabilidad
+    predictions = probabilities.argmax(axis=1)
+    confidences = probabilities[np.arange(len(predictions)), predictions]
+    predicted_classes = [CLASS_NAMES[p] for p in predictions]
+    now = perf_counter()
+    _MODEL_STAGE.observe(now - started)
+    
+    key_factors = identify_key_factors_batch(data_array)
+    if contributions:
+        breakdowns, rankings = explain_contributions(values, intercept, probabilities, predictions)
+    started = perf_counter()
+    _FACTORS_STAGE.observe(started - now)
+    recommendations = get_recommendations_batch(predictions, data_array)
+    _RECOMMENDATIONS_STAGE.observe(perf_counter() - started)
+    
+    prob_rows = probabilities.tolist()
+    confidences = confidences.tolist()
+    
+    results = [
+        {
+            'prediccion': predicted_classes[i],
+            'probabilidades': dict(zip(CLASS_NAMES, prob_rows[i])),
+            'factores_clave': key_factors[i],
+            'recomendaciones': recommendations[i],
+            'confianza': confidences[i]
+        }
+        for i in range(len(predicted_classes))
+    ]
+    if contributions:
+        for result, breakdown, ranking in zip(results, breakdowns, rankings):
+            result['contribuciones'] = breakdown
+            result['factores_modelo'] = ranking
+    return results
+
 def identify_key_factors(data):
     """
     Identifica los factores más relevantes basándose en los valores de entrada
     
     Args:
-        data (pd.DataFrame): Datos del estudiante
+        data (np.ndarray | pd.DataFrame): Fila preprocesada del estudiante
     
     Returns:
         list: Lista de factores clave identificados
     """
-    factors = []
-    
-    # Extraer valores
-    apoyo_familiar = data['Apoyo_Familiar'].values[0]
-    ingresos = data['Ingresos_Familiares'].values[0]
-    horas_estudio = data['Horas_Estudio'].values[0]
-    nivel_educativo = data['Nivel_Educativo_Padres'].values[0]
-    clima_familiar = data['Clima_Familiar'].values[0]
-    motivacion = data['Motivacion'].values[0]
-    asistencia = data['Asistencia'].values[0]
-    
-    # Identificar factores positivos y negativos
-    if apoyo_familiar >= 4:
-        factors.append('Alto Apoyo Familiar')
-    elif apoyo_familiar <= 2:
-        factors.append('Bajo Apoyo Familiar (⚠️)')
-    
-    if horas_estudio >= 15:
-        factors.append('Buenos Hábitos de Estudio')
-    elif horas_estudio < 5:
-        factors.append('Pocas Horas de Estudio (⚠️)')
-    
-    if motivacion >= 4:
-        factors.append('Alta Motivación')
-    elif motivacion <= 2:
-        factors.append('Baja Motivación (⚠️)')
-    
-    if asistencia >= 90:
-        factors.append('Excelente Asistencia')
-    elif asistencia < 70:
-        factors.append('Baja Asistencia (⚠️)')
-    
-    if clima_familiar >= 4:
-        factors.append('Buen Clima Familiar')
-    
-    if nivel_educativo >= 4:
-        factors.append('Alto Nivel Educativo de los Padres')
-    
-    if ingresos >= 4:
-        factors.append('Buenos Recursos Económicos')
-    elif ingresos <= 2:
-        factors.append('Recursos Económicos Limitados (⚠️)')
+    data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    return identify_key_factors_batch(data[:1])[0]
+
+def identify_key_factors_batch(data):
+    """
+    Identifica los factores clave de cada fila de una matriz N×10
     
-    # Si no se identificaron factores específicos, agregar los 3 más importantes
-    if len(factors) == 0:
-        factors = ['Apoyo Familiar', 'Horas de Estudio', 'Motivación']
+    Args:
+        data (np.ndarray): Datos de los estudiantes en el orden de FEATURE_COLUMNS
     
-    return factors[:5]  # Retornar máximo 5 factores
+    Returns:
+        list: Lista de factores clave por estudiante (máximo 5 cada una)
+    """
+    return get_rule_engine().key_factors(data)
 
 def get_recommendations(prediction, data):
     """
@@ -127,39 +207,23 @@ def get_recommendations(prediction, data):
     
     Args:
         prediction (str): Clase predicha ('Alto', 'Medio', 'Bajo')
-        data (pd.DataFrame): Datos del estudiante
+        data (np.ndarray | pd.DataFrame): Fila preprocesada del estudiante
     
     Returns:
         list: Lista de recomendaciones
     """
-    recommendations = []
-    
-    horas_estudio = data['Horas_Estudio'].values[0]
-    apoyo_familiar = data['Apoyo_Familiar'].values[0]
-    motivacion = data['Motivacion'].values[0]
-    asistencia = data['Asistencia'].values[0]
-    
-    if prediction == 'Bajo':
-        recommendations.append('Incrementar las horas de estudio semanales')
-        recommendations.append('Buscar apoyo tutorial o asesoría académica')
-        recommendations.append('Mejorar la asistencia a clases')
-        recommendations.append('Establecer un plan de estudio estructurado')
-        recommendations.append('Fomentar la comunicación con la familia sobre el progreso académico')
-    
-    elif prediction == 'Medio':
-        if horas_estudio < 10:
-            recommendations.append('Aumentar gradualmente las horas de estudio')
-        if motivacion <= 3:
-            recommendations.append('Participar en actividades que refuercen el interés académico')
-        if asistencia < 85:
-            recommendations.append('Mejorar la asistencia regular a clases')
-        recommendations.append('Establecer metas académicas claras a corto plazo')
-        recommendations.append('Mantener comunicación constante con docentes')
-    
-    else:  # Alto
-        recommendations.append('Mantener los buenos hábitos de estudio')
-        recommendations.append('Participar en actividades de liderazgo académico')
-        recommendations.append('Considerar programas de tutoría para apoyar a otros estudiantes')
-        recommendations.append('Explorar oportunidades de investigación o proyectos avanzados')
-    
-    return recommendations
\ No newline at end of file
+    data = np.atleast_2d(np.asarray(data, dtype=np.float64))
+    return get_recommendations_batch([prediction], data[:1])[0]
+
+def get_recommendations_batch(predictions, data):
+    """
+    Genera las recomendaciones de cada fila de una matriz N×10
+    
+    Args:
+        predictions (list | np.ndarray): Clase predicha de cada estudiante (nombre o índice)
+        data (np.ndarray): Datos de los estudiantes en el orden de FEATURE_COLUMNS
+    
+    Returns:
+        list: Lista de recomendaciones por estudiante
+    """
+    return get_rule_engine().recommendations(predictions, data)
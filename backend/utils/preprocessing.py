@@ -1,62 +1,73 @@
-import pandas as pd
 import numpy as np
 
-def preprocess_input(data):
+from .features import FEATURE_COLUMNS, FEATURE_SCHEMA, N_FEATURES
+from .validation import ValidationError, validate_record, validate_records, describe_errors
+
+def preprocess_input(data, out=None, as_dataframe=False):
     """
     Preprocesa los datos de entrada del formulario
     
     Args:
         data (dict): Diccionario con los datos del estudiante
+        out (np.ndarray, optional): Fila float64 de 10 posiciones donde escribir
+            el resultado (por ejemplo, una fila de una matriz de lote)
+        as_dataframe (bool): Devolver un DataFrame de pandas en lugar del array
+    
+    Returns:
+        np.ndarray: Matriz 1×10 (o la fila `out`) en el orden de FEATURE_COLUMNS,
+        o pd.DataFrame si se pidió explícitamente
+    
+    Raises:
+        ValidationError: Con la lista completa de errores si algún campo es inválido
+    """
+    row, errors = validate_record(data, out)
+    if errors:
+        raise ValidationError(errors)
+    
+    if as_dataframe:
+        return to_dataframe(row)
+    
+    return row.reshape(1, N_FEATURES) if out is None else out
+
+def preprocess_batch(records):
+    """
+    Preprocesa una lista de estudiantes en una sola matriz N×10
+    
+    Un registro inválido no invalida al resto del lote.
+    
+    Args:
+        records (list): Lista de diccionarios con los datos de cada estudiante
     
     Returns:
-        pd.DataFrame: DataFrame con datos procesados listos para el modelo
+        tuple: (np.ndarray, list, list) - (matriz de filas válidas en el orden
+               de FEATURE_COLUMNS, índices originales de esas filas, errores
+               por registro)
     """
-    try:
-        # Mapeo de género
-        genero_map = {'M': 0, 'F': 1}
-        genero_numeric = genero_map.get(str(data['genero']).upper(), 0)
-        
-        # Convertir acceso a internet
-        acceso_internet = int(data['acceso_internet'])
-        
-        # Crear DataFrame con el orden correcto de columnas
-        processed_data = pd.DataFrame({
-            'Genero': [genero_numeric],
-            'Apoyo_Familiar': [int(data['apoyo_familiar'])],
-            'Ingresos_Familiares': [int(data['ingresos_familiares'])],
-            'Horas_Estudio': [float(data['horas_estudio'])],
-            'Actividades_Extra': [float(data['actividades_extra'])],
-            'Nivel_Educativo_Padres': [int(data['nivel_educativo_padres'])],
-            'Acceso_Internet': [acceso_internet],
-            'Clima_Familiar': [int(data['clima_familiar'])],
-            'Asistencia': [float(data['asistencia'])],
-            'Motivacion': [int(data['motivacion'])]
-        })
-        
-        # Validaciones de rango
-        validations = {
-            'Apoyo_Familiar': (1, 5),
-            'Ingresos_Familiares': (1, 5),
-            'Horas_Estudio': (0, 168),
-            'Actividades_Extra': (0, 40),
-            'Nivel_Educativo_Padres': (1, 5),
-            'Acceso_Internet': (0, 1),
-            'Clima_Familiar': (1, 5),
-            'Asistencia': (0, 100),
-            'Motivacion': (1, 5)
-        }
-        
-        for col, (min_val, max_val) in validations.items():
-            value = processed_data[col].values[0]
-            if not (min_val <= value <= max_val):
-                raise ValueError(f'{col} debe estar entre {min_val} y {max_val}. Valor recibido: {value}')
-        
-        return processed_data
-        
-    except KeyError as e:
-        raise ValueError(f'Campo faltante: {e}')
-    except (ValueError, TypeError) as e:
-        raise ValueError(f'Error en conversión de datos: {e}')
+    matrix, valid_indices, errors = validate_records(records)
+    
+    batch_errors = [
+        dict(indice=index, **describe_errors(errors[index]))
+        for index in sorted(errors)
+    ]
+    
+    return matrix, valid_indices, batch_errors
+
+def to_dataframe(data):
+    """
+    Convierte filas preprocesadas en un DataFrame con los nombres de columna
+    
+    Args:
+        data (np.ndarray): Fila o matriz N×10 en el orden de FEATURE_COLUMNS
+    
+    Returns:
+        pd.DataFrame: DataFrame con las columnas del modelo
+    """
+    import pandas as pd
+    
+    frame = pd.DataFrame(np.atleast_2d(data), columns=FEATURE_COLUMNS)
+    return frame.astype({
+        spec['columna']: 'int64' for spec in FEATURE_SCHEMA if spec['tipo'] != 'real'
+    })
 
 def validate_input(data):
     """
@@ -66,62 +77,10 @@ def validate_input(data):
         data (dict): Datos a validar
     
     Returns:
-        tuple: (bool, str) - (es_valido, mensaje_error)
+        tuple: (bool, str) - (es_valido, mensaje_error con todos los errores)
     """
-    required_fields = [
-        'genero', 'apoyo_familiar', 'ingresos_familiares',
-        'horas_estudio', 'actividades_extra', 'nivel_educativo_padres',
-        'acceso_internet', 'clima_familiar', 'asistencia', 'motivacion'
-    ]
+    _, errors = validate_record(data)
+    if errors:
+        return False, '; '.join(error['mensaje'] for error in errors)
     
-    # Verificar campos requeridos
-    for field in required_fields:
-        if field not in data:
-            return False, f'Campo requerido faltante: {field}'
-    
-    # Validar género
-    if str(data['genero']).upper() not in ['M', 'F']:
-        return False, 'Género debe ser M o F'
-    
-    try:
-        # Validaciones numéricas
-        apoyo = int(data['apoyo_familiar'])
-        if not (1 <= apoyo <= 5):
-            return False, 'Apoyo familiar debe estar entre 1 y 5'
-        
-        ingresos = int(data['ingresos_familiares'])
-        if not (1 <= ingresos <= 5):
-            return False, 'Ingresos familiares debe estar entre 1 y 5'
-        
-        horas = float(data['horas_estudio'])
-        if not (0 <= horas <= 168):
-            return False, 'Horas de estudio debe estar entre 0 y 168'
-        
-        actividades = float(data['actividades_extra'])
-        if not (0 <= actividades <= 40):
-            return False, 'Actividades extra debe estar entre 0 y 40'
-        
-        nivel_edu = int(data['nivel_educativo_padres'])
-        if not (1 <= nivel_edu <= 5):
-            return False, 'Nivel educativo padres debe estar entre 1 y 5'
-        
-        internet = int(data['acceso_internet'])
-        if internet not in [0, 1]:
-            return False, 'Acceso a internet debe ser 0 o 1'
-        
-        clima = int(data['clima_familiar'])
-        if not (1 <= clima <= 5):
-            return False, 'Clima familiar debe estar entre 1 y 5'
-        
-        asistencia = float(data['asistencia'])
-        if not (0 <= asistencia <= 100):
-            return False, 'Asistencia debe estar entre 0 y 100'
-        
-        motivacion = int(data['motivacion'])
-        if not (1 <= motivacion <= 5):
-            return False, 'Motivación debe estar entre 1 y 5'
-            
-    except (ValueError, TypeError) as e:
-        return False, f'Error en formato de datos: {str(e)}'
-    
-    return True, 'Datos válidos'
\ No newline at end of file
+    return True, 'Datos válidos'
@@ -0,0 +1,93 @@
+"""
+Perfilado bajo demanda de una sola petición.
+
+profile_call ejecuta una función bajo cProfile y resume las funciones con más
+tiempo acumulado (validación, sklearn o el modelo fusionado, reglas y
+serialización). Solo se perfila una petición a la vez en cada proceso: cProfile
+no admite perfiladores simultáneos en todas las versiones de Python, así que si
+ya hay una en curso la petición se atiende sin perfil.
+
+cProfile solo ve el hilo que lo activa; quien llama debe ejecutar la predicción
+en ese hilo (por ejemplo sin pasar por el micro-batching).
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+import time
+
+_profile_lock = threading.Lock()
+
+def _function_name(key):
+    filename, line, name = key
+    if filename == '~':
+        # Funciones en C: pstats las guarda como ('~', 0, '<built-in method ...>')
+        return name
+    return f'{os.path.basename(filename)}:{line}({name})'
+
+def summarize(profiler, top=25):
+    """
+    Resume un perfil en las funciones con más tiempo acumulado
+
+    Args:
+        profiler (cProfile.Profile): Perfil ya detenido
+        top (int): Máximo de funciones a incluir
+
+    Returns:
+        list: Una entrada por función con llamadas, tiempo propio y acumulado en ms
+    """
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [
+        {
+            'funcion': _function_name(key),
+            'llamadas': calls,
+            'tiempo_propio_ms': round(own * 1000, 4),
+            'tiempo_acumulado_ms': round(cumulative * 1000, 4)
+        }
+        for key, (_, calls, own, cumulative, _) in rows[:top]
+    ]
+
+def profile_call(function, *args, top=25, output_dir=None, label=None):
+    """
+    Ejecuta function(*args) bajo cProfile
+
+    Args:
+        function (callable): Función a perfilar
+        top (int): Funciones incluidas en el resumen
+        output_dir (str, optional): Carpeta donde guardar el perfil completo (.prof)
+        label (str, optional): Parte del nombre del archivo, por ejemplo el id de la petición
+
+    Returns:
+        tuple: (resultado de la función, resumen del perfil o None si otro
+               perfil estaba en curso)
+    """
+    if not _profile_lock.acquire(blocking=False):
+        return function(*args), None
+
+    try:
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            result = function(*args)
+        finally:
+            profiler.disable()
+        elapsed = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+
+    report = {
+        'tiempo_total_ms': round(elapsed * 1000, 3),
+        'funciones': summarize(profiler, top)
+    }
+    if output_dir:
+        # Solo caracteres seguros en el nombre: el id puede venir de una cabecera
+        safe_label = re.sub(r'[^A-Za-z0-9_.-]', '_', label or '')[:64]
+        path = os.path.join(output_dir, f'perfil-{time.strftime("%Y%m%d-%H%M%S")}-{safe_label or os.getpid()}.prof')
+        os.makedirs(output_dir, exist_ok=True)
+        profiler.dump_stats(path)
+        report['archivo'] = path
+    return result, report
@@ -0,0 +1,264 @@
+"""
+Registro de versiones del modelo con recarga en caliente.
+
+Cada carga produce un ModelBundle inmutable (modelo, scaler, modelo fusionado,
+metadatos y versión). Si existe el artefacto binario (modelo_rl.bin) se mapea en memoria en
+lugar de abrir los pickles. Las peticiones toman el bundle activo una sola vez al empezar y lo
+usan hasta terminar; una recarga construye, verifica y calienta el bundle nuevo
+en segundo plano y luego lo publica con una sola asignación, de modo que nunca
+se mezclan artefactos de dos versiones.
+
+Los metadatos (modelo_rl.json) se escriben al final de cada publicación con la
+huella de los archivos; si los archivos no coinciden, la publicación está a
+medias y no se carga.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+from .features import FEATURE_SCHEMA, N_FEATURES
+from .inference import fuse_model
+from .metadata import load_metadata, check_release
+
+class ModelBundle:
+    """Conjunto inmutable de artefactos de una versión del modelo"""
+
+    __slots__ = ('version', 'model', 'scaler', 'fused', 'fingerprint', 'source', 'metadata', 'loaded_at')
+
+    def __init__(self, version, model, scaler, fused, fingerprint, source='pickle', metadata=None):
+        self.version = version
+        self.model = model
+        self.scaler = scaler
+        self.fused = fused
+        self.fingerprint = fingerprint
+        self.source = source
+        self.metadata = metadata or {}
+        self.loaded_at = time.time()
+
+    def inference_pair(self):
+        """Devuelve el par (modelo, scaler) que se usa para predecir"""
+        if self.fused is not None:
+            return self.fused, None
+        return self.model, self.scaler
+
+    def info(self):
+        return {
+            'version': self.version,
+            'huella': self.fingerprint,
+            'fusionado': self.fused is not None,
+            'origen': self.source,
+            'cargado_en': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.loaded_at))
+        }
+
+def _fingerprint(*paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
+def _warmup_row():
+    """Fila de ejemplo con el punto medio del rango de cada variable"""
+    row = np.zeros((1, N_FEATURES), dtype=np.float64)
+    for j, spec in enumerate(FEATURE_SCHEMA):
+        if 'rango' in spec:
+            row[0, j] = sum(spec['rango']) / 2
+    return row
+
+class ModelRegistry:
+    """
+    Mantiene el bundle activo y lo reemplaza cuando cambian los artefactos
+
+    Args:
+        model_path (str): Ruta a modelo_rl.pkl
+        scaler_path (str): Ruta a scaler.pkl
+        use_sklearn (bool): No fusionar el modelo (ignora el artefacto binario)
+        on_swap (callable, optional): Se llama con el bundle nuevo tras publicarlo
+        artifact_path (str, optional): Ruta a modelo_rl.bin; se prefiere a los pickles si existe
+        metadata_path (str, optional): Ruta a modelo_rl.json con las métricas y las huellas de la publicación
+    """
+
+    def __init__(self, model_path, scaler_path, use_sklearn=False, on_swap=None, artifact_path=None,
+                 metadata_path=None):
+        self.model_path = model_path
+        self.scaler_path = scaler_path
+        self.artifact_path = artifact_path
+        self.metadata_path = metadata_path
+        self.use_sklearn = use_sklearn
+        self.on_swap = on_swap
+        self.current = None
+        self.last_error = None
+        self.fusion_warning = None
+        self._counter = 0
+        self._load_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def _use_artifact(self):
+        return bool(self.artifact_path) and not self.use_sklearn and os.path.exists(self.artifact_path)
+
+    def _sources(self):
+        """Archivos de los que se carga el bundle activo"""
+        sources = (self.artifact_path,) if self._use_artifact() else (self.model_path, self.scaler_path)
+        # Los metadatos forman parte de la versión: cambiarlos publica un bundle nuevo
+        if self.metadata_path and os.path.exists(self.metadata_path):
+            sources += (self.metadata_path,)
+        return sources
+
+    def _mtimes(self):
+        """mtime de cada archivo vigilado, o None si falta; cualquier cambio publica una versión"""
+        paths = [self.model_path, self.scaler_path]
+        if self.artifact_path and not self.use_sklearn:
+            paths.append(self.artifact_path)
+        if self.metadata_path:
+            paths.append(self.metadata_path)
+
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _build(self):
+        """Carga, valida y calienta un bundle nuevo sin publicarlo"""
+        from .predictor import predict_batch
+
+        # Los metadatos se escriben al final de cada publicación: si los
+        # archivos no coinciden con sus huellas, la publicación está a medias
+        metadata = load_metadata(self.metadata_path)
+        check_release(metadata, [path for path in self._sources() if path != self.metadata_path])
+
+        if self._use_artifact():
+            bundle = self._build_from_artifact(metadata)
+        else:
+            bundle = self._build_from_pickles(metadata)
+
+        # Calentar la ruta de inferencia antes de recibir tráfico
+        predict_batch(*bundle.inference_pair(), _warmup_row())
+        return bundle
+
+    def _build_from_artifact(self, metadata):
+        from .artifact import load_artifact
+
+        fingerprint = _fingerprint(*self._sources())
+        fused = load_artifact(self.artifact_path)
+        if fused.n_features_in_ != N_FEATURES:
+            raise ValueError(f'El artefacto espera {fused.n_features_in_} características y la API envía {N_FEATURES}')
+
+        self.fusion_warning = None
+        version = f'v{self._counter + 1}-{fingerprint}'
+        return ModelBundle(version, None, None, fused, fingerprint, source='artefacto', metadata=metadata)
+
+    def _build_from_pickles(self, metadata):
+        import joblib
+
+        fingerprint = _fingerprint(*self._sources())
+        model = joblib.load(self.model_path)
+        scaler = joblib.load(self.scaler_path)
+
+        for name, artifact in (('modelo', model), ('scaler', scaler)):
+            n_features = getattr(artifact, 'n_features_in_', N_FEATURES)
+            if n_features != N_FEATURES:
+                raise ValueError(f'El {name} espera {n_features} características y la API envía {N_FEATURES}')
+
+        fused = None
+        self.fusion_warning = None
+        if not self.use_sklearn:
+            fused, self.fusion_warning = fuse_model(model, scaler)
+
+        version = f'v{self._counter + 1}-{fingerprint}'
+        return ModelBundle(version, model, scaler, fused, fingerprint, metadata=metadata)
+
+    def load(self, force=True):
+        """
+        Carga los artefactos y publica el bundle nuevo
+
+        Args:
+            force (bool): Publicar aunque la huella coincida con la versión activa
+
+        Returns:
+            ModelBundle: Bundle activo tras la carga
+
+        Raises:
+            Exception: Si los artefactos no se pueden cargar o no son válidos;
+                el bundle activo no cambia
+        """
+        with self._load_lock:
+            try:
+                current = self.current
+                if not force and current is not None:
+                    if _fingerprint(*self._sources()) == current.fingerprint:
+                        return current
+                bundle = self._build()
+            except Exception as e:
+                self.last_error = f'{type(e).__name__}: {e}'
+                raise
+            self._counter += 1
+            self.last_error = None
+            self.current = bundle
+        if self.on_swap is not None:
+            self.on_swap(bundle)
+        return bundle
+
+    def reload_async(self):
+        """Recarga en un hilo de fondo; las peticiones siguen con el bundle activo"""
+        thread = threading.Thread(target=self._reload_quietly, name='model-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def _reload_quietly(self):
+        try:
+            self.load(force=False)
+        except Exception:
+            pass  # last_error queda registrado y se reporta en status()
+
+    def start_watcher(self, interval=5.0):
+        """
+        Vigila los artefactos y recarga cuando cambian
+
+        Se espera a que los archivos dejen de cambiar durante un intervalo
+        completo antes de cargar, para no leer un reentrenamiento a medias.
+        """
+        if self._watcher is not None:
+            return self._watcher
+
+        # Estado inicial tomado antes de lanzar el hilo: un cambio que llegue
+        # justo después de start_watcher ya cuenta como cambio
+        initial = self._mtimes()
+
+        def watch():
+            seen = initial
+            pending = None
+            while not self._stop.wait(interval):
+                mtimes = self._mtimes()
+                if mtimes == seen or all(mtime is None for mtime in mtimes):
+                    pending = None
+                    continue
+                if mtimes != pending:
+                    pending = mtimes
+                    continue
+                seen, pending = mtimes, None
+                self._reload_quietly()
+
+        self._watcher = threading.Thread(target=watch, name='model-watcher', daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def status(self):
+        """Estado del registro para los endpoints de salud y administración"""
+        current = self.current
+        return {
+            'modelo_activo': current.info() if current is not None else None,
+            'vigilando_archivos': self._watcher is not None and not self._stop.is_set(),
+            'ultimo_error': self.last_error
+        }
@@ -0,0 +1,260 @@
+"""
+Motor de reglas para factores clave y recomendaciones.
+
+Cada regla es una fila de una tabla declarativa (columna, comparación, umbral,
+mensaje, severidad). Al compilarse, la tabla se convierte en vectores de
+índices y umbrales que se evalúan con máscaras booleanas de NumPy sobre una
+matriz N×10 completa. Las reglas por defecto reproducen los umbrales originales
+y pueden reemplazarse cargando un archivo JSON, sin cambiar código.
+"""
+
+import json
+import sys
+
+import numpy as np
+
+from .features import FEATURE_INDEX, CLASS_NAMES
+
+# Tabla de factores clave, en el orden en que se reportan
+# (columna, comparación, umbral, mensaje, severidad)
+DEFAULT_FACTOR_RULES = [
+    ('Apoyo_Familiar', '>=', 4, 'Alto Apoyo Familiar', 'positivo'),
+    ('Apoyo_Familiar', '<=', 2, 'Bajo Apoyo Familiar (⚠️)', 'alerta'),
+    ('Horas_Estudio', '>=', 15, 'Buenos Hábitos de Estudio', 'positivo'),
+    ('Horas_Estudio', '<', 5, 'Pocas Horas de Estudio (⚠️)', 'alerta'),
+    ('Motivacion', '>=', 4, 'Alta Motivación', 'positivo'),
+    ('Motivacion', '<=', 2, 'Baja Motivación (⚠️)', 'alerta'),
+    ('Asistencia', '>=', 90, 'Excelente Asistencia', 'positivo'),
+    ('Asistencia', '<', 70, 'Baja Asistencia (⚠️)', 'alerta'),
+    ('Clima_Familiar', '>=', 4, 'Buen Clima Familiar', 'positivo'),
+    ('Nivel_Educativo_Padres', '>=', 4, 'Alto Nivel Educativo de los Padres', 'positivo'),
+    ('Ingresos_Familiares', '>=', 4, 'Buenos Recursos Económicos', 'positivo'),
+    ('Ingresos_Familiares', '<=', 2, 'Recursos Económicos Limitados (⚠️)', 'alerta'),
+]
+
+# Si no se identificaron factores específicos, se reportan los 3 más importantes
+DEFAULT_FALLBACK_FACTORS = ['Apoyo Familiar', 'Horas de Estudio', 'Motivación']
+
+MAX_FACTORS = 5
+
+# Tabla de recomendaciones por clase; las reglas sin columna siempre aplican
+# (clase, columna, comparación, umbral, mensaje)
+DEFAULT_RECOMMENDATION_RULES = [
+    ('Bajo', None, None, None, 'Incrementar las horas de estudio semanales'),
+    ('Bajo', None, None, None, 'Buscar apoyo tutorial o asesoría académica'),
+    ('Bajo', None, None, None, 'Mejorar la asistencia a clases'),
+    ('Bajo', None, None, None, 'Establecer un plan de estudio estructurado'),
+    ('Bajo', None, None, None, 'Fomentar la comunicación con la familia sobre el progreso académico'),
+    ('Medio', 'Horas_Estudio', '<', 10, 'Aumentar gradualmente las horas de estudio'),
+    ('Medio', 'Motivacion', '<=', 3, 'Participar en actividades que refuercen el interés académico'),
+    ('Medio', 'Asistencia', '<', 85, 'Mejorar la asistencia regular a clases'),
+    ('Medio', None, None, None, 'Establecer metas académicas claras a corto plazo'),
+    ('Medio', None, None, None, 'Mantener comunicación constante con docentes'),
+    ('Alto', None, None, None, 'Mantener los buenos hábitos de estudio'),
+    ('Alto', None, None, None, 'Participar en actividades de liderazgo académico'),
+    ('Alto', None, None, None, 'Considerar programas de tutoría para apoyar a otros estudiantes'),
+    ('Alto', None, None, None, 'Explorar oportunidades de investigación o proyectos avanzados'),
+]
+
+_COMPARISONS = {
+    '>=': np.greater_equal,
+    '>': np.greater,
+    '<=': np.less_equal,
+    '<': np.less,
+    '==': np.equal,
+}
+
+class _Conditions:
+    """Conjunto de condiciones compiladas (índice de columna, comparación, umbral)"""
+
+    def __init__(self, columns, comparisons, thresholds):
+        for column, comparison in zip(columns, comparisons):
+            if column is not None and column not in FEATURE_INDEX:
+                raise ValueError(f'Columna desconocida en regla: {column}')
+            if column is not None and comparison not in _COMPARISONS:
+                raise ValueError(f'Comparación no soportada en regla: {comparison}')
+
+        self.n_rules = len(columns)
+        self.always = np.array([column is None for column in columns], dtype=bool)
+        self.indices = np.array(
+            [FEATURE_INDEX[column] if column is not None else 0 for column in columns],
+            dtype=np.intp
+        )
+        self.thresholds = np.array(
+            [threshold if column is not None else 0 for column, threshold in zip(columns, thresholds)],
+            dtype=np.float64
+        )
+        # Agrupar reglas por comparación para evaluar cada grupo en una sola operación
+        self.groups = []
+        for comparison, ufunc in _COMPARISONS.items():
+            selected = np.array([
+                column is not None and rule_comparison == comparison
+                for column, rule_comparison in zip(columns, comparisons)
+            ], dtype=bool)
+            if selected.any():
+                self.groups.append((np.flatnonzero(selected), ufunc))
+
+    def evaluate(self, data):
+        """Devuelve una máscara N×R con las reglas que se cumplen en cada fila"""
+        masks = np.empty((data.shape[0], self.n_rules), dtype=bool)
+        masks[:, self.always] = True
+        values = data[:, self.indices]
+        for selected, ufunc in self.groups:
+            masks[:, selected] = ufunc(values[:, selected], self.thresholds[selected])
+        return masks
+
+def _collect(masks, messages, n_rows):
+    """Convierte una máscara N×R en una lista de mensajes por fila, en el orden de la tabla"""
+    collected = [[] for _ in range(n_rows)]
+    rows, rules = np.nonzero(masks)
+    for row, rule in zip(rows.tolist(), rules.tolist()):
+        collected[row].append(messages[rule])
+    return collected
+
+class RuleEngine:
+    """Tablas de reglas compiladas para factores clave y recomendaciones"""
+
+    def __init__(self, factor_rules=None, recommendation_rules=None,
+                 fallback_factors=None, max_factors=MAX_FACTORS):
+        factor_rules = DEFAULT_FACTOR_RULES if factor_rules is None else factor_rules
+        recommendation_rules = (
+            DEFAULT_RECOMMENDATION_RULES if recommendation_rules is None else recommendation_rules
+        )
+        fallback_factors = DEFAULT_FALLBACK_FACTORS if fallback_factors is None else fallback_factors
+
+        self.factor_rules = [tuple(rule) for rule in factor_rules]
+        self.recommendation_rules = [tuple(rule) for rule in recommendation_rules]
+        self.max_factors = int(max_factors)
+
+        # Los mensajes se internan una vez y se reutilizan en cada respuesta
+        self.fallback_factors = tuple(sys.intern(factor) for factor in fallback_factors)
+        self.factor_messages = tuple(sys.intern(rule[3]) for rule in self.factor_rules)
+        self.factor_severities = tuple(rule[4] for rule in self.factor_rules)
+        self.factor_conditions = _Conditions(
+            [rule[0] for rule in self.factor_rules],
+            [rule[1] for rule in self.factor_rules],
+            [rule[2] for rule in self.factor_rules]
+        )
+
+        for rule in self.recommendation_rules:
+            if rule[0] not in CLASS_NAMES:
+                raise ValueError(f'Clase desconocida en regla: {rule[0]}')
+        self.recommendation_messages = tuple(sys.intern(rule[4]) for rule in self.recommendation_rules)
+        self.recommendation_classes = np.array(
+            [CLASS_NAMES.index(rule[0]) for rule in self.recommendation_rules], dtype=np.intp
+        )
+        self.recommendation_conditions = _Conditions(
+            [rule[1] for rule in self.recommendation_rules],
+            [rule[2] for rule in self.recommendation_rules],
+            [rule[3] for rule in self.recommendation_rules]
+        )
+
+    def key_factors(self, data):
+        """
+        Identifica los factores clave de cada fila de una matriz N×10
+
+        Args:
+            data (np.ndarray): Datos de los estudiantes en el orden de FEATURE_COLUMNS
+
+        Returns:
+            list: Lista de factores clave por estudiante (máximo max_factors cada una)
+        """
+        masks = self.factor_conditions.evaluate(data)
+        factors = _collect(masks, self.factor_messages, data.shape[0])
+        fallback = self.fallback_factors
+        limit = self.max_factors
+        return [row[:limit] if row else list(fallback) for row in factors]
+
+    def recommendations(self, predictions, data):
+        """
+        Genera las recomendaciones de cada fila de una matriz N×10
+
+        Args:
+            predictions (list | np.ndarray): Clase predicha de cada estudiante,
+                como nombre ('Bajo', 'Medio', 'Alto') o como índice de clase
+            data (np.ndarray): Datos de los estudiantes en el orden de FEATURE_COLUMNS
+
+        Returns:
+            list: Lista de recomendaciones por estudiante
+        """
+        predictions = _class_indices(predictions)
+        masks = self.recommendation_conditions.evaluate(data)
+        masks &= predictions[:, None] == self.recommendation_classes
+        return _collect(masks, self.recommendation_messages, data.shape[0])
+
+    def to_dict(self):
+        """Representación JSON de las tablas, en el formato que acepta load_rules"""
+        return {
+            'factores': [
+                dict(zip(('columna', 'comparacion', 'umbral', 'mensaje', 'severidad'), rule))
+                for rule in self.factor_rules
+            ],
+            'factores_por_defecto': list(self.fallback_factors),
+            'max_factores': self.max_factors,
+            'recomendaciones': [
+                dict(zip(('clase', 'columna', 'comparacion', 'umbral', 'mensaje'), rule))
+                for rule in self.recommendation_rules
+            ],
+        }
+
+# Como en el código original, cualquier clase que no sea 'Bajo' ni 'Medio'
+# recibe las recomendaciones de 'Alto'
+_CLASS_LOOKUP = {name: index for index, name in enumerate(CLASS_NAMES)}
+_DEFAULT_CLASS = CLASS_NAMES.index('Alto')
+
+def _class_indices(predictions):
+    if len(predictions) and isinstance(predictions[0], str):
+        return np.array([_CLASS_LOOKUP.get(p, _DEFAULT_CLASS) for p in predictions], dtype=np.intp)
+    return np.asarray(predictions, dtype=np.intp)
+
+def load_rules(path):
+    """
+    Carga tablas de reglas desde un archivo JSON
+
+    El archivo tiene las claves 'factores', 'recomendaciones' y opcionalmente
+    'factores_por_defecto' y 'max_factores'; las claves omitidas conservan los
+    valores por defecto.
+
+    Args:
+        path (str): Ruta al archivo JSON
+
+    Returns:
+        RuleEngine: Motor compilado con las reglas del archivo
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+
+    factor_rules = None
+    if 'factores' in config:
+        factor_rules = [
+            (rule['columna'], rule['comparacion'], rule['umbral'], rule['mensaje'],
+             rule.get('severidad', 'positivo'))
+            for rule in config['factores']
+        ]
+
+    recommendation_rules = None
+    if 'recomendaciones' in config:
+        recommendation_rules = [
+            (rule['clase'], rule.get('columna'), rule.get('comparacion'), rule.get('umbral'),
+             rule['mensaje'])
+            for rule in config['recomendaciones']
+        ]
+
+    return RuleEngine(
+        factor_rules=factor_rules,
+        recommendation_rules=recommendation_rules,
+        fallback_factors=config.get('factores_por_defecto'),
+        max_factors=config.get('max_factores', MAX_FACTORS)
+    )
+
+# Motor activo usado por el predictor
+_engine = RuleEngine()
+
+def get_rule_engine():
+    """Devuelve el motor de reglas activo"""
+    return _engine
+
+def set_rule_engine(engine):
+    """Reemplaza el motor de reglas activo (por ejemplo, con load_rules)"""
+    global _engine
+    _engine = engine
@@ -0,0 +1,140 @@
+"""
+Búsqueda de hiperparámetros con validación cruzada en paralelo.
+
+Los folds se preparan una sola vez en el proceso principal. Para cada fold se
+ajusta el MinMaxScaler con su parte de entrenamiento y se guardan las matrices
+ya escaladas. Los procesos del pool las reciben una vez al arrancar
+(initializer), y cada tarea es solo un par (candidato, fold): ningún candidato
+vuelve a validar ni a escalar datos, y por cada tarea solo viajan los
+parámetros y el resultado.
+"""
+
+import itertools
+import os
+import time
+import warnings
+
+import numpy as np
+
+# Rejilla por defecto: regularización, peso de clases y solver
+DEFAULT_GRID = {
+    'C': (0.01, 0.1, 1.0, 10.0, 100.0),
+    'class_weight': (None, 'balanced'),
+    'solver': ('lbfgs', 'newton-cg', 'saga'),
+}
+
+# Folds escalados de cada proceso
+_folds = None
+
+def param_grid(grid=None):
+    """
+    Expande la rejilla en la lista de candidatos
+
+    Args:
+        grid (dict, optional): Parámetro -> valores; por defecto DEFAULT_GRID
+
+    Returns:
+        list: Un diccionario de parámetros por combinación
+    """
+    grid = DEFAULT_GRID if grid is None else grid
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def prepare_folds(X, y, n_folds=5, seed=42):
+    """
+    Divide en k folds estratificados y escala cada uno con su propio scaler
+
+    Args:
+        X (np.ndarray): Matriz N×10 sin escalar
+        y (np.ndarray): Clase de cada fila
+        n_folds (int): Número de folds
+        seed (int): Semilla del barajado
+
+    Returns:
+        list: (X_entrenamiento, y_entrenamiento, X_validacion, y_validacion) por fold
+    """
+    from sklearn.model_selection import StratifiedKFold
+    from sklearn.preprocessing import MinMaxScaler
+
+    X, y = np.asarray(X, dtype=np.float64), np.asarray(y)
+    folds = []
+    for train_index, val_index in StratifiedKFold(n_folds, shuffle=True, random_state=seed).split(X, y):
+        scaler = MinMaxScaler().fit(X[train_index])
+        folds.append((
+            scaler.transform(X[train_index]), y[train_index],
+            scaler.transform(X[val_index]), y[val_index]
+        ))
+    return folds
+
+def _init_worker(folds):
+    global _folds
+    _folds = folds
+
+def _fit_fold(candidate, params, fold):
+    """Ajusta un candidato en un fold (se ejecuta dentro del pool)"""
+    from sklearn.exceptions import ConvergenceWarning
+    from sklearn.linear_model import LogisticRegression
+
+    X_train, y_train, X_val, y_val = _folds[fold]
+    started = time.perf_counter()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ConvergenceWarning)
+        model = LogisticRegression(max_iter=1000, random_state=42, **params).fit(X_train, y_train)
+    seconds = time.perf_counter() - started
+    converged = not any(issubclass(w.category, ConvergenceWarning) for w in caught)
+    return candidate, fold, model.score(X_val, y_val), model.score(X_train, y_train), seconds, converged
+
+def cross_validate_grid(X, y, grid=None, n_folds=5, processes=None, seed=42):
+    """
+    Evalúa cada candidato de la rejilla con validación cruzada k-fold
+
+    Args:
+        X (np.ndarray): Matriz de entrenamiento sin escalar
+        y (np.ndarray): Clases
+        grid (dict, optional): Rejilla de parámetros; por defecto DEFAULT_GRID
+        n_folds (int): Número de folds
+        processes (int, optional): Procesos del pool; por defecto os.cpu_count(),
+            y con 1 todo se ejecuta en este proceso
+        seed (int): Semilla de la división en folds
+
+    Returns:
+        list: Un resultado por candidato, del mejor al peor (precisión media de
+              validación y, a igualdad, menor desviación y menor tiempo)
+    """
+    candidates = param_grid(grid)
+    folds = prepare_folds(X, y, n_folds, seed)
+    tasks = [(i, params, fold) for i, params in enumerate(candidates) for fold in range(n_folds)]
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+
+    if processes <= 1:
+        _init_worker(folds)
+        outcomes = [_fit_fold(*task) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(folds,)) as pool:
+            outcomes = list(pool.map(_fit_fold, *zip(*tasks)))
+
+    scores = np.zeros((len(candidates), n_folds))
+    train_scores = np.zeros_like(scores)
+    seconds = np.zeros_like(scores)
+    converged = np.ones(scores.shape, dtype=bool)
+    for candidate, fold, score, train_score, elapsed, fold_converged in outcomes:
+        scores[candidate, fold] = score
+        train_scores[candidate, fold] = train_score
+        seconds[candidate, fold] = elapsed
+        converged[candidate, fold] = fold_converged
+
+    results = [
+        {
+            'parametros': params,
+            'precision_media': float(scores[i].mean()),
+            'desviacion': float(scores[i].std()),
+            'precision_entrenamiento': float(train_scores[i].mean()),
+            'tiempo_s': float(seconds[i].sum()),
+            'convergio': bool(converged[i].all())
+        }
+        for i, params in enumerate(candidates)
+    ]
+    results.sort(key=lambda r: (-round(r['precision_media'], 10), r['desviacion'], r['tiempo_s']))
+    return results
@@ -0,0 +1,72 @@
+"""
+Serialización JSON de las respuestas de la API.
+
+dumps() usa orjson si está instalado (`pip install orjson`): escribe bytes
+directamente y entiende escalares y arreglos de NumPy sin convertirlos antes.
+Sin orjson se usa json de la biblioteca estándar con un `default` que hace lo
+mismo. Ambos producen JSON compacto con las claves ordenadas, como jsonify.
+
+StaticResponse guarda el cuerpo ya codificado de un endpoint que no cambia
+(la ruta principal, la información del modelo) junto con su ETag, para
+responder sin volver a construir ni serializar nada y contestar 304 a los
+clientes que revalidan.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+def _default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f'Objeto de tipo {type(value).__name__} no serializable a JSON')
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def dumps(value):
+        """Serializa a bytes JSON compactos con las claves ordenadas"""
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+else:
+    _encoder = json.JSONEncoder(separators=(',', ':'), sort_keys=True, default=_default)
+
+    def dumps(value):
+        """Serializa a bytes JSON compactos con las claves ordenadas"""
+        return _encoder.encode(value).encode('utf-8')
+
+class StaticResponse:
+    """
+    Cuerpo JSON precodificado con su ETag
+
+    Args:
+        payload (dict): Cuerpo de la respuesta
+        status (int): Código HTTP
+    """
+
+    __slots__ = ('body', 'status', 'etag')
+
+    def __init__(self, payload, status=200):
+        self.body = dumps(payload) + b'\n'
+        self.status = status
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:16] + '"'
+
+    def matches(self, if_none_match):
+        """Indica si la cabecera If-None-Match del cliente ya tiene esta versión"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return self.etag in tags or f'W/{self.etag}' in tags
@@ -0,0 +1,128 @@
+"""
+Estudiantes sintéticos con las distribuciones del entrenamiento.
+
+Único lugar donde se definen las distribuciones (enteros uniformes de 1 a 5,
+horas de estudio entre 0 y 40, asistencia entre 60 y 100, etc.) y la regla de
+rendimiento. De aquí salen los datos de entrenar_modelo_10_features.py, del
+entrenamiento por bloques, de los benchmarks y de las pruebas de carga.
+"""
+
+import numpy as np
+
+from .features import (
+    FEATURE_SCHEMA, GENERO_MAP, APOYO_FAMILIAR, HORAS_ESTUDIO, CLIMA_FAMILIAR, ASISTENCIA, MOTIVACION
+)
+
+# Distribución de cada campo: ('entero', bajo, alto_exclusivo) o ('real', bajo, alto).
+# El orden es el del script de entrenamiento original, en el que legacy_seed saca
+# las columnas
+DISTRIBUTIONS = {
+    'genero': ('entero', 0, 2),
+    'apoyo_familiar': ('entero', 1, 6),
+    'ingresos_familiares': ('entero', 1, 6),
+    'horas_estudio': ('real', 0, 40),
+    'actividades_extra': ('real', 0, 20),
+    'nivel_educativo_padres': ('entero', 1, 6),
+    'acceso_internet': ('entero', 0, 2),
+    'clima_familiar': ('entero', 1, 6),
+    'asistencia': ('real', 60, 100),
+    'motivacion': ('entero', 1, 6),
+}
+
+_GENERO_BY_CODE = {code: name for name, code in GENERO_MAP.items()}
+_FIELD_INDEX = {spec['campo']: j for j, spec in enumerate(FEATURE_SCHEMA)}
+
+def generate_matrix(n_rows, seed=None, legacy_seed=None):
+    """
+    Genera una matriz N×10 float64 en el orden de FEATURE_COLUMNS
+
+    Args:
+        n_rows (int): Estudiantes a generar
+        seed (int, optional): Semilla para obtener siempre los mismos datos
+        legacy_seed (int, optional): Semilla para np.random.seed en lugar de
+            default_rng; da exactamente los datos con los que se entrenó el
+            modelo publicado en model/
+
+    Returns:
+        np.ndarray: Filas ya preprocesadas (género como 0/1)
+    """
+    if legacy_seed is not None:
+        return _legacy_matrix(n_rows, legacy_seed)
+
+    rng = np.random.default_rng(seed)
+    matrix = np.empty((n_rows, len(FEATURE_SCHEMA)), dtype=np.float64)
+    for j, spec in enumerate(FEATURE_SCHEMA):
+        kind, low, high = DISTRIBUTIONS[spec['campo']]
+        if kind == 'entero':
+            matrix[:, j] = rng.integers(low, high, n_rows)
+        else:
+            matrix[:, j] = rng.uniform(low, high, n_rows)
+    return matrix
+
+def _legacy_matrix(n_rows, seed):
+    # Mismas llamadas y en el mismo orden que np.random.randint/uniform tras
+    # np.random.seed(seed); RandomState comparte ese flujo sin tocar el global
+    rng = np.random.RandomState(seed)
+    matrix = np.empty((n_rows, len(FEATURE_SCHEMA)), dtype=np.float64)
+    for field, (kind, low, high) in DISTRIBUTIONS.items():
+        if kind == 'entero':
+            matrix[:, _FIELD_INDEX[field]] = rng.randint(low, high, n_rows)
+        else:
+            matrix[:, _FIELD_INDEX[field]] = rng.uniform(low, high, n_rows)
+    return matrix
+
+def performance_labels(matrix):
+    """
+    Clase de rendimiento según las características que más pesan
+
+    Args:
+        matrix (np.ndarray): Matriz N×10 en el orden de FEATURE_COLUMNS
+
+    Returns:
+        np.ndarray: 0 (Bajo), 1 (Medio) o 2 (Alto) por fila
+    """
+    score = (
+        (matrix[:, HORAS_ESTUDIO] / 40) * 0.3 +
+        (matrix[:, APOYO_FAMILIAR] / 5) * 0.25 +
+        (matrix[:, MOTIVACION] / 5) * 0.2 +
+        (matrix[:, ASISTENCIA] / 100) * 0.15 +
+        (matrix[:, CLIMA_FAMILIAR] / 5) * 0.1
+    )
+    # Mismos cortes que pd.cut(bins=[0, 0.4, 0.7, 1.0]): intervalos cerrados por la derecha
+    return np.digitize(score, [0.4, 0.7], right=True)
+
+def matrix_to_students(matrix, decimals=1):
+    """
+    Convierte filas preprocesadas en el JSON que envía el formulario
+
+    Args:
+        matrix (np.ndarray): Matriz N×10 en el orden de FEATURE_COLUMNS
+        decimals (int): Decimales de los campos reales
+
+    Returns:
+        list: Un diccionario por estudiante con los nombres de campo de la API
+    """
+    columns = []
+    for j, spec in enumerate(FEATURE_SCHEMA):
+        values = matrix[:, j]
+        if spec['tipo'] == 'categorico':
+            columns.append([_GENERO_BY_CODE[int(v)] for v in values])
+        elif spec['tipo'] == 'real':
+            columns.append(np.round(values, decimals).tolist())
+        else:
+            columns.append(values.astype(np.int64).tolist())
+    fields = [spec['campo'] for spec in FEATURE_SCHEMA]
+    return [dict(zip(fields, row)) for row in zip(*columns)]
+
+def generate_students(n_students, seed=None):
+    """
+    Genera estudiantes sintéticos listos para enviar a /api/predict
+
+    Args:
+        n_students (int): Estudiantes a generar
+        seed (int, optional): Semilla para obtener siempre los mismos datos
+
+    Returns:
+        list: Diccionarios con los campos del formulario
+    """
+    return matrix_to_students(generate_matrix(n_students, seed))
@@ -0,0 +1,202 @@
+"""
+Validador compilado a partir de FEATURE_SCHEMA.
+
+Al importar el módulo cada entrada del esquema se convierte en un conversor
+por campo. Un registro se valida en una sola pasada que escribe directamente
+en su fila float64 y acumula todos los errores en lugar de detenerse en el
+primero.
+"""
+
+import numpy as np
+
+from .features import FEATURE_SCHEMA, REQUIRED_FIELDS, N_FEATURES
+
+class ValidationError(ValueError):
+    """Error de validación que conserva la lista completa de errores por campo"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__('; '.join(error['mensaje'] for error in errors))
+
+    @property
+    def missing_fields(self):
+        return missing_fields(self.errors)
+
+def _cast_categorico(mapping):
+    def cast(value):
+        return mapping[str(value).upper()]
+    return cast
+
+_TYPE_MESSAGES = {
+    'entero': 'debe ser un número entero',
+    'real': 'debe ser un número',
+    'binario': 'debe ser 0 o 1',
+}
+
+def _compile(schema):
+    """Convierte el esquema declarativo en tuplas listas para el bucle de validación"""
+    compiled = []
+    for j, spec in enumerate(schema):
+        if spec['tipo'] == 'categorico':
+            cast = _cast_categorico(spec['valores'])
+            low, high = float('-inf'), float('inf')
+            type_message = f"debe ser uno de: {', '.join(spec['valores'])}"
+        else:
+            cast = float if spec['tipo'] == 'real' else int
+            low, high = spec['rango']
+            type_message = _TYPE_MESSAGES[spec['tipo']]
+        compiled.append((
+            j, spec['campo'], spec['columna'], cast, float(low), float(high),
+            spec['tipo'] != 'real', type_message
+        ))
+    return tuple(compiled)
+
+_COMPILED = _compile(FEATURE_SCHEMA)
+
+# Límites como vectores para validar rangos de lotes completos
+_RANGE_MIN = np.array([field[4] for field in _COMPILED])
+_RANGE_MAX = np.array([field[5] for field in _COMPILED])
+
+def _missing_error(field):
+    return {'campo': field, 'tipo': 'faltante', 'mensaje': f'Campo requerido faltante: {field}'}
+
+def _type_error(field, column, type_message, value):
+    return {
+        'campo': field,
+        'tipo': 'formato',
+        'mensaje': f'{column} {type_message}. Valor recibido: {value!r}'
+    }
+
+def _range_error(j, value):
+    _, field, column, _, low, high, is_int, _ = _COMPILED[j]
+    value = int(value) if is_int and value == value else value
+    return {
+        'campo': field,
+        'tipo': 'rango',
+        'mensaje': f'{column} debe estar entre {int(low)} y {int(high)}. Valor recibido: {value}'
+    }
+
+def _not_an_object_error():
+    return {'campo': None, 'tipo': 'formato', 'mensaje': 'Cada estudiante debe ser un objeto JSON'}
+
+def missing_fields(errors):
+    """Devuelve los campos faltantes reportados en una lista de errores"""
+    return [error['campo'] for error in errors if error['tipo'] == 'faltante']
+
+def validate_record(data, out=None):
+    """
+    Valida un estudiante y escribe sus valores convertidos en una fila float64
+
+    Args:
+        data (dict): Datos del estudiante tal como llegan del formulario
+        out (np.ndarray, optional): Fila de 10 posiciones donde escribir el resultado
+
+    Returns:
+        tuple: (np.ndarray, list) - (fila convertida, errores encontrados)
+    """
+    row = np.empty(N_FEATURES, dtype=np.float64) if out is None else out
+    if not isinstance(data, dict):
+        return row, [_not_an_object_error()]
+
+    errors = []
+    for j, field, column, cast, low, high, _, type_message in _COMPILED:
+        try:
+            raw = data[field]
+        except KeyError:
+            errors.append(_missing_error(field))
+            continue
+        try:
+            value = cast(raw)
+        except (ValueError, TypeError, KeyError, OverflowError):
+            errors.append(_type_error(field, column, type_message, raw))
+            continue
+        if not (low <= value <= high):
+            errors.append(_range_error(j, value))
+            continue
+        row[j] = value
+
+    return row, errors
+
+def validate_records(records):
+    """
+    Valida una lista de estudiantes y los escribe en una matriz N×10
+
+    La conversión de tipos se hace campo por campo; la validación de rangos se
+    evalúa sobre toda la matriz a la vez. Un registro inválido no invalida al
+    resto del lote.
+
+    Args:
+        records (list): Lista de diccionarios con los datos de cada estudiante
+
+    Returns:
+        tuple: (np.ndarray, list, dict) - (matriz de filas válidas, índices
+               originales de esas filas, errores por índice de registro)
+    """
+    n_records = len(records)
+    matrix = np.empty((n_records, N_FEATURES), dtype=np.float64)
+    failed = np.zeros((n_records, N_FEATURES), dtype=bool)
+    errors = {}
+
+    for i, data in enumerate(records):
+        if not isinstance(data, dict):
+            errors[i] = [_not_an_object_error()]
+            failed[i] = True
+            continue
+
+        row = matrix[i]
+        row_errors = None
+        for j, field, column, cast, _, _, _, type_message in _COMPILED:
+            try:
+                row[j] = cast(data[field])
+            except KeyError:
+                if field in data:
+                    error = _type_error(field, column, type_message, data[field])
+                else:
+                    error = _missing_error(field)
+            except (ValueError, TypeError, OverflowError):
+                error = _type_error(field, column, type_message, data[field])
+            else:
+                continue
+            failed[i, j] = True
+            if row_errors is None:
+                row_errors = errors[i] = []
+            row_errors.append(error)
+
+    # Validación de rangos vectorizada; las celdas que no se pudieron convertir se ignoran
+    out_of_range = ~((matrix >= _RANGE_MIN) & (matrix <= _RANGE_MAX)) & ~failed
+
+    for i, j in zip(*np.nonzero(out_of_range)):
+        errors.setdefault(int(i), []).append(_range_error(j, matrix[i, j]))
+
+    valid = np.ones(n_records, dtype=bool)
+    if errors:
+        valid[list(errors)] = False
+        # Mantener los errores de cada registro en el orden del esquema
+        order = {field: j for j, field in enumerate(REQUIRED_FIELDS)}
+        for row_errors in errors.values():
+            row_errors.sort(key=lambda error: order.get(error['campo'], -1))
+
+    return matrix[valid], np.flatnonzero(valid).tolist(), errors
+
+def describe_errors(errors):
+    """
+    Construye el cuerpo de respuesta de la API para una lista de errores
+
+    Args:
+        errors (list): Errores devueltos por validate_record o validate_records
+
+    Returns:
+        dict: Cuerpo con el tipo de error, el detalle legible y la lista completa
+    """
+    missing = missing_fields(errors)
+    if missing:
+        body = {
+            'error': 'Campos faltantes',
+            'campos_requeridos': REQUIRED_FIELDS,
+            'campos_faltantes': missing
+        }
+    else:
+        body = {'error': 'Error en validación de datos'}
+    body['detalle'] = '; '.join(error['mensaje'] for error in errors)
+    body['errores'] = errors
+    return body
@@ -0,0 +1,158 @@
+"""
+Análisis de sensibilidad ("¿qué pasaría si...?") de un estudiante.
+
+A partir de un estudiante base y de los rangos de una o dos variables, se
+construye una sola matriz con todas las combinaciones. También se agregan los
+barridos de cada variable por separado (el resto en su valor base). Todo se
+evalúa con una única llamada a predict_proba. De ahí salen la superficie de
+probabilidades de cada clase y, para cada variable, el cambio más pequeño que
+lleva al estudiante a la clase siguiente.
+"""
+
+import numpy as np
+
+from .features import FEATURE_SCHEMA, CLASS_NAMES
+
+_SPEC_BY_FIELD = {spec['campo']: (j, spec) for j, spec in enumerate(FEATURE_SCHEMA)}
+
+MAX_VARIABLES = 2
+
+def parse_variations(variations, max_points):
+    """
+    Valida los rangos pedidos y genera los valores de cada variable
+
+    Args:
+        variations (dict): Campo -> {'desde', 'hasta', 'paso'}; los que falten
+            toman el rango válido del campo y paso 1
+        max_points (int): Máximo de combinaciones permitidas
+
+    Returns:
+        list: (índice de columna, campo, valores) por variable
+
+    Raises:
+        ValueError: Si un campo no existe, no es numérico o el rango no es válido
+    """
+    if not isinstance(variations, dict) or not 1 <= len(variations) <= MAX_VARIABLES:
+        raise ValueError(f'"variaciones" debe ser un objeto con 1 o {MAX_VARIABLES} campos')
+
+    parsed = []
+    points = 1
+    for field, spec_range in variations.items():
+        if field not in _SPEC_BY_FIELD:
+            raise ValueError(f'Campo desconocido en variaciones: {field}')
+        j, spec = _SPEC_BY_FIELD[field]
+        if spec['tipo'] == 'categorico':
+            raise ValueError(f'{field} no es numérico y no se puede variar')
+        if spec_range is None:
+            spec_range = {}
+        if not isinstance(spec_range, dict):
+            raise ValueError(f'La variación de {field} debe ser un objeto con "desde", "hasta" y "paso"')
+
+        low, high = spec['rango']
+        try:
+            start = float(spec_range.get('desde', low))
+            stop = float(spec_range.get('hasta', high))
+            step = float(spec_range.get('paso', 1))
+        except (TypeError, ValueError):
+            raise ValueError(f'"desde", "hasta" y "paso" de {field} deben ser números')
+        if not (low <= start <= stop <= high):
+            raise ValueError(f'El rango de {field} debe cumplir {low} <= desde <= hasta <= {high}')
+        if not step > 0:
+            raise ValueError(f'El paso de {field} debe ser mayor que 0')
+
+        # Se cuentan los puntos antes de generarlos: un paso diminuto no debe reservar memoria
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        points *= count
+        if points > max_points:
+            raise ValueError(f'La rejilla tiene al menos {points} combinaciones; el máximo es {max_points}')
+        parsed.append((j, field, spec, start, step, count))
+
+    variables = []
+    for j, field, spec, start, step, count in parsed:
+        values = start + step * np.arange(count)
+        if spec['tipo'] != 'real':
+            values = np.unique(np.round(values))
+        variables.append((j, field, values))
+    return variables
+
+def _nested(array):
+    return array.tolist() if array.ndim else array.item()
+
+def what_if(model, scaler, base_row, variables):
+    """
+    Evalúa la rejilla de variantes del estudiante con una sola llamada al modelo
+
+    Args:
+        model: Modelo de ML (o FusedLogisticModel)
+        scaler: Scaler, o None si el modelo ya lo incluye
+        base_row (np.ndarray): Fila 1×10 (o de 10 valores) preprocesada del estudiante
+        variables (list): Resultado de parse_variations
+
+    Returns:
+        dict: Predicción base, superficie de probabilidades por clase, clase
+              predicha en cada punto y cambio mínimo por variable
+    """
+    base = np.asarray(base_row, dtype=np.float64).reshape(-1)
+    columns = [j for j, _, _ in variables]
+    shape = tuple(len(values) for _, _, values in variables)
+
+    # Filas: [base] + rejilla completa + un barrido por variable
+    grids = np.meshgrid(*(values for _, _, values in variables), indexing='ij')
+    n_grid = int(np.prod(shape))
+    sweeps = [(j, values) for j, _, values in variables] if len(variables) > 1 else []
+    n_rows = 1 + n_grid + sum(len(values) for _, values in sweeps)
+
+    matrix = np.empty((n_rows, base.size), dtype=np.float64)
+    matrix[:] = base
+    for column, grid in zip(columns, grids):
+        matrix[1:1 + n_grid, column] = grid.reshape(-1)
+    offset = 1 + n_grid
+    sweep_slices = []
+    for column, values in sweeps:
+        matrix[offset:offset + len(values), column] = values
+        sweep_slices.append(slice(offset, offset + len(values)))
+        offset += len(values)
+    # Con una sola variable la rejilla ya es su barrido
+    if not sweeps:
+        sweep_slices = [slice(1, 1 + n_grid)]
+
+    probabilities = model.predict_proba(scaler.transform(matrix) if scaler is not None else matrix)
+    predictions = probabilities.argmax(axis=1)
+
+    base_class = int(predictions[0])
+    target = base_class + 1 if base_class + 1 < len(CLASS_NAMES) else None
+    grid_probabilities = probabilities[1:1 + n_grid]
+    class_names = np.array(CLASS_NAMES, dtype=object)
+
+    minimum_change = {}
+    for (column, field, values), rows in zip(variables, sweep_slices):
+        if target is None:
+            minimum_change[field] = None
+            continue
+        reached = predictions[rows] >= target
+        if not reached.any():
+            minimum_change[field] = None
+            continue
+        changes = values - base[column]
+        best = int(np.argmin(np.where(reached, np.abs(changes), np.inf)))
+        minimum_change[field] = {
+            'valor': float(values[best]),
+            'cambio': float(changes[best]),
+            'prediccion': CLASS_NAMES[int(predictions[rows][best])],
+            'probabilidad': float(probabilities[rows][best, target])
+        }
+
+    return {
+        'prediccion_base': CLASS_NAMES[base_class],
+        'probabilidades_base': dict(zip(CLASS_NAMES, probabilities[0].tolist())),
+        'clase_siguiente': CLASS_NAMES[target] if target is not None else None,
+        'variables': [
+            {'campo': field, 'valor_base': float(base[column]), 'valores': values.tolist()}
+            for column, field, values in variables
+        ],
+        'probabilidades': {
+            name: _nested(grid_probabilities[:, k].reshape(shape)) for k, name in enumerate(CLASS_NAMES)
+        },
+        'prediccion': _nested(class_names[predictions[1:1 + n_grid]].reshape(shape)),
+        'cambio_minimo': minimum_change
+    }
@@ -2,6 +2,8 @@ import joblib
 import pandas as pd
 import numpy as np
 
+from utils.features import FEATURE_COLUMNS, N_FEATURES
+
 print("🔍 Analizando el modelo...")
 print("=" * 70)
 
@@ -12,12 +14,16 @@ modelo = joblib.load('model/modelo_rl.pkl')
 # Ver cuántas features espera
 print(f"\n📊 Características esperadas por el scaler: {scaler.n_features_in_}")
 print(f"📊 Características esperadas por el modelo: {modelo.n_features_in_}")
+print(f"📊 Características que envía la API: {N_FEATURES}")
 
 # Ver si tiene nombres de features
 if hasattr(scaler, 'feature_names_in_'):
     print(f"\n📋 Nombres de las columnas esperadas:")
     for i, name in enumerate(scaler.feature_names_in_, 1):
         print(f"   {i}. {name}")
+    if list(scaler.feature_names_in_) != FEATURE_COLUMNS:
+        print("\n⚠️  El orden no coincide con el esquema de la API:")
+        print(f"   {FEATURE_COLUMNS}")
 else:
     print("\n⚠️  El scaler no tiene nombres de features guardados")
     print("   Se entrenó con un array numpy sin nombres de columnas")
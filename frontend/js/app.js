@@ -165,6 +165,7 @@ async function handlePredict() {
         // Pequeño delay para efecto visual
         setTimeout(() => {
             displayResult(result);
+            loadWhatIf(formData);
         }, 500);
         
     } catch (error) {
@@ -308,6 +309,70 @@ function displayResult(result) {
     }
 }
 
+// ===== ¿QUÉ PASARÍA SI...? =====
+// Una sola petición evalúa todas las combinaciones de horas de estudio y
+// asistencia, en lugar de reenviar el formulario con cada valor
+const WHAT_IF_VARIATIONS = {
+    horas_estudio: { desde: 0, hasta: 40, paso: 1, nombre: 'Horas de estudio', unidad: ' h' },
+    asistencia: { desde: 60, hasta: 100, paso: 1, nombre: 'Asistencia', unidad: '%' }
+};
+
+async function loadWhatIf(formData) {
+    const variaciones = {};
+    Object.entries(WHAT_IF_VARIATIONS).forEach(([campo, { desde, hasta, paso }]) => {
+        variaciones[campo] = { desde, hasta, paso };
+    });
+    
+    try {
+        const response = await fetch(`${API_URL}/api/predict/what-if`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({ estudiante: formData, variaciones })
+        });
+        if (!response.ok) {
+            return;
+        }
+        displayWhatIf(await response.json());
+    } catch (error) {
+        // El análisis es opcional: si falla, se muestra solo la predicción
+        console.error('Error en el análisis de sensibilidad:', error);
+    }
+}
+
+function displayWhatIf(analysis) {
+    const container = document.querySelector('#result-content .prediction-result');
+    if (!container) {
+        return;
+    }
+    
+    let items;
+    if (!analysis.clase_siguiente) {
+        items = ['El estudiante ya está en la clase más alta.'];
+    } else {
+        items = Object.entries(WHAT_IF_VARIATIONS).map(([campo, { nombre, unidad, desde, hasta }]) => {
+            const cambio = analysis.cambio_minimo[campo];
+            if (!cambio) {
+                return `${nombre}: ningún valor entre ${desde} y ${hasta}${unidad} alcanza ${analysis.clase_siguiente} por sí solo.`;
+            }
+            const signo = cambio.cambio > 0 ? '+' : '';
+            return `${nombre}: con ${cambio.valor}${unidad} (${signo}${cambio.cambio}${unidad}) pasaría a ${cambio.prediccion} ` +
+                `(${(cambio.probabilidad * 100).toFixed(1)}%).`;
+        });
+    }
+    
+    const box = document.createElement('div');
+    box.className = 'recommendations-box';
+    box.innerHTML = `
+        <h3>🔮 ¿Qué cambiaría el resultado?</h3>
+        <ul class="recommendations-list">
+            ${items.map(item => `<li>${item}</li>`).join('')}
+        </ul>
+    `;
+    container.appendChild(box);
+}
+
 // ===== CONFETTI EFFECT =====
 function launchConfetti() {
     const colors = ['#667eea', '#764ba2', '#10b981', '#f59e0b', '#ef4444'];